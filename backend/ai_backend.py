@@ -1,115 +1,279 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
-from datetime import datetime, timedelta
-import json
-import sqlite3
-import re
-import openai
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+import base64
+import hashlib
 import os
+import re
+import sys
+import threading
+import time
 from dotenv import load_dotenv
 
+import compression
+import json_codec
+import metrics
+import plan_history
+import plan_templates
+import token_budget
+from db_pool import ConnectionPool, PoolTimeoutError
+from llm_cache import LLMResponseCache, make_cache_key
+from plan_model import (PlanValidationError, parse_date_range, parse_dependencies, parse_duration,
+                        validate_tasks)
+from plan_parser import PlanParseError, PlanStreamParser, parse_plan
+from resource_scheduler import parse_constraints, schedule_with_constraints
+from scheduler import IncrementalScheduler, schedule_tasks
+from single_flight import SingleFlight
+
 load_dotenv()
 
 app = Flask(__name__)
+app.json = json_codec.JSONProvider(app)
 CORS(app)
 
 print("🚀 Starting AI-Powered Smart Task Planner...")
 
+OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
+# Bump whenever the planning prompt changes so cached responses are not reused
+PROMPT_VERSION = 1
+# Task counts requested from the model (min, max); max_tokens is sized from the max
+GENERATE_TASKS = (6, 8)
+REGENERATE_TASKS = (4, 6)
+
 class AITaskPlanner:
-    def __init__(self):
-        # Initialize OpenAI client with error handling
-        api_key = os.getenv('OPENAI_API_KEY')
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY not found in environment variables")
+    def __init__(self, cache=None):
+        self.cache = cache
         
-        self.client = openai.OpenAI(api_key=api_key)
+        # The OpenAI client is created on first use, so startup makes no network calls
+        self.api_key = os.getenv('OPENAI_API_KEY')
+        if not self.api_key:
+            raise ValueError("OPENAI_API_KEY not found in environment variables")
         
-        # Test the connection
+        self._client = None
+        self._client_lock = threading.Lock()
+        self.readiness = {'status': 'cold'}
+        self.flights = SingleFlight()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._create_client()
+        return self._client
+
+    def _create_client(self):
+        # Deferred import: loading the SDK is the largest part of cold start
+        import openai
+        return openai.OpenAI(api_key=self.api_key)
+
+    def start_warmup(self):
+        """Create the client and probe the API on a background thread"""
+        thread = threading.Thread(target=self._warmup, name='openai-warmup', daemon=True)
+        thread.start()
+        return thread
+
+    def _warmup(self):
+        self.readiness = {'status': 'warming'}
+        started = time.perf_counter()
         try:
             # Simple test to verify API key works
             self.client.models.list()
+            self.readiness = {'status': 'ready', 'probe_ms': round((time.perf_counter() - started) * 1000, 1)}
             print("✅ OpenAI client initialized successfully")
         except Exception as e:
-            print(f"❌ OpenAI initialization failed: {e}")
-            raise
+            self.readiness = {'status': 'degraded', 'error': str(e)}
+            print(f"❌ OpenAI warm-up failed: {e}")
 
     def generate_ai_plan(self, goal, start_date, end_date):
-        """Generate intelligent plan using AI"""
+        """Generate intelligent plan using AI; identical concurrent requests share one generation"""
+        return self.flights.do('generate', (goal, start_date, end_date),
+                               self._generate_ai_plan, goal, start_date, end_date)
+
+    def _generate_ai_plan(self, goal, start_date, end_date):
+        # Outside the try: the fallback plan needs it too
+        total_days = (datetime.strptime(end_date, '%Y-%m-%d') - datetime.strptime(start_date, '%Y-%m-%d')).days
         try:
-            total_days = (datetime.strptime(end_date, '%Y-%m-%d') - datetime.strptime(start_date, '%Y-%m-%d')).days
-            
-            # AI prompt for intelligent planning
-            prompt = f"""
-            Create a detailed, actionable task breakdown for the following goal:
-            
-            GOAL: {goal}
-            TIMELINE: {total_days} days (from {start_date} to {end_date})
+            cache_key = make_cache_key(goal, total_days, OPENAI_MODEL, PROMPT_VERSION)
+            cached_plan = self._cached_plan(cache_key, goal, start_date, end_date)
+            if cached_plan:
+                return cached_plan
             
-            Please provide:
-            1. A domain/category for this goal
-            2. 6-8 specific, actionable tasks with:
-               - Clear descriptions
-               - Realistic durations in days
-               - Priority levels (high/medium/low)
-               - Logical dependencies
-               - Relevant categories
-            
-            Format as JSON:
-            {{
-                "domain": "domain_name",
-                "tasks": [
-                    {{
-                        "id": 1,
-                        "description": "specific task description",
-                        "category": "task category",
-                        "priority": "high/medium/low", 
-                        "duration_days": number,
-                        "dependencies": []
-                    }}
-                ]
-            }}
-            
-            Make tasks realistic for {total_days} days total.
-            """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert project planner and productivity coach. Create realistic, actionable task plans."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1500
+            response = self._complete(
+                'generate',
+                self._plan_messages(goal, start_date, end_date, total_days),
+                max_tasks=GENERATE_TASKS[1]
             )
             
             ai_response = response.choices[0].message.content
             print("🤖 AI Response:", ai_response)
-            
-            # Extract JSON from AI response
-            json_match = re.search(r'\{.*\}', ai_response, re.DOTALL)
-            if json_match:
-                plan_data = json.loads(json_match.group())
-                return self._schedule_tasks_with_dates(plan_data['tasks'], goal, start_date, end_date, plan_data.get('domain', 'AI Generated'))
-            else:
-                raise Exception("AI response format error")
+            return self._plan_from_response(ai_response, cache_key, goal, start_date, end_date)
                 
         except Exception as e:
             print(f"❌ AI Planning failed: {e}")
             # Fallback to rule-based planning
             return self._create_fallback_plan(goal, start_date, end_date, total_days)
 
+    def _complete(self, operation, messages, max_tasks):
+        """Chat completion sized for a reply of up to max_tasks tasks, timed and token-counted"""
+        prompt_tokens, max_tokens = self._token_budget(messages, max_tasks)
+        started = time.perf_counter()
+        try:
+            response = self.client.chat.completions.create(model=OPENAI_MODEL, temperature=0.7, messages=messages,
+                                                           max_tokens=max_tokens)
+        except Exception:
+            metrics.OPENAI_REQUEST_SECONDS.observe(time.perf_counter() - started, operation=operation, outcome='error')
+            raise
+        metrics.OPENAI_REQUEST_SECONDS.observe(time.perf_counter() - started, operation=operation, outcome='ok')
+        metrics.record_openai_usage(operation, response.usage)
+        token_budget.report(operation, prompt_tokens, max_tokens, response.usage)
+        return response
+
+    def _token_budget(self, messages, max_tasks):
+        """Local prompt token count and the max_tokens to allow for the reply"""
+        prompt_tokens = token_budget.count_message_tokens(messages, OPENAI_MODEL)
+        return prompt_tokens, token_budget.completion_budget(max_tasks, prompt_tokens, OPENAI_MODEL)
+
+    def _plan_messages(self, goal, start_date, end_date, total_days):
+        """Chat messages asking the model for a plan"""
+        # AI prompt for intelligent planning
+        prompt = f"""
+        Create a detailed, actionable task breakdown for the following goal:
+        
+        GOAL: {goal}
+        TIMELINE: {total_days} days (from {start_date} to {end_date})
+        
+        Please provide:
+        1. A domain/category for this goal
+        2. {GENERATE_TASKS[0]}-{GENERATE_TASKS[1]} specific, actionable tasks with:
+           - Clear descriptions
+           - Realistic durations in days
+           - Priority levels (high/medium/low)
+           - Logical dependencies
+           - Relevant categories
+        
+        Format as JSON:
+        {{
+            "domain": "domain_name",
+            "tasks": [
+                {{
+                    "id": 1,
+                    "description": "specific task description",
+                    "category": "task category",
+                    "priority": "high/medium/low", 
+                    "duration_days": number,
+                    "dependencies": []
+                }}
+            ]
+        }}
+        
+        Make tasks realistic for {total_days} days total.
+        """
+        return [
+            {"role": "system", "content": "You are an expert project planner and productivity coach. Create realistic, actionable task plans."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _cached_plan(self, cache_key, goal, start_date, end_date):
+        """Schedule a cached LLM plan for the requested dates, if there is one"""
+        if not self.cache:
+            return None
+        cached_plan = self.cache.get(cache_key)
+        if not cached_plan:
+            return None
+        print(f"⚡ Cache hit for: {goal}")
+        metrics.PLANS_GENERATED.inc(operation='generate', source='cache')
+        return self._schedule_tasks_with_dates(cached_plan['tasks'], goal, start_date, end_date, cached_plan.get('domain', 'AI Generated'))
+
+    def _plan_from_response(self, ai_response, cache_key, goal, start_date, end_date):
+        """Parse, cache and schedule a plan from the model's reply"""
+        return self._accept_plan(parse_plan(ai_response), cache_key, goal, start_date, end_date)
+
+    def _accept_plan(self, plan_data, cache_key, goal, start_date, end_date):
+        """Validate and schedule a parsed plan, caching it only if it is valid"""
+        if not plan_data.get('tasks'):
+            raise PlanParseError("AI plan contains no tasks")
+        plan = self._schedule_tasks_with_dates(plan_data['tasks'], goal, start_date, end_date, plan_data.get('domain', 'AI Generated'))
+        metrics.PLANS_GENERATED.inc(operation='generate', source='ai')
+        if self.cache:
+            self.cache.put(cache_key, {'domain': plan_data.get('domain'), 'tasks': plan_data['tasks']})
+        return plan
+
+    def stream_ai_plan(self, goal, start_date, end_date):
+        """Generate a plan from a streamed completion, yielding (event, data) as tasks arrive"""
+        total_days = (datetime.strptime(end_date, '%Y-%m-%d') - datetime.strptime(start_date, '%Y-%m-%d')).days
+        cache_key = make_cache_key(goal, total_days, OPENAI_MODEL, PROMPT_VERSION)
+        llm_started = None
+        
+        try:
+            plan = self._cached_plan(cache_key, goal, start_date, end_date)
+            if not plan:
+                # Something relevant to show instantly while the model thinks
+                yield 'preview', dict(self._template_plan(goal, start_date, end_date, total_days), ai_generated=False)
+                
+                # Streamed completions carry no usage; the reply is counted locally instead
+                messages = self._plan_messages(goal, start_date, end_date, total_days)
+                prompt_tokens, max_tokens = self._token_budget(messages, GENERATE_TASKS[1])
+                llm_started = time.perf_counter()
+                stream = self.client.chat.completions.create(
+                    model=OPENAI_MODEL,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=max_tokens,
+                    stream=True
+                )
+                
+                parser = PlanStreamParser()
+                streamed_tasks = []
+                reply = []
+                for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    text = chunk.choices[0].delta.content or ''
+                    reply.append(text)
+                    for task in parser.feed(text):
+                        # Provisional dates from the tasks seen so far; the final plan event carries the real schedule
+                        streamed_tasks.append(validate_tasks([task])[0])
+                        preview = [dict(t) for t in streamed_tasks]
+                        schedule_tasks(preview, start_date, end_date)
+                        yield 'task', preview[-1]
+                metrics.OPENAI_REQUEST_SECONDS.observe(time.perf_counter() - llm_started,
+                                                       operation='generate_stream', outcome='ok')
+                llm_started = None
+                token_budget.report('generate_stream', prompt_tokens, max_tokens,
+                                    completion_tokens=token_budget.count_tokens(''.join(reply), OPENAI_MODEL))
+                
+                plan = self._accept_plan(parser.close(), cache_key, goal, start_date, end_date)
+            else:
+                for task in plan['tasks']:
+                    yield 'task', task
+                    
+        except Exception as e:
+            print(f"❌ AI Planning failed: {e}")
+            if llm_started is not None:
+                metrics.OPENAI_REQUEST_SECONDS.observe(time.perf_counter() - llm_started,
+                                                       operation='generate_stream', outcome='error')
+            plan = self._create_fallback_plan(goal, start_date, end_date, total_days)
+        
+        yield 'plan', plan
+
     def _create_fallback_plan(self, goal, start_date, end_date, total_days):
-        """Fallback rule-based planning if AI fails"""
+        """Fallback template-based planning if AI fails"""
+        metrics.PLANS_GENERATED.inc(operation='generate', source='fallback')
+        return self._template_plan(goal, start_date, end_date, total_days)
+
+    def _template_plan(self, goal, start_date, end_date, total_days):
+        """Plan from the closest domain template for the goal; no network, well under a millisecond"""
+        template, score = plan_templates.INDEX.match(goal)
         tasks = [
-            self._create_task(1, "Research and information gathering", "Research", "high", max(2, total_days // 6), []),
-            self._create_task(2, "Define clear objectives and milestones", "Planning", "high", max(1, total_days // 8), [1]),
-            self._create_task(3, "Gather necessary resources", "Preparation", "medium", max(1, total_days // 10), [2]),
-            self._create_task(4, "Execute main implementation phase", "Execution", "high", max(4, total_days // 3), [3]),
-            self._create_task(5, "Review progress and make adjustments", "Review", "medium", max(2, total_days // 6), [4]),
-            self._create_task(6, "Finalize and complete project", "Completion", "high", max(1, total_days // 8), [5])
+            self._create_task(task_id, description, category, priority, round(total_days * share), dependencies)
+            for task_id, (description, category, priority, share, dependencies) in enumerate(template['tasks'], 1)
         ]
-        
-        return self._schedule_tasks_with_dates(tasks, goal, start_date, end_date, "General Project")
+        plan = self._schedule_tasks_with_dates(tasks, goal, start_date, end_date, template['domain'])
+        plan['template'] = {'domain': template['domain'], 'score': round(score, 3)}
+        return plan
 
     def _create_task(self, task_id, description, category, priority, duration_days, dependencies):
         """Create a standardized task object"""
@@ -124,209 +288,740 @@ class AITaskPlanner:
         }
 
     def _schedule_tasks_with_dates(self, tasks, goal, start_date, end_date, domain):
-        """Schedule tasks with actual dates considering dependencies"""
-        start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-        end_dt = datetime.strptime(end_date, '%Y-%m-%d')
-        total_days = (end_dt - start_dt).days
-        
-        # Create task dictionary for easy access
-        task_dict = {task['id']: task for task in tasks}
-        
-        # Calculate earliest start dates considering dependencies
-        for task in tasks:
-            if task['dependencies']:
-                dep_end_dates = []
-                for dep_id in task['dependencies']:
-                    if dep_id in task_dict and 'end_date' in task_dict[dep_id]:
-                        dep_end_dates.append(datetime.strptime(task_dict[dep_id]['end_date'], '%Y-%m-%d'))
-                
-                if dep_end_dates:
-                    earliest_start = max(dep_end_dates)
-                    task['start_date'] = earliest_start.strftime('%Y-%m-%d')
-                else:
-                    task['start_date'] = start_date
-            else:
-                task['start_date'] = start_date
-        
-        # Schedule tasks
-        scheduled_tasks = []
-        processed_tasks = set()
-        
-        while len(processed_tasks) < len(tasks):
-            for task in tasks:
-                if task['id'] in processed_tasks:
-                    continue
-                    
-                dependencies_met = all(dep_id in processed_tasks for dep_id in task['dependencies'])
-                if dependencies_met or not task['dependencies']:
-                    start_dt = datetime.strptime(task['start_date'], '%Y-%m-%d')
-                    
-                    if task['dependencies']:
-                        dep_end_dates = []
-                        for dep_id in task['dependencies']:
-                            dep_task = next((t for t in scheduled_tasks if t['id'] == dep_id), None)
-                            if dep_task:
-                                dep_end_dates.append(datetime.strptime(dep_task['end_date'], '%Y-%m-%d'))
-                        
-                        if dep_end_dates:
-                            latest_dep_end = max(dep_end_dates)
-                            if latest_dep_end > start_dt:
-                                start_dt = latest_dep_end
-                    
-                    end_dt = start_dt + timedelta(days=task['duration_days'])
-                    
-                    if end_dt > datetime.strptime(end_date, '%Y-%m-%d'):
-                        available_days = (datetime.strptime(end_date, '%Y-%m-%d') - start_dt).days
-                        task['duration_days'] = max(1, available_days)
-                        end_dt = start_dt + timedelta(days=task['duration_days'])
-                    
-                    task['start_date'] = start_dt.strftime('%Y-%m-%d')
-                    task['end_date'] = end_dt.strftime('%Y-%m-%d')
-                    task['deadline'] = end_dt.strftime('%Y-%m-%d')
-                    
-                    scheduled_tasks.append(task)
-                    processed_tasks.add(task['id'])
+        """Validate tasks and schedule them with actual dates considering dependencies.
+
+        Raises PlanValidationError for malformed tasks, so a bad model reply falls back like any other failure.
+        """
+        start_dt, end_dt = parse_date_range(start_date, end_date)
+        scheduled_tasks = schedule_tasks(validate_tasks(tasks), start_date, end_date)
         
         return {
             "goal": goal,
             "domain": domain,
             "start_date": start_date,
             "end_date": end_date,
-            "total_days": total_days,
+            "total_days": (end_dt - start_dt).days,
             "tasks": scheduled_tasks,
             "total_tasks": len(scheduled_tasks),
             "ai_generated": True,
             "generated_at": datetime.now().isoformat()
         }
 
+    def apply_schedule_constraints(self, plan, constraints):
+        """Reschedule a plan's tasks under working calendars and per-day capacity"""
+        scheduled_tasks, late_tasks = schedule_with_constraints(plan['tasks'], plan['start_date'], plan['end_date'], constraints)
+        plan = dict(plan, tasks=scheduled_tasks, total_tasks=len(scheduled_tasks))
+        plan['schedule_constraints'] = constraints
+        plan['late_tasks'] = late_tasks
+        return plan
+
     def regenerate_with_ai(self, original_plan, completed_tasks, feedback=""):
-        """Regenerate plan using AI with progress context"""
+        """Regenerate plan using AI with progress context; identical concurrent requests share one call"""
+        return self.flights.do('regenerate', self._regenerate_key(original_plan, completed_tasks, feedback),
+                               self._regenerate_with_ai, original_plan, completed_tasks, feedback)
+
+    def _regenerate_key(self, original_plan, completed_tasks, feedback):
+        payload = json_codec.dumps_bytes([original_plan, completed_tasks, feedback], sort_keys=True)
+        return hashlib.sha256(payload).hexdigest()
+
+    def _regenerate_with_ai(self, original_plan, completed_tasks, feedback):
         try:
-            completed_descriptions = [f"Completed: {task['description']}" for task in completed_tasks]
-            remaining_goal = original_plan['goal']
-            
-            prompt = f"""
-            Original goal: {remaining_goal}
-            Timeline: {original_plan['total_days']} days total
-            Current date: {datetime.now().strftime('%Y-%m-%d')}
-            
-            Already completed:
-            {chr(10).join(completed_descriptions)}
-            
-            User feedback: {feedback if feedback else 'No specific feedback'}
-            
-            Please create an updated plan for the REMAINING work, considering:
-            - What's already been accomplished
-            - Remaining timeline
-            - Any user feedback
-            
-            Provide 4-6 remaining tasks in JSON format.
-            """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an adaptive project planner. Update plans based on progress and feedback."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=1000
+            completed_tasks = self._resolve_completed(original_plan, completed_tasks)
+            response = self._complete(
+                'regenerate',
+                self._regenerate_messages(original_plan, completed_tasks, feedback),
+                max_tasks=REGENERATE_TASKS[1]
             )
             
             ai_response = response.choices[0].message.content
-            json_match = re.search(r'\{.*\}', ai_response, re.DOTALL)
-            
-            if json_match:
-                new_plan_data = json.loads(json_match.group())
-                # Merge with completed tasks
-                all_tasks = completed_tasks + new_plan_data['tasks']
-                # Re-number tasks
-                for i, task in enumerate(all_tasks, 1):
-                    task['id'] = i
-                
-                return self._schedule_tasks_with_dates(
-                    all_tasks, 
-                    original_plan['goal'], 
-                    original_plan['start_date'], 
-                    original_plan['end_date'], 
-                    original_plan.get('domain', 'AI Regenerated')
-                )
-            else:
-                raise Exception("AI regeneration failed")
+            return self._regenerated_plan_from_response(ai_response, original_plan, completed_tasks)
                 
         except Exception as e:
             print(f"❌ AI Regeneration failed: {e}")
+            metrics.PLANS_GENERATED.inc(operation='regenerate', source='fallback')
             return original_plan
 
+    def _resolve_completed(self, original_plan, completed_tasks):
+        """Full task dicts for completed tasks, which clients may send as bare {'id': ...} references"""
+        by_id = {task['id']: task for task in original_plan.get('tasks', [])}
+        resolved = []
+        for task in completed_tasks:
+            if isinstance(task, dict) and 'description' in task:
+                resolved.append(task)
+            else:
+                task_id = task['id'] if isinstance(task, dict) else task
+                if task_id in by_id:
+                    resolved.append(dict(by_id[task_id], completed=True))
+        return resolved
+
+    def _regenerate_messages(self, original_plan, completed_tasks, feedback):
+        """Chat messages asking the model to replan the remaining work, with history and feedback within budget"""
+        completed_descriptions = token_budget.compact_history(
+            completed_tasks, token_budget.COMPLETED_HISTORY_TOKENS, OPENAI_MODEL)
+        feedback = token_budget.truncate(feedback, token_budget.FEEDBACK_TOKENS, OPENAI_MODEL) if feedback else ''
+        remaining_goal = original_plan['goal']
+        
+        prompt = f"""
+        Original goal: {remaining_goal}
+        Timeline: {original_plan['total_days']} days total
+        Current date: {datetime.now().strftime('%Y-%m-%d')}
+        
+        Already completed:
+        {chr(10).join(completed_descriptions)}
+        
+        User feedback: {feedback if feedback else 'No specific feedback'}
+        
+        Please create an updated plan for the REMAINING work, considering:
+        - What's already been accomplished
+        - Remaining timeline
+        - Any user feedback
+        
+        Provide {REGENERATE_TASKS[0]}-{REGENERATE_TASKS[1]} remaining tasks in JSON format.
+        """
+        return [
+            {"role": "system", "content": "You are an adaptive project planner. Update plans based on progress and feedback."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _regenerated_plan_from_response(self, ai_response, original_plan, completed_tasks):
+        """Merge the model's remaining tasks with the completed ones and reschedule"""
+        new_plan_data = parse_plan(ai_response)
+        # Merge with completed tasks
+        all_tasks = completed_tasks + new_plan_data['tasks']
+        # Re-number tasks
+        for i, task in enumerate(all_tasks, 1):
+            task['id'] = i
+        
+        plan = self._schedule_tasks_with_dates(
+            all_tasks, 
+            original_plan['goal'], 
+            original_plan['start_date'], 
+            original_plan['end_date'], 
+            original_plan.get('domain', 'AI Regenerated')
+        )
+        # Only now: a reply that fails validation is counted once, as a fallback
+        metrics.PLANS_GENERATED.inc(operation='regenerate', source='ai')
+        return plan
+
+DB_PATH = os.getenv('AI_PLANS_DB', 'ai_plans.db')
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '8'))
+DB_BUSY_TIMEOUT_MS = int(os.getenv('DB_BUSY_TIMEOUT_MS', '5000'))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '5000'))
+LLM_CACHE_MAX_BYTES = int(os.getenv('LLM_CACHE_MAX_BYTES', str(50 * 1024 * 1024)))
+LLM_CACHE_TTL_SECONDS = int(os.getenv('LLM_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+OPENAI_WARMUP = os.getenv('OPENAI_WARMUP', '1') != '0'
+BULK_CONCURRENCY = int(os.getenv('BULK_CONCURRENCY', '4'))
+BULK_MAX_CONCURRENCY = int(os.getenv('BULK_MAX_CONCURRENCY', '16'))
+BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', '100'))
+SCHEDULER_CACHE_SIZE = int(os.getenv('SCHEDULER_CACHE_SIZE', '64'))
+PLANS_PAGE_SIZE = int(os.getenv('PLANS_PAGE_SIZE', '20'))
+PLANS_PAGE_MAX = int(os.getenv('PLANS_PAGE_MAX', '100'))
+PLAN_SNAPSHOT_INTERVAL = max(1, int(os.getenv('PLAN_SNAPSHOT_INTERVAL', '10')))
+
+class PlanConflictError(Exception):
+    """A write expected a plan revision that another writer has already moved past"""
+
 class AIDatabase:
-    def __init__(self):
+    SCHEMA_VERSION = 6
+
+    # Plan-level fields with their own column; everything else lives in meta
+    PLAN_COLUMNS = ('domain', 'start_date', 'end_date', 'total_days')
+    TASK_COLUMNS = ('description', 'category', 'priority', 'duration_days', 'start_date', 'end_date', 'deadline')
+
+    # version 0 until save_version starts the plan's history; set explicitly, older tables default to 1
+    INSERT_PLAN = '''
+        INSERT INTO plans (goal, domain, start_date, end_date, total_days, meta, version) VALUES (?, ?, ?, ?, ?, ?, 0)
+    '''
+    SELECT_PLAN = '''
+        SELECT id, goal, domain, start_date, end_date, total_days, meta, created_at, completed, version, revision
+        FROM plans WHERE id = ?
+    '''
+    # Every write to a plan or its tasks bumps revision, which the plan's ETag is derived from
+    UPDATE_PLAN = '''
+        UPDATE plans SET domain = ?, start_date = ?, end_date = ?, total_days = ?, meta = ?, revision = revision + 1
+        WHERE id = ?
+    '''
+    BUMP_REVISION = 'UPDATE plans SET revision = revision + 1 WHERE id = ?'
+    UPSERT_TASK = '''
+        INSERT INTO tasks (plan_id, task_id, position, description, category, priority, duration_days,
+                           start_date, end_date, deadline, dependencies, extra, status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (plan_id, task_id) DO UPDATE SET
+            position = excluded.position, description = excluded.description, category = excluded.category,
+            priority = excluded.priority, duration_days = excluded.duration_days, start_date = excluded.start_date,
+            end_date = excluded.end_date, deadline = excluded.deadline, dependencies = excluded.dependencies,
+            extra = excluded.extra
+    '''
+    SELECT_TASKS = '''
+        SELECT task_id, description, category, priority, duration_days, start_date, end_date, deadline,
+               dependencies, extra, status
+        FROM tasks WHERE plan_id = ? ORDER BY position
+    '''
+    SELECT_COMPLETED = "SELECT task_id FROM tasks WHERE plan_id = ? AND status = 'completed' ORDER BY position"
+    SET_STATUS = 'UPDATE tasks SET status = ? WHERE plan_id = ? AND task_id = ? AND status != ?'
+    # Runs after every task status change, so it bumps revision too
+    REFRESH_COMPLETED = '''
+        UPDATE plans SET completed = NOT EXISTS (
+            SELECT 1 FROM tasks WHERE plan_id = plans.id AND status != 'completed'
+        ), revision = revision + 1 WHERE id = ?
+    '''
+    UPDATE_TASK_SCHEDULE = '''
+        UPDATE tasks SET duration_days = ?, start_date = ?, end_date = ?, deadline = ?, dependencies = ?
+        WHERE plan_id = ? AND task_id = ?
+    '''
+    # Task columns a single-task edit may change directly
+    TASK_DETAIL_COLUMNS = ('description', 'category', 'priority')
+    INDEX_PLANS_FOR_SEARCH = '''
+        INSERT INTO plan_search (rowid, goal, tasks)
+        SELECT id, goal, (SELECT group_concat(description, char(10)) FROM tasks WHERE plan_id = plans.id)
+        FROM plans {where}
+    '''
+    LIST_COLUMNS = '''
+        plans.id, plans.goal, plans.domain, plans.start_date, plans.end_date, plans.created_at, plans.completed,
+        plans.version, (SELECT COUNT(*) FROM tasks WHERE plan_id = plans.id)
+    '''
+    INSERT_VERSION = '''
+        INSERT INTO plan_versions (plan_id, version, parent_version, kind, source, payload) VALUES (?, ?, ?, ?, ?, ?)
+    '''
+    SELECT_VERSIONS = '''
+        SELECT version, parent_version, kind, source, LENGTH(payload), created_at
+        FROM plan_versions WHERE plan_id = ? ORDER BY version
+    '''
+    # The nearest snapshot at or before a version, then every delta up to it
+    SELECT_VERSION_CHAIN = '''
+        SELECT version, payload FROM plan_versions
+        WHERE plan_id = ? AND version <= ? AND version >= (
+            SELECT MAX(version) FROM plan_versions WHERE plan_id = ? AND version <= ? AND kind = 'snapshot'
+        )
+        ORDER BY version
+    '''
+
+    def __init__(self, pool=None):
+        # One pool per process, shared by every request handler
+        self.pool = pool or ConnectionPool(DB_PATH, size=DB_POOL_SIZE, busy_timeout_ms=DB_BUSY_TIMEOUT_MS)
         self.init_db()
 
     def init_db(self):
-        conn = sqlite3.connect('ai_plans.db')
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS plans (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                goal TEXT NOT NULL,
-                plan_data TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                completed BOOLEAN DEFAULT FALSE,
-                completed_tasks TEXT DEFAULT '[]'
+        with self.pool.transaction() as conn:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version >= self.SCHEMA_VERSION:
+                return
+
+            legacy = 'plan_data' in {row[1] for row in conn.execute('PRAGMA table_info(plans)')}
+            if legacy:
+                conn.execute('ALTER TABLE plans RENAME TO plans_legacy')
+
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS plans (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    goal TEXT NOT NULL,
+                    domain TEXT,
+                    start_date TEXT,
+                    end_date TEXT,
+                    total_days INTEGER,
+                    meta TEXT NOT NULL DEFAULT '{}',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    completed BOOLEAN DEFAULT FALSE,
+                    version INTEGER NOT NULL DEFAULT 0,
+                    revision INTEGER NOT NULL DEFAULT 1
+                )
+            ''')
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(plans)')}
+            for column in ('version', 'revision'):
+                if column not in columns:
+                    conn.execute(f'ALTER TABLE plans ADD COLUMN {column} INTEGER NOT NULL DEFAULT 1')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS tasks (
+                    plan_id INTEGER NOT NULL REFERENCES plans(id) ON DELETE CASCADE,
+                    task_id INTEGER NOT NULL,
+                    position INTEGER NOT NULL,
+                    description TEXT,
+                    category TEXT,
+                    priority TEXT,
+                    duration_days INTEGER,
+                    start_date TEXT,
+                    end_date TEXT,
+                    deadline TEXT,
+                    dependencies TEXT NOT NULL DEFAULT '[]',
+                    extra TEXT NOT NULL DEFAULT '{}',
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    PRIMARY KEY (plan_id, task_id)
+                ) WITHOUT ROWID
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (plan_id, status)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_tasks_deadline ON tasks (deadline)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks (priority)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_tasks_category ON tasks (category)')
+            # Version history: a full snapshot every PLAN_SNAPSHOT_INTERVAL versions, deltas to the parent otherwise
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS plan_versions (
+                    plan_id INTEGER NOT NULL REFERENCES plans(id) ON DELETE CASCADE,
+                    version INTEGER NOT NULL,
+                    parent_version INTEGER,
+                    kind TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (plan_id, version)
+                ) WITHOUT ROWID
+            ''')
+            # Keyset pagination for listings walks this index newest first
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_plans_created ON plans (created_at, id)')
+            # Full-text index over goals and task descriptions; rowid is the plan id
+            search_exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'plan_search'").fetchone()
+            conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS plan_search USING fts5(goal, tasks, tokenize = 'porter unicode61')")
+
+            if legacy:
+                self._migrate_legacy_plans(conn)
+            if not search_exists:
+                conn.execute(self.INDEX_PLANS_FOR_SEARCH.format(where=''))
+            # Schema 6: plans without recorded history report version 0, not a version 1 that can't be fetched
+            conn.execute('UPDATE plans SET version = 0 WHERE id NOT IN (SELECT plan_id FROM plan_versions)')
+            conn.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
+
+    def _migrate_legacy_plans(self, conn):
+        """Split plan_data/completed_tasks JSON blobs from the v1 schema into rows"""
+        rows = conn.execute(
+            'SELECT id, goal, plan_data, created_at, completed, completed_tasks FROM plans_legacy ORDER BY id'
+        ).fetchall()
+        for plan_id, goal, plan_data, created_at, completed, completed_tasks in rows:
+            plan_data = json_codec.loads(plan_data)
+            conn.execute(
+                'INSERT INTO plans (id, goal, domain, start_date, end_date, total_days, meta, created_at, completed) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (plan_id, goal, *self._plan_values(plan_data), created_at, completed)
             )
-        ''')
-        conn.commit()
-        conn.close()
+            self._write_tasks(conn, plan_id, plan_data.get('tasks', []))
+            self._set_completed(conn, plan_id, json_codec.loads(completed_tasks) if completed_tasks else [])
+        conn.execute('DROP TABLE plans_legacy')
+        print(f"✅ Migrated {len(rows)} plan(s) to the normalized task schema")
 
-    def save_plan(self, goal, plan_data):
-        conn = sqlite3.connect('ai_plans.db')
-        cursor = conn.cursor()
-        cursor.execute(
-            'INSERT INTO plans (goal, plan_data) VALUES (?, ?)',
-            (goal, json.dumps(plan_data))
+    def _plan_values(self, plan_data):
+        meta = {key: value for key, value in plan_data.items()
+                if key not in self.PLAN_COLUMNS and key not in ('goal', 'tasks', 'total_tasks')}
+        return tuple(plan_data.get(column) for column in self.PLAN_COLUMNS) + (json_codec.dumps(meta),)
+
+    def _task_values(self, plan_id, position, task):
+        extra = {key: value for key, value in task.items()
+                 if key not in self.TASK_COLUMNS and key not in ('id', 'dependencies', 'completed')}
+        return (
+            plan_id, task['id'], position,
+            *(task.get(column) for column in self.TASK_COLUMNS),
+            json_codec.dumps(task.get('dependencies') or []),
+            json_codec.dumps(extra),
+            'completed' if task.get('completed') else 'pending',
         )
-        plan_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+
+    def _write_tasks(self, conn, plan_id, tasks):
+        conn.executemany(self.UPSERT_TASK, [self._task_values(plan_id, position, task)
+                                            for position, task in enumerate(tasks)])
+        # Drop rows for tasks that are no longer part of the plan
+        task_ids = [task['id'] for task in tasks]
+        conn.execute(
+            f'DELETE FROM tasks WHERE plan_id = ? AND task_id NOT IN ({",".join("?" * len(task_ids))})',
+            (plan_id, *task_ids)
+        )
+
+    def _set_completed(self, conn, plan_id, completed_tasks):
+        """Mark exactly the given task ids (or {'id': ...} dicts) as completed, touching only changed rows"""
+        target = {str(task['id'] if isinstance(task, dict) else task): task['id'] if isinstance(task, dict) else task
+                  for task in completed_tasks}
+        current = {str(row[0]): row[0] for row in conn.execute(self.SELECT_COMPLETED, (plan_id,))}
+        changes = [('pending', plan_id, current[key], 'pending') for key in current.keys() - target.keys()]
+        changes += [('completed', plan_id, target[key], 'completed') for key in target.keys() - current.keys()]
+        if changes:
+            conn.executemany(self.SET_STATUS, changes)
+            conn.execute(self.REFRESH_COMPLETED, (plan_id,))
+
+    def _insert_plan(self, conn, goal, plan_data):
+        plan_id = conn.execute(self.INSERT_PLAN, (goal, *self._plan_values(plan_data))).lastrowid
+        self._write_tasks(conn, plan_id, plan_data.get('tasks', []))
+        self._index_for_search(conn, plan_id)
         return plan_id
 
-    def get_plan(self, plan_id):
-        conn = sqlite3.connect('ai_plans.db')
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM plans WHERE id = ?', (plan_id,))
-        result = cursor.fetchone()
-        conn.close()
-        
-        if result:
-            return {
-                'id': result[0],
-                'goal': result[1],
-                'plan_data': json.loads(result[2]),
-                'created_at': result[3],
-                'completed': bool(result[4]),
-                'completed_tasks': json.loads(result[5]) if result[5] else []
-            }
-        return None
+    def _index_for_search(self, conn, plan_id):
+        """Refresh a plan's full-text entry from its goal and task rows"""
+        conn.execute('DELETE FROM plan_search WHERE rowid = ?', (plan_id,))
+        conn.execute(self.INDEX_PLANS_FOR_SEARCH.format(where='WHERE id = ?'), (plan_id,))
 
-    def update_plan(self, plan_id, plan_data, completed_tasks):
-        conn = sqlite3.connect('ai_plans.db')
-        cursor = conn.cursor()
-        cursor.execute(
-            'UPDATE plans SET plan_data = ?, completed_tasks = ? WHERE id = ?',
-            (json.dumps(plan_data), json.dumps(completed_tasks), plan_id)
-        )
-        conn.commit()
-        conn.close()
+    @metrics.DB_OPERATION_SECONDS.time(operation='save_plan')
+    def save_plan(self, goal, plan_data):
+        with self.pool.transaction() as conn:
+            return self._insert_plan(conn, goal, plan_data)
+
+    @metrics.DB_OPERATION_SECONDS.time(operation='save_plans')
+    def save_plans(self, plans):
+        """Save (goal, plan_data) pairs in a single transaction and return their ids"""
+        with self.pool.transaction() as conn:
+            return [self._insert_plan(conn, goal, plan_data) for goal, plan_data in plans]
+
+    @metrics.DB_OPERATION_SECONDS.time(operation='get_plan')
+    def get_plan(self, plan_id, include_tasks=True):
+        """Assemble a plan from its rows; include_tasks=False skips the task rows"""
+        with self.pool.connection() as conn:
+            return self._load_plan(conn, plan_id, include_tasks)
+
+    def _load_plan(self, conn, plan_id, include_tasks=True):
+        result = conn.execute(self.SELECT_PLAN, (plan_id,)).fetchone()
+        if not result:
+            return None
+        task_rows = conn.execute(self.SELECT_TASKS, (plan_id,)).fetchall() if include_tasks else None
+        completed_ids = [row[0] for row in conn.execute(self.SELECT_COMPLETED, (plan_id,))]
+
+        plan_id, goal, domain, start_date, end_date, total_days, meta, created_at, completed, version, revision = result
+        plan_data = {'goal': goal, 'domain': domain, 'start_date': start_date, 'end_date': end_date,
+                     'total_days': total_days}
+        plan_data.update(json_codec.loads(meta))
+        if task_rows is not None:
+            plan_data['tasks'] = [self._assemble_task(row) for row in task_rows]
+            plan_data['total_tasks'] = len(task_rows)
+
+        return {
+            'id': plan_id,
+            'goal': goal,
+            'plan_data': plan_data,
+            'created_at': created_at,
+            'completed': bool(completed),
+            'completed_tasks': [{'id': task_id} for task_id in completed_ids],
+            'version': version,
+            'revision': revision
+        }
+
+    @metrics.DB_OPERATION_SECONDS.time(operation='get_plan_revision')
+    def get_plan_revision(self, plan_id):
+        """The plan's revision without loading it (for conditional requests); None if it does not exist"""
+        with self.pool.connection() as conn:
+            row = conn.execute('SELECT revision FROM plans WHERE id = ?', (plan_id,)).fetchone()
+            return row[0] if row else None
+
+    def _assemble_task(self, row):
+        task = {'id': row[0]}
+        task.update(zip(self.TASK_COLUMNS, row[1:8]))
+        task['dependencies'] = json_codec.loads(row[8])
+        task.update(json_codec.loads(row[9]))
+        task['completed'] = row[10] == 'completed'
+        return task
+
+    @metrics.DB_OPERATION_SECONDS.time(operation='update_plan')
+    def update_plan(self, plan_id, plan_data, completed_tasks, expected_revision=None):
+        with self.pool.transaction() as conn:
+            self._check_revision(conn, plan_id, expected_revision)
+            conn.execute(self.UPDATE_PLAN, (*self._plan_values(plan_data), plan_id))
+            if 'tasks' in plan_data:
+                self._write_tasks(conn, plan_id, plan_data['tasks'])
+                self._index_for_search(conn, plan_id)
+            self._set_completed(conn, plan_id, completed_tasks)
+
+    def _check_revision(self, conn, plan_id, expected_revision):
+        """Raise PlanConflictError unless the plan is still at expected_revision (None skips the check).
+
+        Writes run in BEGIN IMMEDIATE transactions, so the check holds until commit.
+        """
+        if expected_revision is None:
+            return
+        row = conn.execute('SELECT revision FROM plans WHERE id = ?', (plan_id,)).fetchone()
+        if not row or row[0] != expected_revision:
+            raise PlanConflictError(f'Plan {plan_id} changed since revision {expected_revision}')
+
+    def _current_revision(self, conn, plan_id):
+        return conn.execute('SELECT revision FROM plans WHERE id = ?', (plan_id,)).fetchone()[0]
+
+    @metrics.DB_OPERATION_SECONDS.time(operation='apply_progress')
+    def apply_progress(self, plan_id, complete=(), uncomplete=()):
+        """Apply a progress delta; cost depends on the delta, not the plan size.
+
+        Returns the number of tasks whose status changed, or None if the plan does not exist.
+        """
+        changes = [('completed', plan_id, task_id, 'completed') for task_id in complete]
+        changes += [('pending', plan_id, task_id, 'pending') for task_id in uncomplete]
+        with self.pool.transaction() as conn:
+            if not conn.execute('SELECT 1 FROM plans WHERE id = ?', (plan_id,)).fetchone():
+                return None
+            if not changes:
+                return 0
+            changed = conn.executemany(self.SET_STATUS, changes).rowcount
+            if changed:
+                conn.execute(self.REFRESH_COMPLETED, (plan_id,))
+            return changed
+
+    @metrics.DB_OPERATION_SECONDS.time(operation='set_completed_tasks')
+    def set_completed_tasks(self, plan_id, completed_tasks):
+        """Row-level progress update; returns False if the plan does not exist"""
+        with self.pool.transaction() as conn:
+            if not conn.execute('SELECT 1 FROM plans WHERE id = ?', (plan_id,)).fetchone():
+                return False
+            self._set_completed(conn, plan_id, completed_tasks)
+            return True
+
+    @metrics.DB_OPERATION_SECONDS.time(operation='update_task_schedules')
+    def update_task_schedules(self, plan_id, schedules, details=None, expected_revision=None):
+        """Write re-dated tasks (IncrementalScheduler.task_dates dicts) and optional column edits for one task.
+
+        details is (task_id, {column: value}) with columns from TASK_DETAIL_COLUMNS.
+        Returns the plan's new revision.
+        """
+        with self.pool.transaction() as conn:
+            self._check_revision(conn, plan_id, expected_revision)
+            conn.executemany(self.UPDATE_TASK_SCHEDULE, [
+                (entry['duration_days'], entry['start_date'], entry['end_date'], entry['deadline'],
+                 json_codec.dumps(entry['dependencies']), plan_id, entry['id'])
+                for entry in schedules
+            ])
+            if details and details[1]:
+                task_id, values = details
+                columns = [column for column in self.TASK_DETAIL_COLUMNS if column in values]
+                conn.execute(
+                    f'UPDATE tasks SET {", ".join(f"{column} = ?" for column in columns)} '
+                    'WHERE plan_id = ? AND task_id = ?',
+                    (*(values[column] for column in columns), plan_id, task_id)
+                )
+                if 'description' in values:
+                    self._index_for_search(conn, plan_id)
+            conn.execute(self.BUMP_REVISION, (plan_id,))
+            return self._current_revision(conn, plan_id)
+
+    @metrics.DB_OPERATION_SECONDS.time(operation='add_task')
+    def add_task(self, plan_id, task, expected_revision=None):
+        """Append one task after the plan's last position; returns the plan's new revision"""
+        with self.pool.transaction() as conn:
+            self._check_revision(conn, plan_id, expected_revision)
+            position = conn.execute('SELECT COALESCE(MAX(position), -1) + 1 FROM tasks WHERE plan_id = ?',
+                                    (plan_id,)).fetchone()[0]
+            conn.execute(self.UPSERT_TASK, self._task_values(plan_id, position, task))
+            # A new pending task reopens a completed plan
+            conn.execute(self.REFRESH_COMPLETED, (plan_id,))
+            self._index_for_search(conn, plan_id)
+            return self._current_revision(conn, plan_id)
+
+    def _version_content(self, conn, plan_id, version):
+        rows = conn.execute(self.SELECT_VERSION_CHAIN, (plan_id, version, plan_id, version)).fetchall()
+        # The chain stops at the newest version <= the one asked for, which need not be that version
+        if not rows or rows[-1][0] != version:
+            return None
+        payloads = [payload for _, payload in rows]
+        content = json_codec.loads(payloads[0])
+        for payload in payloads[1:]:
+            content = plan_history.apply(content, json_codec.loads(payload))
+        return content
+
+    def _insert_version(self, conn, plan_id, version, parent, content, source):
+        """Store content as a delta to parent (version - 1), or as a snapshot on schedule or when smaller"""
+        snapshot = json_codec.dumps(content)
+        kind, payload = 'snapshot', snapshot
+        if parent is not None and (version - 1) % PLAN_SNAPSHOT_INTERVAL:
+            delta = json_codec.dumps(plan_history.diff(parent, content))
+            if len(delta) < len(snapshot):
+                kind, payload = 'delta', delta
+        conn.execute(self.INSERT_VERSION, (plan_id, version, version - 1 if parent is not None else None,
+                                           kind, source, payload))
+
+    @metrics.DB_OPERATION_SECONDS.time(operation='save_version')
+    def save_version(self, plan_id, plan_data, source='regenerate'):
+        """Replace the plan's head with plan_data and record it as the next version.
+
+        History starts lazily: until the first call a plan is at version 0,
+        and that call records the existing head as version 1. Edits made to
+        the head in place since the last version are recorded as a version
+        of their own first. If plan_data leaves the content unchanged (a
+        regeneration that fell back to the plan as it was), nothing is
+        recorded. Returns the plan's version number afterwards, or None if
+        the plan does not exist.
+        """
+        with self.pool.transaction() as conn:
+            head = self._load_plan(conn, plan_id)
+            if head is None:
+                return None
+            head_content = plan_history.content(head['plan_data'])
+            conn.execute(self.UPDATE_PLAN, (*self._plan_values(plan_data), plan_id))
+            self._write_tasks(conn, plan_id, plan_data.get('tasks', []))
+            self._set_completed(conn, plan_id, [task for task in plan_data.get('tasks', []) if task.get('completed')])
+            self._index_for_search(conn, plan_id)
+            # Version what was stored, so later comparisons with the head are exact
+            stored_content = plan_history.content(self._load_plan(conn, plan_id)['plan_data'])
+            if stored_content == head_content:
+                return head['version']
+
+            latest = conn.execute('SELECT MAX(version) FROM plan_versions WHERE plan_id = ?', (plan_id,)).fetchone()[0]
+            if latest is None:
+                latest = 1
+                self._insert_version(conn, plan_id, latest, None, head_content, 'original')
+            else:
+                latest_content = self._version_content(conn, plan_id, latest)
+                if latest_content != head_content:
+                    latest += 1
+                    self._insert_version(conn, plan_id, latest, latest_content, head_content, 'edit')
+
+            version = latest + 1
+            self._insert_version(conn, plan_id, version, head_content, stored_content, source)
+            conn.execute('UPDATE plans SET version = ? WHERE id = ?', (version, plan_id))
+            return version
+
+    @metrics.DB_OPERATION_SECONDS.time(operation='list_plans')
+    def list_plans(self, limit, after=None, query=None):
+        """One page of plan summaries, newest first; returns (plans, has_more).
+
+        after is the (created_at, id) of the last plan on the previous page.
+        A listing seeks idx_plans_created past it. A search (an FTS5 query)
+        walks matches in descending rowid order instead: rowids are plan ids,
+        which are assigned in creation order, so it also stops after one
+        page rather than ranking every match.
+        """
+        if query:
+            sql = f'''
+                SELECT {self.LIST_COLUMNS}, snippet(plan_search, -1, '[', ']', '…', 12)
+                FROM plan_search CROSS JOIN plans ON plans.id = plan_search.rowid
+                WHERE plan_search MATCH ? {'AND plan_search.rowid < ?' if after else ''}
+                ORDER BY plan_search.rowid DESC LIMIT ?
+            '''
+            params = (query, after[1]) if after else (query,)
+        else:
+            sql = f'''
+                SELECT {self.LIST_COLUMNS} FROM plans
+                {'WHERE (created_at, id) < (?, ?)' if after else ''}
+                ORDER BY created_at DESC, id DESC LIMIT ?
+            '''
+            params = tuple(after) if after else ()
+
+        with self.pool.connection() as conn:
+            rows = conn.execute(sql, (*params, limit + 1)).fetchall()
+
+        plans = []
+        for row in rows[:limit]:
+            plan_id, goal, domain, start_date, end_date, created_at, completed, version, total_tasks = row[:9]
+            plan = {'id': plan_id, 'goal': goal, 'domain': domain, 'start_date': start_date, 'end_date': end_date,
+                    'created_at': created_at, 'completed': bool(completed), 'version': version,
+                    'total_tasks': total_tasks}
+            if query:
+                plan['snippet'] = row[9]
+            plans.append(plan)
+        return plans, len(rows) > limit
+
+    @metrics.DB_OPERATION_SECONDS.time(operation='get_versions')
+    def get_versions(self, plan_id):
+        """Version metadata, oldest first; None if the plan does not exist"""
+        with self.pool.connection() as conn:
+            if not conn.execute('SELECT 1 FROM plans WHERE id = ?', (plan_id,)).fetchone():
+                return None
+            return [
+                {'version': version, 'parent_version': parent_version, 'kind': kind, 'source': source,
+                 'bytes': size, 'created_at': created_at}
+                for version, parent_version, kind, source, size, created_at
+                in conn.execute(self.SELECT_VERSIONS, (plan_id,))
+            ]
+
+    @metrics.DB_OPERATION_SECONDS.time(operation='get_version')
+    def get_version(self, plan_id, version):
+        """A version's plan data rebuilt from its nearest snapshot; None if there is no such version"""
+        with self.pool.connection() as conn:
+            return self._version_content(conn, plan_id, version)
+
+class SchedulerEntry:
+    """A plan's IncrementalScheduler, the lock that serializes edits to it and the plan revision it matches"""
+    __slots__ = ('lock', 'scheduler', 'revision')
+
+    def __init__(self, scheduler, revision):
+        self.lock = threading.Lock()
+        self.scheduler = scheduler
+        self.revision = revision
+
+class SchedulerCache:
+    """LRU of IncrementalSchedulers by plan id, so task edits skip reloading and re-dating the whole plan.
+
+    Each entry records the plans.revision it was built at. Other workers
+    write to the same database, so a lookup compares it with the current
+    revision and drops the entry when they differ; writes through an entry
+    pass its revision as expected_revision and move it forward on success.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, plan_id, revision):
+        """The SchedulerEntry for a plan if it is still at revision, or None"""
+        with self.lock:
+            entry = self.entries.get(plan_id)
+            if entry is None:
+                return None
+            if entry.revision != revision:
+                del self.entries[plan_id]
+                return None
+            self.entries.move_to_end(plan_id)
+            return entry
+
+    def add(self, plan_id, scheduler, revision):
+        """Cache a freshly built scheduler; if another request cached one first, that one wins"""
+        with self.lock:
+            entry = self.entries.get(plan_id)
+            if entry is None:
+                entry = self.entries[plan_id] = SchedulerEntry(scheduler, revision)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+            self.entries.move_to_end(plan_id)
+            return entry
+
+    def invalidate(self, plan_id):
+        with self.lock:
+            self.entries.pop(plan_id, None)
 
 # Initialize services with error handling
+planner = None
+db = None
+llm_cache = None
 try:
-    planner = AITaskPlanner()
-    db = AIDatabase()
+    pool = ConnectionPool(DB_PATH, size=DB_POOL_SIZE, busy_timeout_ms=DB_BUSY_TIMEOUT_MS)
+    db = AIDatabase(pool)
+    if LLM_CACHE_MAX_ENTRIES > 0:
+        llm_cache = LLMResponseCache(pool, max_entries=LLM_CACHE_MAX_ENTRIES, max_bytes=LLM_CACHE_MAX_BYTES,
+                                     ttl_seconds=LLM_CACHE_TTL_SECONDS)
+    planner = AITaskPlanner(cache=llm_cache)
+    # Under ASGI the async planner serves the model calls and warms up its own client
+    if OPENAI_WARMUP and 'ai_backend_async' not in sys.modules:
+        planner.start_warmup()
     print("✅ AI-powered planning services initialized")
 except Exception as e:
     print(f"❌ Failed to initialize services: {e}")
-    planner = None
-    db = None
+scheduler_cache = SchedulerCache(SCHEDULER_CACHE_SIZE)
+
+@app.before_request
+def track_request_start():
+    # Label by URL rule rather than path so /api/plan/<id> stays one series
+    g.metrics_route = request.url_rule.rule if request.url_rule else 'unmatched'
+    g.metrics_started = time.perf_counter()
+    metrics.HTTP_IN_PROGRESS.inc(method=request.method, route=g.metrics_route)
+
+def finish_request_metrics(method, route, started, status):
+    metrics.HTTP_IN_PROGRESS.dec(method=method, route=route)
+    metrics.HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, method=method, route=route, status=status)
+
+@app.after_request
+def track_request_status(response):
+    if response.is_streamed:
+        # Streams outlive the request context; count them until the body is fully sent
+        labels = (request.method, g.metrics_route, g.pop('metrics_started'), response.status_code)
+        response.call_on_close(lambda: finish_request_metrics(*labels))
+    else:
+        g.metrics_status = response.status_code
+    return response
+
+@app.after_request
+def compress_response(response):
+    return compression.compress_response(response, request.headers.get('Accept-Encoding', ''))
+
+@app.teardown_request
+def track_request_end(exc):
+    if 'metrics_started' in g:
+        finish_request_metrics(request.method, g.metrics_route, g.metrics_started, g.get('metrics_status', 500))
+
+def error_status(e):
+    """HTTP status for an unexpected error: an exhausted connection pool means overloaded, not broken"""
+    return 503 if isinstance(e, PoolTimeoutError) else 500
+
+@app.errorhandler(PoolTimeoutError)
+def pool_exhausted(e):
+    return jsonify({'error': str(e)}), 503
 
 @app.route('/')
 def home():
@@ -342,6 +1037,27 @@ def home():
         ]
     })
 
+def parse_generate_request(data):
+    """(goal, start_date, end_date, constraints) from a generate-plan body, shared by the WSGI and ASGI routes.
+
+    constraints is None unless a 'schedule' was given. Raises ValueError
+    with a user-facing message.
+    """
+    goal = data.get('goal', '').strip()
+    start_date = data.get('start_date', '').strip()
+    end_date = data.get('end_date', '').strip()
+    
+    if not goal:
+        raise ValueError('Goal is required')
+    
+    if not start_date or not end_date:
+        raise ValueError('Start date and end date are required')
+    
+    # PlanValidationError is a ValueError: unparseable dates or an end before the start
+    parse_date_range(start_date, end_date)
+    constraints = parse_constraints(data['schedule']) if data.get('schedule') else None
+    return goal, start_date, end_date, constraints
+
 @app.route('/api/generate-plan', methods=['POST'])
 def generate_plan():
     """Generate AI-powered plan"""
@@ -350,20 +1066,17 @@ def generate_plan():
             return jsonify({'error': 'AI services not available'}), 503
             
         data = request.get_json()
-        goal = data.get('goal', '').strip()
-        start_date = data.get('start_date', '').strip()
-        end_date = data.get('end_date', '').strip()
-        
-        if not goal:
-            return jsonify({'error': 'Goal is required'}), 400
-        
-        if not start_date or not end_date:
-            return jsonify({'error': 'Start date and end date are required'}), 400
+        try:
+            goal, start_date, end_date, constraints = parse_generate_request(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         print(f"🎯 Generating AI-powered plan for: {goal}")
         
         # Generate AI plan
         plan_data = planner.generate_ai_plan(goal, start_date, end_date)
+        if constraints:
+            plan_data = planner.apply_schedule_constraints(plan_data, constraints)
         
         # Save to database
         plan_id = db.save_plan(goal, plan_data)
@@ -376,7 +1089,117 @@ def generate_plan():
         
     except Exception as e:
         print(f"❌ Error: {e}")
-        return jsonify({'error': str(e)}), 500
+        return jsonify({'error': str(e)}), error_status(e)
+
+def _sse(event, data):
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json_codec.dumps(data)}\n\n"
+
+@app.route('/api/generate-plan/stream', methods=['POST'])
+def generate_plan_stream():
+    """Generate AI-powered plan, streaming tasks as Server-Sent Events"""
+    if not planner:
+        return jsonify({'error': 'AI services not available'}), 503
+        
+    data = request.get_json()
+    try:
+        goal, start_date, end_date, constraints = parse_generate_request(data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    total_days = (datetime.strptime(end_date, '%Y-%m-%d') - datetime.strptime(start_date, '%Y-%m-%d')).days
+    
+    print(f"🎯 Streaming AI-powered plan for: {goal}")
+    
+    def events():
+        yield _sse('meta', {'goal': goal, 'start_date': start_date, 'end_date': end_date, 'total_days': total_days})
+        try:
+            for event, payload in planner.stream_ai_plan(goal, start_date, end_date):
+                if event == 'plan':
+                    if constraints:
+                        # Streamed tasks carry provisional dates; the saved plan follows the requested calendar
+                        payload = planner.apply_schedule_constraints(payload, constraints)
+                    payload = {
+                        'plan_id': db.save_plan(goal, payload),
+                        'plan': payload,
+                        'message': 'AI-powered plan generated successfully!'
+                    }
+                yield _sse(event, payload)
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            yield _sse('error', {'error': str(e)})
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/generate-plans', methods=['POST'])
+def generate_plans():
+    """Generate many AI plans concurrently, streaming per-item results as Server-Sent Events"""
+    if not planner:
+        return jsonify({'error': 'AI services not available'}), 503
+        
+    data = request.get_json()
+    items = data.get('plans') or []
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'A non-empty list of plans is required'}), 400
+    
+    if len(items) > BULK_MAX_ITEMS:
+        return jsonify({'error': f'At most {BULK_MAX_ITEMS} plans per request'}), 400
+    
+    try:
+        concurrency = max(1, min(int(data.get('concurrency', BULK_CONCURRENCY)), BULK_MAX_CONCURRENCY))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'concurrency must be an integer'}), 400
+    
+    print(f"🎯 Generating {len(items)} AI-powered plans ({concurrency} at a time)")
+    
+    def generate_one(goal, start_date, end_date):
+        return planner.generate_ai_plan(goal, start_date, end_date)
+    
+    def events():
+        generated = []
+        executor = ThreadPoolExecutor(max_workers=min(concurrency, len(items)), thread_name_prefix='bulk-plan')
+        try:
+            futures = {}
+            for index, item in enumerate(items):
+                item = item if isinstance(item, dict) else {}
+                goal = str(item.get('goal') or '').strip()
+                start_date = str(item.get('start_date') or '').strip()
+                end_date = str(item.get('end_date') or '').strip()
+                if not goal or not start_date or not end_date:
+                    yield _sse('error', {'index': index, 'error': 'Goal, start date and end date are required'})
+                    continue
+                try:
+                    # Same date checks as /api/generate-plan, before a worker is spent on the item
+                    parse_date_range(start_date, end_date)
+                except PlanValidationError as e:
+                    yield _sse('error', {'index': index, 'error': str(e)})
+                    continue
+                futures[executor.submit(generate_one, goal, start_date, end_date)] = (index, goal)
+            
+            for future in as_completed(futures):
+                index, goal = futures[future]
+                try:
+                    plan_data = future.result()
+                except Exception as e:
+                    print(f"❌ Bulk item {index} failed: {e}")
+                    yield _sse('error', {'index': index, 'error': str(e)})
+                    continue
+                generated.append((index, goal, plan_data))
+                yield _sse('result', {'index': index, 'plan': plan_data})
+        finally:
+            # Stop queued generations if the client goes away mid-stream
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        try:
+            plan_ids = db.save_plans([(goal, plan_data) for _, goal, plan_data in generated])
+            yield _sse('saved', {'plan_ids': {index: plan_id for (index, _, _), plan_id in zip(generated, plan_ids)}})
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            yield _sse('error', {'error': f'Saving plans failed: {e}'})
+    
+    return Response(stream_with_context(events()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @app.route('/api/regenerate-ai', methods=['POST'])
 def regenerate_ai():
@@ -401,35 +1224,57 @@ def regenerate_ai():
         # Regenerate with AI
         original_plan = existing_plan['plan_data']
         new_plan = planner.regenerate_with_ai(original_plan, completed_tasks, feedback)
+        if original_plan.get('schedule_constraints'):
+            # Keep the calendar and capacity the plan was scheduled with
+            new_plan = planner.apply_schedule_constraints(new_plan, original_plan['schedule_constraints'])
         
-        # Save as new plan
-        new_plan_id = db.save_plan(original_plan['goal'], new_plan)
+        # Becomes the plan's new head; the previous one stays in its version history
+        plan_id = existing_plan['id']
+        version = db.save_version(plan_id, new_plan)
+        scheduler_cache.invalidate(plan_id)
         
         return jsonify({
-            'new_plan_id': new_plan_id,
+            'plan_id': plan_id,
+            # Regeneration used to create a new plan; kept so existing clients follow the same plan
+            'new_plan_id': plan_id,
+            'version': version,
             'plan': new_plan,
             'message': 'Plan regenerated with AI intelligence!'
         })
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return jsonify({'error': str(e)}), error_status(e)
 
 @app.route('/api/update-progress', methods=['POST'])
 def update_progress():
-    """Update task completion status"""
+    """Update task completion status, from a complete/uncomplete delta or the full completed list"""
     try:
         data = request.get_json()
         plan_id = data.get('plan_id')
-        completed_tasks = data.get('completed_tasks', [])
         
         if not plan_id:
             return jsonify({'error': 'Plan ID is required'}), 400
         
-        existing_plan = db.get_plan(plan_id)
-        if not existing_plan:
-            return jsonify({'error': 'Plan not found'}), 404
+        if 'complete' in data or 'uncomplete' in data:
+            complete = data.get('complete') or []
+            uncomplete = data.get('uncomplete') or []
+            if not isinstance(complete, list) or not isinstance(uncomplete, list):
+                return jsonify({'error': 'complete and uncomplete must be lists of task ids'}), 400
+            if set(map(str, complete)) & set(map(str, uncomplete)):
+                return jsonify({'error': 'A task cannot be both completed and uncompleted'}), 400
+            
+            changed = db.apply_progress(plan_id, complete, uncomplete)
+            if changed is None:
+                return jsonify({'error': 'Plan not found'}), 404
+            
+            return jsonify({
+                'message': 'Progress updated successfully!',
+                'changed': changed
+            })
         
-        db.update_plan(plan_id, existing_plan['plan_data'], completed_tasks)
+        completed_tasks = data.get('completed_tasks', [])
+        if not db.set_completed_tasks(plan_id, completed_tasks):
+            return jsonify({'error': 'Plan not found'}), 404
         
         return jsonify({
             'message': 'Progress updated successfully!',
@@ -437,15 +1282,337 @@ def update_progress():
         })
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return jsonify({'error': str(e)}), error_status(e)
+
+def readiness(llm_planner):
+    """Readiness payload and status: ready once the database is up; LLM warm-up status is informational"""
+    return {
+        'ready': db is not None,
+        'database': 'ok' if db else 'unavailable',
+        'llm': llm_planner.readiness if llm_planner else {'status': 'unavailable'}
+    }, 200 if db else 503
+
+@app.route('/api/ready', methods=['GET'])
+def ready():
+    """Readiness probe"""
+    payload, status = readiness(planner)
+    return jsonify(payload), status
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """LLM response cache hit/miss counters"""
+    if not planner or not planner.cache:
+        return jsonify({'enabled': False})
+    return jsonify(dict(planner.cache.stats(), enabled=True))
+
+@app.route('/api/plan/<int:plan_id>/schedule', methods=['POST'])
+def reschedule_plan(plan_id):
+    """Reschedule a saved plan under working calendars and per-day capacity"""
+    if not planner:
+        return jsonify({'error': 'AI services not available'}), 503
+    
+    try:
+        constraints = parse_constraints(request.get_json())
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    plan = db.get_plan(plan_id)
+    if not plan:
+        return jsonify({'error': 'Plan not found'}), 404
+    
+    plan_data = planner.apply_schedule_constraints(plan['plan_data'], constraints)
+    db.update_plan(plan_id, plan_data, plan['completed_tasks'])
+    scheduler_cache.invalidate(plan_id)
+    
+    return jsonify({
+        'plan_id': plan_id,
+        'plan': plan_data,
+        'message': 'Plan rescheduled with calendar and capacity constraints'
+    })
+
+@app.route('/api/plan/<int:plan_id>/critical-path', methods=['GET'])
+def plan_critical_path(plan_id):
+    """Per-task slack and the critical chain of a saved plan"""
+    # Deferred import: NumPy is only needed here and would slow down cold start
+    import critical_path
+    
+    plan = db.get_plan(plan_id)
+    if not plan:
+        return jsonify({'error': 'Plan not found'}), 404
+    
+    plan_data = plan['plan_data']
+    constraints = plan_data.get('schedule_constraints')
+    analysis = critical_path.analyze(plan_data.get('tasks', []))
+    if plan_data.get('start_date'):
+        analysis = critical_path.with_dates(analysis, plan_data['start_date'], constraints)
+    analysis['plan_id'] = plan_id
+    # What the offsets and dates account for: the working calendar when the plan has one, never capacity
+    analysis['calendar'] = 'working_days' if constraints else 'calendar_days'
+    analysis['capacity_modelled'] = False
+    return jsonify(analysis)
+
+SCHEDULE_FIELDS = ('id', 'duration_days', 'dependencies', 'start_date', 'end_date', 'deadline')
+
+def _plan_scheduler(plan_id):
+    """SchedulerEntry for editing a plan, plus the plan itself when it had to be loaded.
+
+    Returns (None, None) if the plan does not exist. Plans scheduled under
+    calendar/capacity constraints are never cached: their scheduler only
+    validates an edit, and the whole plan is then rescheduled.
+    """
+    revision = db.get_plan_revision(plan_id)
+    if revision is None:
+        scheduler_cache.invalidate(plan_id)
+        return None, None
+    entry = scheduler_cache.get(plan_id, revision)
+    if entry is not None:
+        return entry, None
+
+    plan = db.get_plan(plan_id)
+    if not plan:
+        return None, None
+
+    plan_data = plan['plan_data']
+    scheduler = IncrementalScheduler(plan_data.get('tasks', []), plan_data['start_date'], plan_data['end_date'])
+    if plan_data.get('schedule_constraints'):
+        return SchedulerEntry(scheduler, plan['revision']), plan
+    return scheduler_cache.add(plan_id, scheduler, plan['revision']), plan
+
+def _reschedule_constrained(plan_id, plan, edit):
+    """Apply edit(tasks) to a constraint-scheduled plan, reschedule it fully and return the re-dated tasks"""
+    plan_data = plan['plan_data']
+    before = {task['id']: tuple(task.get(field) for field in SCHEDULE_FIELDS) for task in plan_data['tasks']}
+    edit(plan_data['tasks'])
+    plan_data = planner.apply_schedule_constraints(plan_data, plan_data['schedule_constraints'])
+    db.update_plan(plan_id, plan_data, plan['completed_tasks'], expected_revision=plan['revision'])
+    return [
+        {field: task.get(field) for field in SCHEDULE_FIELDS}
+        for task in plan_data['tasks']
+        if before.get(task['id']) != tuple(task.get(field) for field in SCHEDULE_FIELDS)
+    ]
+
+def _parse_task_edit(data):
+    """Validate duration_days/dependencies from a request; raises PlanValidationError with a user-facing message"""
+    duration_days = data.get('duration_days')
+    if duration_days is not None:
+        duration_days = parse_duration(duration_days)
+
+    dependencies = data.get('dependencies')
+    if dependencies is not None:
+        dependencies = parse_dependencies(dependencies)
+    return duration_days, dependencies
+
+@app.route('/api/add-custom-task', methods=['POST'])
+def add_custom_task():
+    """Append a user-defined task, scheduling only the new task"""
+    try:
+        data = request.get_json()
+        plan_id = data.get('plan_id')
+        description = str(data.get('task_description') or '').strip()
+
+        if not plan_id or not description:
+            return jsonify({'error': 'Plan ID and task description are required'}), 400
+
+        try:
+            # Cache entries are keyed by the integer id the other routes use
+            plan_id = int(plan_id)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Plan ID must be an integer'}), 400
+
+        try:
+            duration_days, dependencies = _parse_task_edit(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        entry, plan = _plan_scheduler(plan_id)
+        if entry is None:
+            return jsonify({'error': 'Plan not found'}), 404
+
+        scheduler = entry.scheduler
+        with entry.lock:
+            task_id = scheduler.next_task_id()
+            try:
+                dates = scheduler.add_task(task_id, duration_days or 1, dependencies or [])
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+
+            task = dict(dates, description=description, category='Custom', priority='medium',
+                        completed=False, custom=True)
+            try:
+                if plan and plan['plan_data'].get('schedule_constraints'):
+                    changed = _reschedule_constrained(plan_id, plan, lambda tasks: tasks.append(dict(task)))
+                    task.update(next(item for item in changed if item['id'] == task_id))
+                else:
+                    entry.revision = db.add_task(plan_id, task, expected_revision=entry.revision)
+                    changed = [dates]
+            except PlanConflictError:
+                scheduler_cache.invalidate(plan_id)
+                return jsonify({'error': 'Plan was changed by another request, please retry'}), 409
+            except Exception:
+                scheduler_cache.invalidate(plan_id)
+                raise
+
+        return jsonify({
+            'plan_id': plan_id,
+            'task': task,
+            'changed': changed,
+            'message': 'Custom task added successfully!'
+        })
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return jsonify({'error': str(e)}), error_status(e)
+
+@app.route('/api/plan/<int:plan_id>/tasks/<int:task_id>', methods=['PATCH'])
+def update_task(plan_id, task_id):
+    """Edit one task; only tasks whose dates actually move are rescheduled and written"""
+    try:
+        data = request.get_json() or {}
+        try:
+            duration_days, dependencies = _parse_task_edit(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        details = {column: str(data[column]).strip() for column in AIDatabase.TASK_DETAIL_COLUMNS
+                   if data.get(column) is not None}
+        if duration_days is None and dependencies is None and not details:
+            return jsonify({'error': 'Nothing to update'}), 400
+
+        entry, plan = _plan_scheduler(plan_id)
+        if entry is None:
+            return jsonify({'error': 'Plan not found'}), 404
+
+        scheduler = entry.scheduler
+        with entry.lock:
+            try:
+                changed = scheduler.update_task(task_id, duration_days, dependencies)
+            except KeyError:
+                return jsonify({'error': 'Task not found'}), 404
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+
+            def edit(tasks):
+                task = next(task for task in tasks if task['id'] == task_id)
+                task.update(details)
+                task.update(scheduler.task_dates(scheduler.index_of[task_id]))
+
+            try:
+                if plan and plan['plan_data'].get('schedule_constraints'):
+                    changed = _reschedule_constrained(plan_id, plan, edit)
+                else:
+                    entry.revision = db.update_task_schedules(plan_id, changed, (task_id, details),
+                                                              expected_revision=entry.revision)
+            except PlanConflictError:
+                scheduler_cache.invalidate(plan_id)
+                return jsonify({'error': 'Plan was changed by another request, please retry'}), 409
+            except Exception:
+                scheduler_cache.invalidate(plan_id)
+                raise
+
+        return jsonify({
+            'plan_id': plan_id,
+            'task_id': task_id,
+            'changed': changed,
+            'message': 'Task updated successfully!'
+        })
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return jsonify({'error': str(e)}), error_status(e)
+
+def _encode_cursor(plan):
+    return base64.urlsafe_b64encode(json_codec.dumps_bytes([plan['created_at'], plan['id']])).decode('ascii')
+
+def _decode_cursor(cursor):
+    """(created_at, id) from a cursor; raises ValueError if it was not made by _encode_cursor"""
+    try:
+        created_at, plan_id = json_codec.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(plan_id, int):
+        raise ValueError('Invalid cursor')
+    return created_at, plan_id
+
+def _fts_query(text):
+    """FTS5 query matching every word, the last one as a prefix; words are quoted so input can't inject syntax"""
+    words = re.findall(r'\w+', text)
+    if not words:
+        return None
+    return ' '.join(f'"{word}"' for word in words) + '*'
+
+@app.route('/api/plans', methods=['GET'])
+def list_plans():
+    """Plans newest first, optionally full-text searched (q), one keyset page (cursor) at a time"""
+    try:
+        limit = max(1, min(int(request.args.get('limit', PLANS_PAGE_SIZE)), PLANS_PAGE_MAX))
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    
+    after = None
+    if request.args.get('cursor'):
+        try:
+            after = _decode_cursor(request.args['cursor'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+    
+    query = request.args.get('q', '').strip()
+    fts_query = _fts_query(query) if query else None
+    if query and not fts_query:
+        return jsonify({'plans': [], 'next_cursor': None})
+    
+    plans, more = db.list_plans(limit, after, fts_query)
+    return jsonify({
+        'plans': plans,
+        'next_cursor': _encode_cursor(plans[-1]) if more else None
+    })
+
+@app.route('/api/plan/<int:plan_id>/versions', methods=['GET'])
+def plan_versions(plan_id):
+    """A plan's version history, oldest first"""
+    versions = db.get_versions(plan_id)
+    if versions is None:
+        return jsonify({'error': 'Plan not found'}), 404
+    return jsonify({'plan_id': plan_id, 'versions': versions})
+
+@app.route('/api/plan/<int:plan_id>/versions/<int:version>', methods=['GET'])
+def plan_version(plan_id, version):
+    """One past version of a plan, rebuilt from its nearest snapshot"""
+    plan_data = db.get_version(plan_id, version)
+    if plan_data is None:
+        return jsonify({'error': 'Version not found'}), 404
+    return jsonify({'plan_id': plan_id, 'version': version, 'plan': plan_data})
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Prometheus scrape endpoint"""
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+def _plan_etag(plan_id, revision):
+    return f'{plan_id}.{revision}'
 
 @app.route('/api/plan/<int:plan_id>', methods=['GET'])
 def get_plan(plan_id):
-    """Get specific plan"""
+    """Get specific plan; If-None-Match with its current ETag gets a 304 without loading it"""
+    if request.if_none_match:
+        revision = db.get_plan_revision(plan_id)
+        matched = revision is not None and compression.matching_etag(
+            request.if_none_match, _plan_etag(plan_id, revision))
+        if matched:
+            response = Response(status=304)
+            response.set_etag(matched)
+            response.vary.add('Accept-Encoding')
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+    
     plan = db.get_plan(plan_id)
-    if plan:
-        return jsonify(plan)
-    return jsonify({'error': 'Plan not found'}), 404
+    if not plan:
+        return jsonify({'error': 'Plan not found'}), 404
+    
+    response = jsonify(plan)
+    response.set_etag(_plan_etag(plan_id, plan['revision']))
+    # Caches may keep the plan but must revalidate it on every use
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 if __name__ == '__main__':
     print("=" * 60)
@@ -0,0 +1,262 @@
+"""Asyncio-native (ASGI) serving mode for the AI backend.
+
+Run with:  uvicorn ai_backend_async:app --port 5000
+
+The LLM-bound routes (/api/generate-plan and /api/regenerate-ai) are served
+natively on the event loop with AsyncOpenAI, so a model call only holds a
+coroutine while it waits. Database and cache access, and the CPU-bound
+parsing and scheduling of replies, is pushed to worker threads. /api/ready
+reports the async planner's warm-up. Every other route is delegated to the
+Flask app, so both modes expose the same API.
+"""
+import asyncio
+import time
+from datetime import datetime
+
+from asgiref.wsgi import WsgiToAsgi
+
+import ai_backend
+import compression
+import json_codec
+import metrics
+import token_budget
+from ai_backend import (AITaskPlanner, GENERATE_TASKS, OPENAI_MODEL, OPENAI_WARMUP, PROMPT_VERSION,
+                        REGENERATE_TASKS)
+from llm_cache import make_cache_key
+from single_flight import AsyncSingleFlight
+
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class AsyncAITaskPlanner(AITaskPlanner):
+    """AITaskPlanner whose model calls are coroutines on AsyncOpenAI"""
+
+    def __init__(self, cache=None):
+        super().__init__(cache)
+        self.flights = AsyncSingleFlight()
+
+    def _create_client(self):
+        import openai
+        return openai.AsyncOpenAI(api_key=self.api_key)
+
+    async def warmup(self):
+        """Probe the API from the event loop that will own the client"""
+        self.readiness = {'status': 'warming'}
+        started = time.perf_counter()
+        try:
+            await self.client.models.list()
+            self.readiness = {'status': 'ready', 'probe_ms': round((time.perf_counter() - started) * 1000, 1)}
+        except Exception as e:
+            self.readiness = {'status': 'degraded', 'error': str(e)}
+            print(f"❌ Async OpenAI warm-up failed: {e}")
+
+    async def _complete(self, operation, messages, max_tasks):
+        """Chat completion sized for a reply of up to max_tasks tasks, timed and token-counted"""
+        prompt_tokens, max_tokens = self._token_budget(messages, max_tasks)
+        started = time.perf_counter()
+        try:
+            response = await self.client.chat.completions.create(model=OPENAI_MODEL, temperature=0.7,
+                                                                 messages=messages, max_tokens=max_tokens)
+        except Exception:
+            metrics.OPENAI_REQUEST_SECONDS.observe(time.perf_counter() - started, operation=operation, outcome='error')
+            raise
+        metrics.OPENAI_REQUEST_SECONDS.observe(time.perf_counter() - started, operation=operation, outcome='ok')
+        metrics.record_openai_usage(operation, response.usage)
+        token_budget.report(operation, prompt_tokens, max_tokens, response.usage)
+        return response
+
+    async def generate_ai_plan(self, goal, start_date, end_date):
+        """Generate intelligent plan using AI without blocking the event loop"""
+        return await self.flights.do('generate', (goal, start_date, end_date),
+                                     self._generate_ai_plan, goal, start_date, end_date)
+
+    async def _generate_ai_plan(self, goal, start_date, end_date):
+        # Outside the try: the fallback plan needs it too
+        total_days = (datetime.strptime(end_date, '%Y-%m-%d') - datetime.strptime(start_date, '%Y-%m-%d')).days
+        try:
+            cache_key = make_cache_key(goal, total_days, OPENAI_MODEL, PROMPT_VERSION)
+            cached_plan = await asyncio.to_thread(self._cached_plan, cache_key, goal, start_date, end_date)
+            if cached_plan:
+                return cached_plan
+
+            response = await self._complete(
+                'generate',
+                self._plan_messages(goal, start_date, end_date, total_days),
+                max_tasks=GENERATE_TASKS[1]
+            )
+
+            ai_response = response.choices[0].message.content
+            return await asyncio.to_thread(self._plan_from_response, ai_response, cache_key, goal, start_date, end_date)
+
+        except Exception as e:
+            print(f"❌ AI Planning failed: {e}")
+            return self._create_fallback_plan(goal, start_date, end_date, total_days)
+
+    async def regenerate_with_ai(self, original_plan, completed_tasks, feedback=""):
+        """Regenerate plan using AI with progress context without blocking the event loop"""
+        return await self.flights.do('regenerate', self._regenerate_key(original_plan, completed_tasks, feedback),
+                                     self._regenerate_with_ai, original_plan, completed_tasks, feedback)
+
+    async def _regenerate_with_ai(self, original_plan, completed_tasks, feedback):
+        try:
+            completed_tasks = await asyncio.to_thread(self._resolve_completed, original_plan, completed_tasks)
+            response = await self._complete(
+                'regenerate',
+                self._regenerate_messages(original_plan, completed_tasks, feedback),
+                max_tasks=REGENERATE_TASKS[1]
+            )
+
+            ai_response = response.choices[0].message.content
+            return await asyncio.to_thread(self._regenerated_plan_from_response,
+                                           ai_response, original_plan, completed_tasks)
+
+        except Exception as e:
+            print(f"❌ AI Regeneration failed: {e}")
+            metrics.PLANS_GENERATED.inc(operation='regenerate', source='fallback')
+            return original_plan
+
+
+async def read_json(receive):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if len(body) > MAX_BODY_BYTES:
+            raise ValueError('Request body too large')
+        if not message.get('more_body'):
+            break
+    return json_codec.loads(body or b'{}')
+
+
+async def send_json(send, payload, status=200, accept_encoding=''):
+    body, encoding = compression.encode(json_codec.dumps_bytes(payload), accept_encoding)
+    headers = [
+        (b'content-type', b'application/json'),
+        (b'content-length', str(len(body)).encode('ascii')),
+        (b'access-control-allow-origin', b'*'),
+        (b'vary', b'Accept-Encoding'),
+    ]
+    if encoding:
+        headers.append((b'content-encoding', encoding.encode('ascii')))
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': headers,
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def generate_plan(data):
+    """Generate AI-powered plan"""
+    try:
+        goal, start_date, end_date, constraints = ai_backend.parse_generate_request(data)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+    print(f"🎯 Generating AI-powered plan for: {goal}")
+
+    plan_data = await async_planner.generate_ai_plan(goal, start_date, end_date)
+    if constraints:
+        plan_data = async_planner.apply_schedule_constraints(plan_data, constraints)
+    plan_id = await asyncio.to_thread(ai_backend.db.save_plan, goal, plan_data)
+
+    return {
+        'plan_id': plan_id,
+        'plan': plan_data,
+        'message': 'AI-powered plan generated successfully!'
+    }, 200
+
+
+async def regenerate_ai(data):
+    """Regenerate plan using AI with context"""
+    plan_id = data.get('plan_id')
+    completed_tasks = data.get('completed_tasks', [])
+    feedback = data.get('feedback', '')
+
+    if not plan_id:
+        return {'error': 'Plan ID is required'}, 400
+
+    existing_plan = await asyncio.to_thread(ai_backend.db.get_plan, plan_id)
+    if not existing_plan:
+        return {'error': 'Plan not found'}, 404
+
+    original_plan = existing_plan['plan_data']
+    new_plan = await async_planner.regenerate_with_ai(original_plan, completed_tasks, feedback)
+    if original_plan.get('schedule_constraints'):
+        new_plan = async_planner.apply_schedule_constraints(new_plan, original_plan['schedule_constraints'])
+    plan_id = existing_plan['id']
+    version = await asyncio.to_thread(ai_backend.db.save_version, plan_id, new_plan)
+    ai_backend.scheduler_cache.invalidate(plan_id)
+
+    return {
+        'plan_id': plan_id,
+        'new_plan_id': plan_id,
+        'version': version,
+        'plan': new_plan,
+        'message': 'Plan regenerated with AI intelligence!'
+    }, 200
+
+
+async def ready(data):
+    """Readiness probe reporting the async planner, which owns the model client in this mode"""
+    return ai_backend.readiness(async_planner)
+
+
+ROUTES = {
+    ('POST', '/api/generate-plan'): generate_plan,
+    ('POST', '/api/regenerate-ai'): regenerate_ai,
+    ('GET', '/api/ready'): ready,
+}
+
+flask_app = WsgiToAsgi(ai_backend.app)
+
+try:
+    async_planner = AsyncAITaskPlanner(cache=ai_backend.llm_cache)
+except Exception as e:
+    print(f"❌ Failed to initialize async planner: {e}")
+    async_planner = None
+
+
+async def app(scope, receive, send):
+    handler = ROUTES.get((scope.get('method'), scope.get('path'))) if scope['type'] == 'http' else None
+    if handler is None:
+        if scope['type'] == 'lifespan':
+            return await lifespan(receive, send)
+        return await flask_app(scope, receive, send)
+
+    method, route = scope['method'], scope['path']
+    accept_encoding = dict(scope['headers']).get(b'accept-encoding', b'').decode('latin-1')
+    started = time.perf_counter()
+    metrics.HTTP_IN_PROGRESS.inc(method=method, route=route)
+    status = 500
+    try:
+        if handler is not ready and (not async_planner or not ai_backend.db):
+            status = 503
+            return await send_json(send, {'error': 'AI services not available'}, status)
+
+        try:
+            data = await read_json(receive)
+            payload, status = await handler(data)
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            payload, status = {'error': str(e)}, ai_backend.error_status(e)
+        await send_json(send, payload, status, accept_encoding)
+    finally:
+        ai_backend.finish_request_metrics(method, route, started, status)
+
+
+async def lifespan(receive, send):
+    warmup_task = None
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            if async_planner and OPENAI_WARMUP:
+                warmup_task = asyncio.create_task(async_planner.warmup())
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if warmup_task and not warmup_task.done():
+                warmup_task.cancel()
+            if async_planner and async_planner._client is not None:
+                await async_planner._client.close()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
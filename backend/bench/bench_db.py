@@ -0,0 +1,111 @@
+"""Compare plan storage throughput with and without the connection pool.
+
+Usage: python bench/bench_db.py [--threads 8] [--ops 2000]
+
+The "before" numbers replay the old open/commit/close-per-call access
+pattern; "after" goes through AIDatabase and its shared pool. Each run uses
+a throwaway database file.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from db_pool import ConnectionPool  # noqa: E402
+
+SAMPLE_PLAN = {
+    'goal': 'Benchmark plan',
+    'tasks': [{'id': i, 'description': f'Task {i}', 'duration_days': 2, 'dependencies': [i - 1] if i > 1 else []}
+              for i in range(1, 9)],
+}
+
+
+class NaiveDatabase:
+    """The pre-pool access pattern: one connection per call"""
+
+    def __init__(self, path):
+        self.path = path
+        conn = sqlite3.connect(path)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS plans (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                goal TEXT NOT NULL,
+                plan_data TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                completed BOOLEAN DEFAULT FALSE,
+                completed_tasks TEXT DEFAULT '[]'
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def save_plan(self, goal, plan_data):
+        conn = sqlite3.connect(self.path)
+        cursor = conn.cursor()
+        cursor.execute('INSERT INTO plans (goal, plan_data) VALUES (?, ?)', (goal, json.dumps(plan_data)))
+        plan_id = cursor.lastrowid
+        conn.commit()
+        conn.close()
+        return plan_id
+
+    def get_plan(self, plan_id):
+        conn = sqlite3.connect(self.path)
+        cursor = conn.cursor()
+        cursor.execute('SELECT * FROM plans WHERE id = ?', (plan_id,))
+        result = cursor.fetchone()
+        conn.close()
+        return json.loads(result[2]) if result else None
+
+
+def run_threads(threads, ops, work):
+    errors = []
+
+    def worker(offset):
+        for i in range(ops // threads):
+            try:
+                work(offset + i)
+            except Exception as e:
+                errors.append(e)
+
+    pool = [threading.Thread(target=worker, args=(t * ops,)) for t in range(threads)]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return (ops // threads) * threads / elapsed, len(errors)
+
+
+def bench(name, db, threads, ops):
+    writes, write_errors = run_threads(threads, ops, lambda i: db.save_plan('Benchmark plan', SAMPLE_PLAN))
+    reads, read_errors = run_threads(threads, ops, lambda i: db.get_plan(1 + i % ops))
+    print(f"{name:<8} writes/s: {writes:>10.0f}  reads/s: {reads:>10.0f}  errors: {write_errors + read_errors}")
+    return writes, reads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--ops', type=int, default=2000)
+    args = parser.parse_args()
+
+    from ai_backend import AIDatabase
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before = bench('before', NaiveDatabase(os.path.join(tmp, 'naive.db')), args.threads, args.ops)
+        pool = ConnectionPool(os.path.join(tmp, 'pooled.db'), size=args.threads)
+        after = bench('after', AIDatabase(pool=pool), args.threads, args.ops)
+        pool.close()
+
+    print(f"speedup  writes: {after[0] / before[0]:.1f}x  reads: {after[1] / before[1]:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
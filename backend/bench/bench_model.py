@@ -0,0 +1,69 @@
+"""Validation and JSON (de)serialization time of large plans.
+
+Usage: python bench/bench_model.py [--tasks 10000] [--repeat 5]
+
+Times plan_model.validate_tasks on freshly decoded task dicts, and
+compares the stdlib json module with json_codec on a scheduled plan, both
+directions (best of --repeat runs).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import json_codec  # noqa: E402
+from plan_model import validate_tasks  # noqa: E402
+from scheduler import schedule_tasks  # noqa: E402
+
+START_DATE = '2024-01-01'
+END_DATE = '2030-01-01'
+
+
+def make_tasks(count):
+    return [{'id': i, 'description': f'Task number {i} of the benchmark plan', 'category': 'Bench',
+             'priority': ('high', 'medium', 'low')[i % 3], 'duration_days': 1 + i % 5,
+             'dependencies': [i - 1] if i > 1 else []}
+            for i in range(1, count + 1)]
+
+
+def best_of(repeat, fn):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--tasks', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    tasks = schedule_tasks(make_tasks(args.tasks), START_DATE, END_DATE)
+    # Each run validates its own decoded copy, as a plan read from the model or the cache would be
+    encoded = json.dumps(tasks)
+    copies = [json.loads(encoded) for _ in range(args.repeat)]
+    validate_ms = best_of(args.repeat, lambda: validate_tasks(copies.pop()))
+    print(f"validate_tasks: {validate_ms:.2f} ms for {args.tasks} tasks")
+
+    plan = {'goal': 'Benchmark plan', 'domain': 'Bench', 'start_date': START_DATE, 'end_date': END_DATE,
+            'tasks': tasks, 'total_tasks': len(tasks)}
+    text = json.dumps(plan)
+    print(f"plan: {args.tasks} tasks, {len(text) / 1024:.0f} KiB of JSON, codec: {json_codec.NAME}")
+    timings = {
+        'dumps': (best_of(args.repeat, lambda: json.dumps(plan)),
+                  best_of(args.repeat, lambda: json_codec.dumps_bytes(plan))),
+        'loads': (best_of(args.repeat, lambda: json.loads(text)),
+                  best_of(args.repeat, lambda: json_codec.loads(text))),
+    }
+    for name, (stdlib, codec) in timings.items():
+        print(f"{name}  json: {stdlib:>8.2f} ms  {json_codec.NAME}: {codec:>8.2f} ms  speedup: {stdlib / codec:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
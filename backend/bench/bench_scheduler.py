@@ -0,0 +1,254 @@
+"""Scheduler benchmark over synthetic dependency DAGs.
+
+Usage:
+    python bench/bench_scheduler.py                      # compare against the baseline
+    python bench/bench_scheduler.py --update-baseline    # record a new baseline
+    python bench/bench_scheduler.py --sizes 10,1000 --shapes chain
+
+For every shape (chain, fan-out, diamond) and size it times
+AITaskPlanner._schedule_tasks_with_dates and json serialization of the
+resulting plan (best of --repeat runs), and records peak traced memory in
+a separate run. _create_fallback_plan is timed as well.
+
+Absolute timings only mean something on the machine that recorded them, so
+every run also times a fixed reference workload that does not touch the
+backend. The baseline (bench/scheduler_baseline.json) stores that reference
+time next to the case timings, and before comparing, the baseline is scaled
+by how much faster or slower the reference ran this time. The run exits
+non-zero if any scaled timing is more than --threshold slower.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..'))
+
+BASELINE_PATH = os.path.join(BENCH_DIR, 'scheduler_baseline.json')
+DEFAULT_SIZES = (10, 100, 1000, 10000, 100000)
+START_DATE = '2024-01-01'
+END_DATE = '9000-01-01'  # far enough out that long chains are not clamped
+# Timings this small are dominated by noise, so regressions below it are ignored
+NOISE_FLOOR_MS = 0.5
+REFERENCE_KEY = 'reference'
+
+
+def make_task(task_id, dependencies, rng):
+    return {
+        'id': task_id,
+        'description': f'Synthetic task {task_id}',
+        'category': 'Benchmark',
+        'priority': rng.choice(('high', 'medium', 'low')),
+        'duration_days': rng.randint(1, 5),
+        'dependencies': dependencies,
+        'completed': False
+    }
+
+
+def chain(size, rng):
+    return [make_task(i, [i - 1] if i > 1 else [], rng) for i in range(1, size + 1)]
+
+
+def fan_out(size, rng):
+    """One root feeding every other task, with a final join"""
+    tasks = [make_task(1, [], rng)]
+    tasks += [make_task(i, [1], rng) for i in range(2, size)]
+    if size > 1:
+        tasks.append(make_task(size, list(range(2, size)), rng))
+    return tasks
+
+
+def diamond(size, rng, width=4):
+    """Stacked diamonds: a split task, `width` parallel tasks, then a join"""
+    tasks = []
+    join = None
+    next_id = 1
+    while next_id <= size:
+        split = next_id
+        tasks.append(make_task(split, [join] if join else [], rng))
+        next_id += 1
+        middle = []
+        for _ in range(width):
+            if next_id > size:
+                break
+            tasks.append(make_task(next_id, [split], rng))
+            middle.append(next_id)
+            next_id += 1
+        if next_id > size:
+            break
+        join = next_id
+        tasks.append(make_task(join, middle, rng))
+        next_id += 1
+    return tasks
+
+
+SHAPES = {'chain': chain, 'fanout': fan_out, 'diamond': diamond}
+
+
+def best_of(repeat, setup, run):
+    best = None
+    for _ in range(repeat):
+        args = setup()
+        # Like timeit, keep collector pauses out of the measurement
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            result = run(*args)
+            elapsed = (time.perf_counter() - started) * 1000
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def bench_case(planner, shape, size, repeat):
+    def fresh_tasks():
+        return (SHAPES[shape](size, random.Random(size)),)
+
+    def schedule(tasks):
+        return planner._schedule_tasks_with_dates(tasks, 'Benchmark goal', START_DATE, END_DATE, 'Benchmark')
+
+    schedule_ms, plan = best_of(repeat, fresh_tasks, schedule)
+    serialize_ms, _ = best_of(repeat, lambda: (plan,), json.dumps)
+
+    tasks = fresh_tasks()[0]
+    tracemalloc.start()
+    schedule(tasks)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'schedule_ms': round(schedule_ms, 3), 'serialize_ms': round(serialize_ms, 3),
+            'peak_kb': round(peak / 1024, 1)}
+
+
+def reference_workload(size=20000):
+    """Dict, sort and json work similar in kind to scheduling, without the backend"""
+    rng = random.Random(0)
+    tasks = {i: {'id': i, 'duration_days': rng.randint(1, 5), 'dependencies': [i - 1] if i > 1 else []}
+             for i in range(1, size + 1)}
+    finish = {}
+    for task_id in sorted(tasks, key=lambda i: (len(tasks[i]['dependencies']), i)):
+        task = tasks[task_id]
+        start = max((finish[dep] for dep in task['dependencies']), default=0)
+        finish[task_id] = start + task['duration_days']
+    return json.dumps(list(tasks.values()))
+
+
+def bench_reference(repeat):
+    reference_ms, _ = best_of(repeat * 3, tuple, reference_workload)
+    return {'reference_ms': round(reference_ms, 3)}
+
+
+def bench_fallback(planner, repeat):
+    fallback_ms, _ = best_of(repeat * 10, tuple,
+                             lambda: planner._create_fallback_plan('Benchmark goal', START_DATE, '2024-03-01', 60))
+    return {'schedule_ms': round(fallback_ms, 3)}
+
+
+def machine_speed(results, baseline):
+    """How much slower this run's reference was than the baseline's (1.0 when equal)"""
+    return results[REFERENCE_KEY]['reference_ms'] / baseline[REFERENCE_KEY]['reference_ms']
+
+
+def compare(results, baseline, threshold):
+    scale = machine_speed(results, baseline)
+    regressions = []
+    for case, metrics in results.items():
+        for metric in ('schedule_ms', 'serialize_ms'):
+            if metric not in metrics or metric not in baseline.get(case, {}):
+                continue
+            expected = baseline[case][metric] * scale
+            allowed = expected * (1 + threshold) + NOISE_FLOOR_MS
+            if metrics[metric] > allowed:
+                regressions.append(f"{case} {metric}: {metrics[metric]:.3f} ms > {allowed:.3f} ms allowed "
+                                   f"(baseline {baseline[case][metric]:.3f} ms, {expected:.3f} ms on this machine)")
+    return regressions
+
+
+def update_baseline(results, baseline):
+    """Merge results into baseline, rescaling the cases this run did not measure"""
+    if REFERENCE_KEY in baseline:
+        scale = machine_speed(results, baseline)
+        for case, metrics in baseline.items():
+            if case in results:
+                continue
+            for metric in ('schedule_ms', 'serialize_ms'):
+                if metric in metrics:
+                    metrics[metric] = round(metrics[metric] * scale, 3)
+    elif baseline:
+        # Recorded without a reference time: there is nothing to scale it by
+        baseline = {}
+    baseline.update(results)
+    return baseline
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)))
+    parser.add_argument('--shapes', default=','.join(SHAPES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--threshold', type=float, default=0.5, help='allowed slowdown as a fraction')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+
+    # Importing the backend must not touch the network or the real database
+    tmp = tempfile.TemporaryDirectory()
+    os.environ.setdefault('OPENAI_API_KEY', 'sk-bench')
+    os.environ['OPENAI_WARMUP'] = '0'
+    os.environ['AI_PLANS_DB'] = os.path.join(tmp.name, 'bench.db')
+    from ai_backend import AITaskPlanner
+
+    planner = AITaskPlanner()
+    results = {REFERENCE_KEY: bench_reference(args.repeat), 'fallback': bench_fallback(planner, args.repeat)}
+    print(f"reference workload: {results[REFERENCE_KEY]['reference_ms']:.3f} ms")
+    print(f"{'case':<16}{'schedule ms':>14}{'serialize ms':>14}{'peak KiB':>12}")
+    print(f"{'fallback':<16}{results['fallback']['schedule_ms']:>14.3f}")
+    for shape in args.shapes.split(','):
+        for size in map(int, args.sizes.split(',')):
+            case = f'{shape}-{size}'
+            results[case] = metrics = bench_case(planner, shape, size, args.repeat)
+            print(f"{case:<16}{metrics['schedule_ms']:>14.3f}{metrics['serialize_ms']:>14.3f}{metrics['peak_kb']:>12.1f}")
+    tmp.cleanup()
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline = update_baseline(results, baseline)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"✅ Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("⚠️ No baseline recorded yet; run with --update-baseline")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if REFERENCE_KEY not in baseline:
+        print("⚠️ Baseline has no reference time to scale by; run with --update-baseline")
+        return 0
+    print(f"Machine speed vs baseline: {machine_speed(results, baseline):.2f}x the reference time")
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print("❌ Scheduler performance regressed:")
+        for line in regressions:
+            print(f"   {line}")
+        return 1
+    print(f"✅ Within {args.threshold:.0%} of the scaled baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""Measure backend cold start against a fixed budget.
+
+Usage: python bench/bench_startup.py [--runs 7] [--budget-ms 300]
+
+Each run starts a fresh interpreter, imports ai_backend and serves one
+request to /api/ready, timing both steps. Startup must not touch the
+network, so the warm-up probe is disabled and a dummy API key is used.
+Exits non-zero when the median time to first response exceeds the budget.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+DEFAULT_BUDGET_MS = 300
+
+PROBE = '''
+import json, time
+started = time.perf_counter()
+import ai_backend
+imported = time.perf_counter()
+response = ai_backend.app.test_client().get('/api/ready')
+served = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'first_response_ms': (served - started) * 1000,
+    'status': response.status_code,
+}))
+'''
+
+
+def run_once(db_path):
+    env = dict(os.environ, OPENAI_API_KEY=os.getenv('OPENAI_API_KEY', 'sk-startup-bench'),
+               OPENAI_WARMUP='0', AI_PLANS_DB=db_path)
+    output = subprocess.run([sys.executable, '-c', PROBE], cwd=BACKEND_DIR, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=7)
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'startup.db')
+        run_once(db_path)  # create the schema so every timed run sees an existing database
+        results = [run_once(db_path) for _ in range(args.runs)]
+
+    if any(result['status'] != 200 for result in results):
+        print("❌ /api/ready did not return 200")
+        return 1
+
+    imports = [result['import_ms'] for result in results]
+    firsts = [result['first_response_ms'] for result in results]
+    median = statistics.median(firsts)
+    print(f"import:         median {statistics.median(imports):7.1f} ms  max {max(imports):7.1f} ms")
+    print(f"first response: median {median:7.1f} ms  max {max(firsts):7.1f} ms  (budget {args.budget_ms:.0f} ms)")
+
+    if median > args.budget_ms:
+        print("❌ Cold start is over budget")
+        return 1
+    print("✅ Cold start within budget")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,216 @@
+"""End-to-end load driver for the backend and the frontend proxy.
+
+Typical run, all against local processes and no API credits:
+
+    python bench/stub_openai.py --port 8001 --latency lognormal:800,0.5
+    OPENAI_BASE_URL=http://localhost:8001/v1 OPENAI_API_KEY=stub python ai_backend.py
+    cd ../frontend && flask --app ai_frontend run --port 8000
+    python bench/load_test.py --target both --duration 30 --concurrency 32
+
+Workers pick calls from a weighted mix of generate-plan, regenerate-ai,
+update-progress and plan/<id>. Plan ids come from earlier generate calls.
+Each target gets its own report with throughput and p50/p95/p99 latency
+per endpoint. The frontend relays plan/<id> to the backend, so both
+targets run the same mix. Goals are unique per request unless
+--repeat-goals is set, so the LLM response cache does not hide model
+latency.
+"""
+import argparse
+import http.client
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+
+ROUTES = {
+    'generate': {'backend': ('POST', '/api/generate-plan'), 'frontend': ('POST', '/generate-plan')},
+    'regenerate': {'backend': ('POST', '/api/regenerate-ai'), 'frontend': ('POST', '/regenerate-ai')},
+    'progress': {'backend': ('POST', '/api/update-progress'), 'frontend': ('POST', '/update-progress')},
+    'get': {'backend': ('GET', '/api/plan/{plan_id}'), 'frontend': ('GET', '/plan/{plan_id}')},
+}
+GOALS = [
+    "Learn conversational Spanish",
+    "Build a personal portfolio website",
+    "Run a half marathon",
+    "Launch an online store for handmade goods",
+    "Prepare for a cloud certification exam",
+]
+
+
+class Connection:
+    """One persistent HTTP/1.1 connection per worker and target"""
+
+    def __init__(self, base_url, timeout):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.conn = None
+
+    def request(self, method, path, payload=None):
+        body = json.dumps(payload).encode('utf-8') if payload is not None else None
+        headers = {'Content-Type': 'application/json'} if body else {}
+        for attempt in range(2):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self.conn.request(method, path, body=body, headers=headers)
+                response = self.conn.getresponse()
+                data = response.read()
+                if response.getheader('Connection', '').lower() == 'close':
+                    self.close()
+                return response.status, data
+            except (http.client.HTTPException, ConnectionError, OSError):
+                self.close()
+                if attempt:
+                    raise
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+class Results:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, target, endpoint, seconds, ok):
+        with self.lock:
+            self.latencies[(target, endpoint)].append(seconds)
+            if not ok:
+                self.errors[(target, endpoint)] += 1
+
+
+class PlanIds:
+    """Recently created plan ids, shared by all workers"""
+
+    def __init__(self, limit=500):
+        self.lock = threading.Lock()
+        self.ids = []
+        self.limit = limit
+
+    def add(self, plan_id):
+        if plan_id is None:
+            return
+        with self.lock:
+            self.ids.append(plan_id)
+            if len(self.ids) > self.limit:
+                del self.ids[:len(self.ids) - self.limit]
+
+    def pick(self):
+        with self.lock:
+            return random.choice(self.ids) if self.ids else None
+
+
+def build_request(endpoint, plan_id, repeat_goals):
+    start = date.today()
+    if endpoint == 'generate':
+        goal = random.choice(GOALS)
+        if not repeat_goals:
+            goal = f"{goal} ({uuid.uuid4().hex[:8]})"
+        return {'goal': goal, 'start_date': start.isoformat(),
+                'end_date': (start + timedelta(days=random.choice((30, 60, 90)))).isoformat()}, {}
+    if endpoint == 'regenerate':
+        return {'plan_id': plan_id, 'completed_tasks': [], 'feedback': 'Less time on research'}, {}
+    if endpoint == 'progress':
+        done = random.sample(range(1, 7), random.randint(0, 6))
+        return {'plan_id': plan_id, 'completed_tasks': [{'id': task_id} for task_id in done]}, {}
+    return None, {'plan_id': plan_id}
+
+
+def worker(target, base_url, mix, deadline, results, plan_ids, args):
+    conn = Connection(base_url, args.timeout)
+    endpoints = [endpoint for endpoint in mix if target in ROUTES[endpoint]]
+    weights = [mix[endpoint] for endpoint in endpoints]
+    while time.monotonic() < deadline:
+        endpoint = random.choices(endpoints, weights)[0]
+        plan_id = plan_ids.pick()
+        if endpoint != 'generate' and plan_id is None:
+            endpoint = 'generate'
+        method, path = ROUTES[endpoint][target]
+        payload, path_args = build_request(endpoint, plan_id, args.repeat_goals)
+
+        started = time.perf_counter()
+        try:
+            status, body = conn.request(method, path.format(**path_args), payload)
+            ok = status < 400
+        except Exception:
+            status, body, ok = None, b'', False
+        results.record(target, endpoint, time.perf_counter() - started, ok)
+
+        if ok and endpoint in ('generate', 'regenerate'):
+            data = json.loads(body)
+            plan_ids.add(data.get('plan_id') or data.get('new_plan_id'))
+    conn.close()
+
+
+def percentile(samples, p):
+    return samples[min(len(samples) - 1, int(p * len(samples)))] * 1000
+
+
+def report(results, elapsed):
+    print(f"{'target':<10}{'endpoint':<12}{'requests':>10}{'errors':>8}{'req/s':>9}"
+          f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for (target, endpoint) in sorted(results.latencies):
+        samples = sorted(results.latencies[(target, endpoint)])
+        print(f"{target:<10}{endpoint:<12}{len(samples):>10}{results.errors[(target, endpoint)]:>8}"
+              f"{len(samples) / elapsed:>9.1f}{percentile(samples, 0.50):>10.1f}"
+              f"{percentile(samples, 0.95):>10.1f}{percentile(samples, 0.99):>10.1f}")
+    for target in sorted({target for target, _ in results.latencies}):
+        total = sum(len(samples) for (t, _), samples in results.latencies.items() if t == target)
+        print(f"{target}: {total / elapsed:.1f} req/s overall")
+
+
+def parse_mix(spec):
+    mix = {}
+    for part in spec.split(','):
+        name, _, weight = part.partition('=')
+        if name not in ROUTES:
+            raise ValueError(f"Unknown endpoint in mix: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--backend', default='http://localhost:5000')
+    parser.add_argument('--frontend', default='http://localhost:8000')
+    parser.add_argument('--target', choices=('backend', 'frontend', 'both'), default='backend')
+    parser.add_argument('--duration', type=float, default=30, help='seconds per target')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--mix', default='generate=1,regenerate=1,progress=6,get=4')
+    parser.add_argument('--timeout', type=float, default=120)
+    parser.add_argument('--repeat-goals', action='store_true', help='reuse a small goal set (exercises the cache)')
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    targets = ['backend', 'frontend'] if args.target == 'both' else [args.target]
+    urls = {'backend': args.backend, 'frontend': args.frontend}
+
+    for target in targets:
+        results = Results()
+        plan_ids = PlanIds()
+        print(f"🚦 {target}: {args.concurrency} workers for {args.duration:.0f}s against {urls[target]}")
+        started = time.monotonic()
+        deadline = started + args.duration
+        threads = [threading.Thread(target=worker, args=(target, urls[target], mix, deadline, results, plan_ids, args),
+                                    name=f'load-{target}-{i}', daemon=True)
+                   for i in range(args.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        report(results, time.monotonic() - started)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,214 @@
+"""Local stand-in for the OpenAI chat-completions API, for load tests.
+
+Usage:
+    python bench/stub_openai.py --port 8001 --latency lognormal:800,0.5 --error-rate 0.02
+    OPENAI_BASE_URL=http://localhost:8001/v1 OPENAI_API_KEY=stub python ai_backend.py
+
+Serves POST /v1/chat/completions (plain and stream=true) and GET /v1/models.
+Replies are canned plan payloads, either built in or loaded from a JSON list
+with --payloads. Latency is drawn from --latency:
+
+    fixed:MS                 always MS milliseconds
+    uniform:LOW,HIGH         uniformly between LOW and HIGH ms
+    lognormal:MEDIAN,SIGMA   long-tailed, like real model calls
+
+A fraction --error-rate of calls fail with a 500 or 429 error.
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PAYLOADS = [
+    {
+        "domain": "Learning",
+        "tasks": [
+            {"id": 1, "description": "Assess current level and set a target", "category": "Planning", "priority": "high", "duration_days": 2, "dependencies": []},
+            {"id": 2, "description": "Pick core study materials", "category": "Research", "priority": "high", "duration_days": 2, "dependencies": [1]},
+            {"id": 3, "description": "Daily practice sessions on fundamentals", "category": "Practice", "priority": "high", "duration_days": 10, "dependencies": [2]},
+            {"id": 4, "description": "Weekly self-test and review mistakes", "category": "Review", "priority": "medium", "duration_days": 4, "dependencies": [3]},
+            {"id": 5, "description": "Apply skills in a realistic project", "category": "Execution", "priority": "medium", "duration_days": 6, "dependencies": [3]},
+            {"id": 6, "description": "Final assessment and next-step plan", "category": "Completion", "priority": "high", "duration_days": 2, "dependencies": [4, 5]}
+        ]
+    },
+    {
+        "domain": "Software Project",
+        "tasks": [
+            {"id": 1, "description": "Write requirements and user stories", "category": "Planning", "priority": "high", "duration_days": 3, "dependencies": []},
+            {"id": 2, "description": "Design architecture and data model", "category": "Design", "priority": "high", "duration_days": 3, "dependencies": [1]},
+            {"id": 3, "description": "Implement core features", "category": "Development", "priority": "high", "duration_days": 10, "dependencies": [2]},
+            {"id": 4, "description": "Add automated tests", "category": "Testing", "priority": "medium", "duration_days": 4, "dependencies": [3]},
+            {"id": 5, "description": "Set up deployment pipeline", "category": "DevOps", "priority": "medium", "duration_days": 2, "dependencies": [2]},
+            {"id": 6, "description": "Beta release and feedback fixes", "category": "Release", "priority": "high", "duration_days": 4, "dependencies": [4, 5]}
+        ]
+    },
+    {
+        "domain": "Fitness",
+        "tasks": [
+            {"id": 1, "description": "Baseline measurements and goal setting", "category": "Planning", "priority": "high", "duration_days": 1, "dependencies": []},
+            {"id": 2, "description": "Build a weekly workout schedule", "category": "Planning", "priority": "high", "duration_days": 2, "dependencies": [1]},
+            {"id": 3, "description": "Meal plan and grocery routine", "category": "Nutrition", "priority": "medium", "duration_days": 2, "dependencies": [1]},
+            {"id": 4, "description": "First training block", "category": "Training", "priority": "high", "duration_days": 14, "dependencies": [2, 3]},
+            {"id": 5, "description": "Progress check and adjust load", "category": "Review", "priority": "medium", "duration_days": 1, "dependencies": [4]},
+            {"id": 6, "description": "Second training block", "category": "Training", "priority": "high", "duration_days": 14, "dependencies": [5]}
+        ]
+    }
+]
+
+
+def parse_latency(spec):
+    """Return a function producing one latency sample in seconds"""
+    kind, _, params = spec.partition(':')
+    values = [float(value) for value in params.split(',') if value]
+    if kind == 'fixed':
+        return lambda: values[0] / 1000
+    if kind == 'uniform':
+        return lambda: random.uniform(values[0], values[1]) / 1000
+    if kind == 'lognormal':
+        median, sigma = values
+        return lambda: random.lognormvariate(math.log(median), sigma) / 1000
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+class StubOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    config = None  # set by serve()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/').endswith('/models'):
+            return self._send_json(200, {'object': 'list', 'data': [
+                {'id': 'gpt-3.5-turbo', 'object': 'model', 'created': 0, 'owned_by': 'stub'}
+            ]})
+        self._send_json(404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        request = json.loads(self.rfile.read(length) or b'{}')
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            return self._send_json(404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}})
+
+        config = self.config
+        latency = config['latency']()
+        config['stats'].record()
+
+        if random.random() < config['error_rate']:
+            time.sleep(latency / 4)
+            if random.random() < 0.5:
+                return self._send_json(429, {'error': {'message': 'Rate limit reached (stub)', 'type': 'rate_limit_error'}})
+            return self._send_json(500, {'error': {'message': 'Internal error (stub)', 'type': 'server_error'}})
+
+        content = 'Here is your plan:\n' + json.dumps(random.choice(config['payloads']), indent=2)
+        prompt_tokens = sum(len(message.get('content') or '') for message in request.get('messages', [])) // 4
+        completion_tokens = len(content) // 4
+        model = request.get('model', 'gpt-3.5-turbo')
+        completion_id = f"chatcmpl-stub-{uuid.uuid4().hex[:12]}"
+
+        if request.get('stream'):
+            return self._stream(completion_id, model, content, latency)
+
+        time.sleep(latency)
+        self._send_json(200, {
+            'id': completion_id,
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': model,
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                      'total_tokens': prompt_tokens + completion_tokens}
+        })
+
+    def _stream(self, completion_id, model, content, latency):
+        """Send the reply as SSE chunks: a short time to first token, the rest spread out"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        pieces = [content[i:i + 24] for i in range(0, len(content), 24)]
+        time.sleep(latency * 0.1)
+        for index, piece in enumerate(pieces):
+            chunk = {
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [{'index': 0, 'delta': {'content': piece},
+                             'finish_reason': 'stop' if index == len(pieces) - 1 else None}]
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+            time.sleep(latency * 0.9 / len(pieces))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+
+class RequestStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.count = 0
+
+    def record(self):
+        with self.lock:
+            self.count += 1
+
+
+def serve(port, latency, error_rate, payloads, host='127.0.0.1'):
+    """Start the stub in a background thread and return the server"""
+    StubOpenAIHandler.config = {
+        'latency': parse_latency(latency),
+        'error_rate': error_rate,
+        'payloads': payloads or DEFAULT_PAYLOADS,
+        'stats': RequestStats(),
+    }
+    server = ThreadingHTTPServer((host, port), StubOpenAIHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='stub-openai', daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--latency', default='lognormal:800,0.5')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--payloads', help='JSON file with a list of plan objects to reply with')
+    args = parser.parse_args()
+
+    payloads = None
+    if args.payloads:
+        with open(args.payloads) as f:
+            payloads = json.load(f)
+
+    server = serve(args.port, args.latency, args.error_rate, payloads, host=args.host)
+    print(f"🤖 Stub OpenAI API on http://{args.host}:{args.port}/v1 "
+          f"(latency {args.latency}, error rate {args.error_rate:.1%})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(f"Served {StubOpenAIHandler.config['stats'].count} completion requests")
+        server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
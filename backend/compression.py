@@ -0,0 +1,90 @@
+"""Content-Encoding negotiation for JSON and text responses.
+
+Bodies under COMPRESS_MIN_BYTES are sent as they are: below about one
+packet the saving doesn't pay for the CPU and header overhead. Streamed
+responses (SSE) are never buffered for compression, and bodies that
+already carry a Content-Encoding are left alone. Brotli is preferred when
+the brotli package is installed and the client accepts it, gzip otherwise.
+
+A compressed body is a different representation, so its strong ETag gets
+the encoding appended ("12.3" -> "12.3-gzip"); conditional requests compare
+tags with the suffix stripped.
+
+Both the backend and the frontend (which imports this module from here)
+use it, so the two hops negotiate and tag encodings the same way.
+"""
+import gzip
+import os
+
+from werkzeug.http import parse_accept_header
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', '1024'))
+GZIP_LEVEL = 6
+# Responses are compressed per request; quality 11 is many times slower for a few percent
+BROTLI_QUALITY = 5
+# For bodies compressed once and served many times, such as static assets
+BEST_GZIP_LEVEL = 9
+BEST_BROTLI_QUALITY = 11
+COMPRESSIBLE_TYPES = ('application/json', 'application/javascript', 'image/svg+xml', 'text/')
+ENCODINGS = ('br', 'gzip') if brotli else ('gzip',)
+
+
+def choose_encoding(accept_encoding):
+    """Best supported encoding for an Accept-Encoding header value, or None"""
+    if not accept_encoding:
+        return None
+    return parse_accept_header(accept_encoding).best_match(ENCODINGS)
+
+
+def compress(body, encoding, best=False):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BEST_BROTLI_QUALITY if best else BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=BEST_GZIP_LEVEL if best else GZIP_LEVEL, mtime=0)
+
+
+def encode(body, accept_encoding):
+    """(body, encoding) for a complete body; encoding is None when it is sent as is"""
+    encoding = choose_encoding(accept_encoding) if len(body) >= MIN_BYTES else None
+    return (compress(body, encoding), encoding) if encoding else (body, None)
+
+
+def strip_etag_encoding(etag):
+    """A strong ETag without the -br/-gzip suffix that marks a compressed representation"""
+    for encoding in ('br', 'gzip'):
+        if etag.endswith(f'-{encoding}'):
+            return etag[:-len(encoding) - 1]
+    return etag
+
+
+def matching_etag(if_none_match, etag):
+    """The tag in If-None-Match (a werkzeug ETags) naming any encoding of etag, or None"""
+    if if_none_match.star_tag:
+        return etag
+    for tag in if_none_match.as_set(include_weak=True):
+        if strip_etag_encoding(tag) == etag:
+            return tag
+    return None
+
+
+def compress_response(response, accept_encoding):
+    """Compress a Flask response in place when it is worth it (an after_request hook body)"""
+    if (response.is_streamed or response.direct_passthrough
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or not (response.mimetype or '').startswith(COMPRESSIBLE_TYPES)):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    body, encoding = encode(response.get_data(), accept_encoding)
+    if encoding:
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(f'{etag}-{encoding}', weak)
+    return response
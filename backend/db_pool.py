@@ -0,0 +1,114 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class PoolTimeoutError(RuntimeError):
+    """Every pooled connection stayed busy for the whole busy timeout"""
+
+
+class ConnectionPool:
+    """Thread-safe pool of tuned SQLite connections.
+
+    Connections are opened lazily up to ``size`` and handed out LIFO so hot
+    connections (and their prepared statement caches) get reused first.
+    Every connection runs in WAL mode, so readers never block the writer.
+    """
+
+    def __init__(self, path, size=8, busy_timeout_ms=5000, cache_size_kb=16384,
+                 synchronous='NORMAL', statement_cache_size=128):
+        self.path = path
+        self.size = size
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cache_size_kb = cache_size_kb
+        self.synchronous = synchronous
+        self.statement_cache_size = statement_cache_size
+
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+            cached_statements=self.statement_cache_size,
+            isolation_level=None,
+        )
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(f'PRAGMA synchronous={self.synchronous}')
+        conn.execute(f'PRAGMA cache_size=-{int(self.cache_size_kb)}')
+        conn.execute(f'PRAGMA busy_timeout={int(self.busy_timeout_ms)}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA foreign_keys=ON')
+        return conn
+
+    def acquire(self):
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                try:
+                    return self._connect()
+                except Exception:
+                    self._opened -= 1
+                    raise
+
+        try:
+            return self._idle.get(timeout=self.busy_timeout_ms / 1000)
+        except queue.Empty:
+            raise PoolTimeoutError(f"No database connection became free within {self.busy_timeout_ms} ms "
+                                   f"(pool size {self.size})") from None
+
+    def release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        if self._closed:
+            conn.close()
+            return
+        self._idle.put_nowait(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection in autocommit mode"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    @contextmanager
+    def transaction(self, immediate=True):
+        """Borrow a connection wrapped in a single transaction.
+
+        ``BEGIN IMMEDIATE`` takes the write lock up front so concurrent
+        writers queue on the busy timeout instead of failing mid-transaction.
+        """
+        conn = self.acquire()
+        try:
+            conn.execute('BEGIN IMMEDIATE' if immediate else 'BEGIN')
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+        finally:
+            self.release(conn)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
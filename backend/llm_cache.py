@@ -0,0 +1,114 @@
+import hashlib
+import json
+import re
+import threading
+import time
+
+import json_codec
+
+
+def normalize_goal(goal):
+    """Case- and whitespace-insensitive form of a goal used for cache keys"""
+    return re.sub(r'\s+', ' ', goal).strip().lower()
+
+
+def make_cache_key(goal, total_days, model, prompt_version):
+    # Stays on the stdlib encoder: its exact output is hashed, and existing keys must keep matching
+    payload = json.dumps([normalize_goal(goal), int(total_days), model, prompt_version])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    """Exact-match cache of parsed LLM plans, persisted in SQLite.
+
+    Entries expire after ``ttl_seconds`` and the least recently used ones are
+    evicted once the cache holds more than ``max_entries`` rows or
+    ``max_bytes`` of payload.
+    """
+
+    CREATE_TABLE = '''
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            key TEXT PRIMARY KEY,
+            response TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            created_at REAL NOT NULL,
+            last_used REAL NOT NULL
+        )
+    '''
+    SELECT_ENTRY = 'SELECT response, created_at FROM llm_cache WHERE key = ?'
+    TOUCH_ENTRY = 'UPDATE llm_cache SET last_used = ? WHERE key = ?'
+    DELETE_ENTRY = 'DELETE FROM llm_cache WHERE key = ?'
+    UPSERT_ENTRY = '''
+        INSERT INTO llm_cache (key, response, size, created_at, last_used) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (key) DO UPDATE SET
+            response = excluded.response, size = excluded.size,
+            created_at = excluded.created_at, last_used = excluded.last_used
+    '''
+    DELETE_EXPIRED = 'DELETE FROM llm_cache WHERE created_at < ?'
+    EVICT_OVERFLOW = '''
+        DELETE FROM llm_cache WHERE key IN (
+            SELECT key FROM (
+                SELECT key,
+                       ROW_NUMBER() OVER (ORDER BY last_used DESC) AS rank,
+                       SUM(size) OVER (ORDER BY last_used DESC ROWS UNBOUNDED PRECEDING) AS running_size
+                FROM llm_cache
+            ) WHERE rank > ? OR running_size > ?
+        )
+    '''
+
+    def __init__(self, pool, max_entries=5000, max_bytes=50 * 1024 * 1024, ttl_seconds=7 * 24 * 3600):
+        self.pool = pool
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'expired': 0, 'stores': 0, 'evictions': 0}
+
+        with self.pool.transaction() as conn:
+            conn.execute(self.CREATE_TABLE)
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache (last_used)')
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def get(self, key):
+        """Return the cached response object, or None on a miss"""
+        now = time.time()
+        with self.pool.connection() as conn:
+            row = conn.execute(self.SELECT_ENTRY, (key,)).fetchone()
+            if row and now - row[1] > self.ttl_seconds:
+                conn.execute(self.DELETE_ENTRY, (key,))
+                self._count('expired')
+                row = None
+            if row:
+                conn.execute(self.TOUCH_ENTRY, (now, key))
+
+        if row is None:
+            self._count('misses')
+            return None
+        self._count('hits')
+        return json_codec.loads(row[0])
+
+    def put(self, key, response):
+        payload = json_codec.dumps(response)
+        now = time.time()
+        with self.pool.transaction() as conn:
+            conn.execute(self.UPSERT_ENTRY, (key, payload, len(payload), now, now))
+            evicted = conn.execute(self.DELETE_EXPIRED, (now - self.ttl_seconds,)).rowcount
+            evicted += conn.execute(self.EVICT_OVERFLOW, (self.max_entries, self.max_bytes)).rowcount
+        self._count('stores')
+        if evicted:
+            self._count('evictions', evicted)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        with self.pool.connection() as conn:
+            stats['entries'], stats['bytes'] = conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache'
+            ).fetchone()
+        return stats
@@ -0,0 +1,201 @@
+"""Process-wide metrics rendered in the Prometheus text exposition format.
+
+A deliberately small subset of the Prometheus client: counters, gauges and
+histograms with labels, kept in memory and rendered on demand by /metrics.
+"""
+import bisect
+import threading
+import time
+from contextlib import ContextDecorator
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LLM_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0, 120.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000)
+RATIO_BUCKETS = (0.1, 0.25, 0.5, 0.75, 0.9, 1.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs += [f'{name}="{value}"' for name, value in extra]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+        self.values = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        with self.lock:
+            samples = sorted(self.values.items())
+        for key, value in samples:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key, value):
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}']
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = value
+
+
+class _Timer(ContextDecorator):
+    """Observe the elapsed time of a block or function into a histogram"""
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def _recreate_cm(self):
+        # A fresh timer per decorated call, so concurrent calls don't share a start time
+        return _Timer(self.histogram, self.labels)
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            counts = self.values.get(key)
+            if counts is None:
+                # Per-bucket (non-cumulative) counts, then sum and count
+                counts = self.values[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            counts[index] += 1
+            counts[-2] += value
+            counts[-1] += 1
+
+    def time(self, **labels):
+        """Context manager / decorator timing a block in seconds"""
+        return _Timer(self, labels)
+
+    def _render_sample(self, key, counts):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            labels = _format_labels(self.labelnames, key, [('le', _format_value(float(bound)))])
+            lines.append(f'{self.name}_bucket{labels} {cumulative}')
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f'{self.name}_sum{labels} {_format_value(counts[-2])}')
+        lines.append(f'{self.name}_count{labels} {counts[-1]}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'planner_http_request_duration_seconds', 'HTTP request latency by route.',
+    ('method', 'route', 'status')))
+HTTP_IN_PROGRESS = REGISTRY.register(Gauge(
+    'planner_http_requests_in_progress', 'HTTP requests currently being served.',
+    ('method', 'route')))
+OPENAI_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'planner_openai_request_duration_seconds', 'OpenAI chat completion latency.',
+    ('operation', 'outcome'), buckets=LLM_BUCKETS))
+OPENAI_TOKENS = REGISTRY.register(Counter(
+    'planner_openai_tokens_total', 'Tokens reported in OpenAI response usage.',
+    ('operation', 'kind')))
+PLANS_GENERATED = REGISTRY.register(Counter(
+    'planner_plans_generated_total', 'Plans produced, by operation and source (ai, cache or fallback).',
+    ('operation', 'source')))
+PROMPT_TOKENS_ESTIMATED = REGISTRY.register(Histogram(
+    'planner_openai_prompt_tokens_estimated', 'Locally counted prompt tokens per OpenAI call.',
+    ('operation',), buckets=TOKEN_BUCKETS))
+COMPLETION_BUDGET_USED = REGISTRY.register(Histogram(
+    'planner_openai_completion_budget_used_ratio', 'Completion tokens used as a fraction of max_tokens.',
+    ('operation',), buckets=RATIO_BUCKETS))
+COALESCED_CALLS = REGISTRY.register(Counter(
+    'planner_coalesced_calls_total', 'Plan generations that shared an identical in-flight call instead of calling the model.',
+    ('operation',)))
+DB_OPERATION_SECONDS = REGISTRY.register(Histogram(
+    'planner_db_operation_duration_seconds', 'SQLite operation latency in AIDatabase.',
+    ('operation',), buckets=DB_BUCKETS))
+
+
+def record_openai_usage(operation, usage):
+    """Add prompt/completion token counts from a response.usage object, if any"""
+    if usage is None:
+        return
+    for kind in ('prompt_tokens', 'completion_tokens'):
+        count = getattr(usage, kind, None)
+        if count:
+            OPENAI_TOKENS.inc(count, operation=operation, kind=kind.replace('_tokens', ''))
+
+
+def render():
+    return REGISTRY.render()
@@ -0,0 +1,91 @@
+"""Structural deltas between plan versions.
+
+A version's content is its plan data without live state: task completion
+is tracked on the head only. A delta records changed plan fields, changed
+task fields, added and removed tasks, and the task order only when it is
+not the parent's order with new tasks appended. Applying a delta to its
+parent's content gives the child's content back exactly.
+"""
+
+# Not part of a version: derived (total_tasks) or live state (completed)
+PLAN_SKIP = ('tasks', 'total_tasks')
+TASK_SKIP = ('completed',)
+
+
+def content(plan_data):
+    plan = {key: value for key, value in plan_data.items() if key not in PLAN_SKIP}
+    plan['tasks'] = [{key: value for key, value in task.items() if key not in TASK_SKIP}
+                     for task in plan_data.get('tasks', [])]
+    return plan
+
+
+def _diff_fields(parent, child, skip=()):
+    changed = {key: value for key, value in child.items() if key not in skip and parent.get(key, object()) != value}
+    removed = [key for key in parent if key not in skip and key not in child]
+    return changed, removed
+
+
+def diff(parent, child):
+    """Delta turning parent content into child content"""
+    plan_changed, plan_removed = _diff_fields(parent, child, skip=('tasks',))
+    delta = {}
+    if plan_changed:
+        delta['plan'] = plan_changed
+    if plan_removed:
+        delta['plan_removed'] = plan_removed
+
+    parent_tasks = {task['id']: task for task in parent['tasks']}
+    child_ids = {task['id'] for task in child['tasks']}
+    tasks = []
+    fields_removed = []
+    for task in child['tasks']:
+        before = parent_tasks.get(task['id'])
+        if before is None:
+            tasks.append(task)
+            continue
+        changed, removed = _diff_fields(before, task)
+        if changed:
+            tasks.append(dict(changed, id=task['id']))
+        if removed:
+            fields_removed.append([task['id'], removed])
+    if tasks:
+        delta['tasks'] = tasks
+    if fields_removed:
+        delta['task_fields_removed'] = fields_removed
+
+    removed_ids = [task_id for task_id in parent_tasks if task_id not in child_ids]
+    if removed_ids:
+        delta['tasks_removed'] = removed_ids
+
+    order = [task['id'] for task in child['tasks']]
+    if order != _default_order(parent, delta):
+        delta['order'] = order
+    return delta
+
+
+def _default_order(parent, delta):
+    removed = set(delta.get('tasks_removed', ()))
+    order = [task['id'] for task in parent['tasks'] if task['id'] not in removed]
+    known = set(order)
+    order += [task['id'] for task in delta.get('tasks', ()) if task['id'] not in known]
+    return order
+
+
+def apply(parent, delta):
+    """Child content from parent content and the delta between them"""
+    plan = {key: value for key, value in parent.items()
+            if key != 'tasks' and key not in delta.get('plan_removed', ())}
+    plan.update(delta.get('plan', {}))
+
+    tasks = {task['id']: dict(task) for task in parent['tasks']}
+    for task_id in delta.get('tasks_removed', ()):
+        del tasks[task_id]
+    for task_id, fields in delta.get('task_fields_removed', ()):
+        for field in fields:
+            tasks[task_id].pop(field, None)
+    for task in delta.get('tasks', ()):
+        tasks.setdefault(task['id'], {}).update(task)
+
+    order = delta['order'] if 'order' in delta else _default_order(parent, delta)
+    plan['tasks'] = [tasks[task_id] for task_id in order]
+    return plan
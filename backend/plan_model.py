@@ -0,0 +1,132 @@
+"""Validation of plans where they enter the service.
+
+Plans arrive as loosely shaped JSON from the model, the LLM cache, the
+template library and clients. validate_tasks checks and normalizes task
+dicts once, in place: ids and durations become ints, dates are checked
+as YYYY-MM-DD, priorities are lower-cased, and anything malformed raises
+PlanValidationError. Plans stay plain dicts from the parser through the
+scheduler to the database; there are no record classes to convert to and
+from on the way.
+"""
+import math
+from datetime import date
+
+PRIORITIES = ('high', 'medium', 'low')
+DEFAULT_PRIORITY = 'medium'
+DATE_FIELDS = ('start_date', 'end_date', 'deadline')
+
+
+class PlanValidationError(ValueError):
+    pass
+
+
+def parse_id(value):
+    """A task id: an int, or a string of digits as models sometimes write them"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    raise PlanValidationError('Task ids must be integers')
+
+
+def parse_duration(value):
+    """Whole days, at least one; fractional durations round up"""
+    if isinstance(value, bool):
+        raise PlanValidationError('duration_days must be an integer')
+    try:
+        days = value if isinstance(value, int) else math.ceil(float(value))
+    except (TypeError, ValueError, OverflowError):
+        raise PlanValidationError('duration_days must be an integer')
+    if days < 1:
+        raise PlanValidationError('duration_days must be at least 1')
+    return days
+
+
+def parse_dependencies(value):
+    if value is None:
+        return []
+    if not isinstance(value, list) or not all(isinstance(dep_id, (int, str)) for dep_id in value):
+        raise PlanValidationError('dependencies must be a list of task ids')
+    return [parse_id(dep_id) for dep_id in value]
+
+
+def parse_date(value, field):
+    """A YYYY-MM-DD date, or None when absent"""
+    if value is None or isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise PlanValidationError(f'{field} must be a date in YYYY-MM-DD format')
+
+
+def _text(data, field, default=None):
+    value = data.get(field)
+    if value is None:
+        return default
+    text = str(value).strip()
+    return text or default
+
+
+def parse_date_range(start_date, end_date):
+    """(start, end) dates of a plan; both are required and the end may not come first"""
+    start = parse_date(start_date, 'start_date')
+    end = parse_date(end_date, 'end_date')
+    if start is None or end is None:
+        raise PlanValidationError('Start date and end date are required')
+    if end < start:
+        raise PlanValidationError('end_date must not be before start_date')
+    return start, end
+
+
+def validate_tasks(raw_tasks):
+    """Check and normalize task dicts in place; returns raw_tasks.
+
+    One pass, and fields already in canonical form are left as they are,
+    so scheduling a large plan pays little for it. Key order and fields
+    the model doesn't know are kept. Ids must be unique.
+    """
+    seen = set()
+    for task in raw_tasks:
+        if not isinstance(task, dict):
+            raise PlanValidationError('A task must be an object')
+        task_id = task.get('id')
+        if type(task_id) is not int:
+            task['id'] = task_id = parse_id(task_id)
+        if task_id in seen:
+            raise PlanValidationError('Task ids must be unique')
+        seen.add(task_id)
+
+        description = task.get('description')
+        if type(description) is not str or not description or description != description.strip():
+            description = _text(task, 'description')
+            if description is None:
+                raise PlanValidationError('Every task needs a description')
+            task['description'] = description
+        category = task.get('category')
+        if type(category) is not str or not category or category != category.strip():
+            task['category'] = _text(task, 'category')
+        if task.get('priority') not in PRIORITIES:
+            priority = _text(task, 'priority', DEFAULT_PRIORITY).lower()
+            task['priority'] = priority if priority in PRIORITIES else DEFAULT_PRIORITY
+        duration = task.get('duration_days', 1)
+        if type(duration) is not int or duration < 1:
+            duration = parse_duration(duration)
+        task['duration_days'] = duration
+        dependencies = task.get('dependencies')
+        if type(dependencies) is list:
+            for dep_id in dependencies:
+                if type(dep_id) is not int:
+                    task['dependencies'] = parse_dependencies(dependencies)
+                    break
+        else:
+            task['dependencies'] = parse_dependencies(dependencies)
+        completed = task.get('completed', False)
+        if type(completed) is not bool:
+            completed = bool(completed)
+        task['completed'] = completed
+        for field in DATE_FIELDS:
+            value = task.get(field)
+            if value is not None:
+                task[field] = parse_date(value, field).isoformat()
+    return raw_tasks
@@ -0,0 +1,197 @@
+import json
+import re
+
+# Outside strings only structural characters matter; inside, only quotes and escapes
+_STRUCTURAL = re.compile(r'[{}\[\]":,]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_TRAILING_COMMA = re.compile(r',(\s*[}\]])')
+_OBJECT_START = re.compile(r'\{\s*(?:"|\})')
+_ARRAY_START = re.compile(r'\[\s*(?:\{|\])')
+
+
+class PlanParseError(ValueError):
+    pass
+
+
+def loads_lenient(text):
+    """json.loads that also accepts trailing commas before a closing bracket"""
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+
+    # Strip trailing commas outside string literals
+    pieces = []
+    last = 0
+    for match in re.finditer(r'"(?:[^"\\]|\\.)*"', text):
+        pieces.append(_TRAILING_COMMA.sub(r'\1', text[last:match.start()]))
+        pieces.append(match.group())
+        last = match.end()
+    pieces.append(_TRAILING_COMMA.sub(r'\1', text[last:]))
+    return json.loads(''.join(pieces))
+
+
+class PlanStreamParser:
+    """Single-pass, incremental extractor for a JSON plan inside LLM output.
+
+    Text can be fed in arbitrary chunks. Prose, code fences and stray braces
+    around the JSON are skipped, and every task object is returned from
+    ``feed`` as soon as it closes. A task is an object directly inside a
+    ``"tasks"`` array or inside a bare top-level array. ``close`` returns the
+    plan, salvaging the completed tasks if the response was cut off.
+    """
+
+    def __init__(self):
+        self.buffer = ''
+        self.position = 0
+        self.in_string = False
+        self.string_start = None
+        self.stack = []
+        self.root_start = None
+        self.plan = None
+        self.tasks = []
+        self.fields = {}
+
+    def feed(self, text):
+        """Consume a chunk of model output and return the tasks it completed"""
+        self.buffer += text
+        completed = []
+        buffer = self.buffer
+        while self.plan is None:
+            if self.in_string:
+                match = _STRING_SPECIAL.search(buffer, self.position)
+                if not match:
+                    self.position = len(buffer)
+                    break
+                if match.group() == '\\':
+                    if match.end() >= len(buffer):
+                        # The escaped character hasn't arrived yet
+                        self.position = match.start()
+                        break
+                    self.position = match.end() + 1
+                    continue
+                self.position = match.end()
+                self.in_string = False
+                self._string_closed(buffer[self.string_start:self.position])
+                continue
+
+            match = _STRUCTURAL.search(buffer, self.position)
+            if not match:
+                self.position = len(buffer)
+                break
+            char = match.group()
+            index = match.start()
+            self.position = match.end()
+
+            if not self.stack:
+                # Looking for the start of the JSON; anything else is prose
+                if char in '{[':
+                    pattern = _OBJECT_START if char == '{' else _ARRAY_START
+                    if pattern.match(buffer, index):
+                        self.root_start = index
+                        self._open(char, index)
+                    elif not buffer[index + 1:].strip():
+                        # Can't tell yet whether this bracket starts JSON
+                        self.position = index
+                        break
+                continue
+
+            if char == '"':
+                self.in_string = True
+                self.string_start = index
+            elif char in '{[':
+                self._open(char, index)
+            elif char in '}]':
+                task = self._close(char, index)
+                if task is not None:
+                    completed.append(task)
+            elif char == ':':
+                frame = self.stack[-1]
+                if frame['type'] == '{':
+                    frame['key'] = frame['pending']
+                    frame['expect'] = 'value'
+            elif char == ',':
+                frame = self.stack[-1]
+                if frame['type'] == '{':
+                    frame['expect'] = 'key'
+        return completed
+
+    def _open(self, char, index):
+        parent = self.stack[-1] if self.stack else None
+        key = parent['key'] if parent and parent['type'] == '{' else None
+        self.stack.append({'type': char, 'start': index, 'key': key, 'pending': None, 'expect': 'key'})
+
+    def _close(self, char, index):
+        frame = self.stack.pop()
+        if (char == '}') != (frame['type'] == '{'):
+            # Mismatched bracket: this wasn't JSON after all, start over
+            self._reset_root()
+            return None
+
+        if not self.stack:
+            self._finish_root(index)
+            return None
+
+        parent = self.stack[-1]
+        if frame['type'] == '{' and parent['type'] == '[' and \
+                (parent['key'] == 'tasks' or len(self.stack) == 1):
+            try:
+                task = loads_lenient(self.buffer[frame['start']:index + 1])
+            except ValueError:
+                return None
+            if isinstance(task, dict):
+                self.tasks.append(task)
+                return task
+        return None
+
+    def _string_closed(self, raw):
+        frame = self.stack[-1]
+        if frame['type'] != '{':
+            return
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            value = raw[1:-1]
+        if frame['expect'] == 'key':
+            frame['pending'] = value
+        elif len(self.stack) == 1:
+            self.fields[frame['key']] = value
+
+    def _finish_root(self, index):
+        try:
+            root = loads_lenient(self.buffer[self.root_start:index + 1])
+        except ValueError:
+            root = None
+
+        if isinstance(root, dict) and isinstance(root.get('tasks'), list):
+            self.plan = root
+        elif isinstance(root, dict) and isinstance(root.get('plan'), dict) and \
+                isinstance(root['plan'].get('tasks'), list):
+            self.plan = root['plan']
+        elif isinstance(root, list) and root and all(isinstance(task, dict) for task in root):
+            self.plan = {'tasks': root}
+        else:
+            self._reset_root()
+
+    def _reset_root(self):
+        self.stack = []
+        self.root_start = None
+        self.tasks = []
+        self.fields = {}
+
+    def close(self):
+        """Return the plan found so far, or raise PlanParseError"""
+        if self.plan is not None:
+            return self.plan
+        if self.tasks:
+            plan = {key: value for key, value in self.fields.items() if key is not None}
+            plan['tasks'] = list(self.tasks)
+            return plan
+        raise PlanParseError("No plan JSON found in AI response")
+
+
+def parse_plan(text):
+    """Extract a plan dict from a complete LLM response"""
+    parser = PlanStreamParser()
+    parser.feed(text)
+    return parser.close()
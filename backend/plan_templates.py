@@ -0,0 +1,347 @@
+"""Domain plan templates and a TF-IDF index for picking one from a goal.
+
+Used by the offline fallback planner and as the instant preview streamed
+before the model answers. Retrieval is a sparse dot product over an
+inverted index of a few hundred terms, so matching a goal takes
+microseconds and needs no network or model.
+
+Each template task is (description, category, priority, share, dependencies):
+share is the fraction of the plan's days the task should take, and
+dependencies are 1-based positions of earlier tasks.
+"""
+import math
+import re
+from collections import Counter, defaultdict
+
+# Below this cosine similarity a goal matches no domain and gets GENERAL_TEMPLATE
+MIN_SCORE = 0.08
+KEYWORD_WEIGHT = 3
+DOMAIN_WEIGHT = 2
+
+GENERAL_TEMPLATE = {
+    'domain': 'General Project',
+    'keywords': '',
+    'tasks': [
+        ("Research and information gathering", "Research", "high", 0.16, []),
+        ("Define clear objectives and milestones", "Planning", "high", 0.12, [1]),
+        ("Gather necessary resources", "Preparation", "medium", 0.1, [2]),
+        ("Execute main implementation phase", "Execution", "high", 0.33, [3]),
+        ("Review progress and make adjustments", "Review", "medium", 0.16, [4]),
+        ("Finalize and complete project", "Completion", "high", 0.12, [5]),
+    ],
+}
+
+TEMPLATES = [
+    {
+        'domain': 'Language Learning',
+        'keywords': 'language speak speaking fluent fluency conversational spanish french german italian japanese '
+                    'chinese mandarin korean portuguese arabic russian hindi vocabulary grammar pronunciation accent',
+        'tasks': [
+            ("Assess your current level and choose a course or textbook", "Assessment", "high", 0.05, []),
+            ("Set up a daily study routine with spaced-repetition vocabulary", "Foundations", "high", 0.1, [1]),
+            ("Work through core grammar and the 1,000 most common words", "Study", "high", 0.3, [2]),
+            ("Practice listening with podcasts and shows in the language", "Listening", "medium", 0.2, [2]),
+            ("Book regular conversation sessions with a tutor or exchange partner", "Speaking", "high", 0.3, [3]),
+            ("Take a practice test and review weak areas", "Review", "medium", 0.1, [4, 5]),
+        ],
+    },
+    {
+        'domain': 'Software Development',
+        'keywords': 'app application software build develop code coding program api backend frontend mobile ios '
+                    'android saas tool mvp prototype feature deploy startup product',
+        'tasks': [
+            ("Write down requirements and the core user flows", "Planning", "high", 0.08, []),
+            ("Choose the stack and set up the repository, CI and environments", "Setup", "high", 0.06, [1]),
+            ("Design the data model and main screens or endpoints", "Design", "high", 0.1, [1]),
+            ("Implement the core features", "Development", "high", 0.4, [2, 3]),
+            ("Write tests and fix the bugs they surface", "Testing", "medium", 0.15, [4]),
+            ("Deploy to production and set up monitoring", "Deployment", "high", 0.08, [5]),
+            ("Collect user feedback and plan the next iteration", "Review", "medium", 0.08, [6]),
+        ],
+    },
+    {
+        'domain': 'Web Development',
+        'keywords': 'website site web portfolio blog landing page html css javascript wordpress domain hosting '
+                    'responsive design',
+        'tasks': [
+            ("Define the site's purpose, audience and page list", "Planning", "high", 0.08, []),
+            ("Collect content: copy, images and project examples", "Content", "high", 0.15, [1]),
+            ("Sketch the layout and pick a visual style", "Design", "medium", 0.12, [1]),
+            ("Build the pages and make them responsive", "Development", "high", 0.35, [2, 3]),
+            ("Register a domain and set up hosting", "Setup", "medium", 0.05, [1]),
+            ("Test on phones and browsers, then fix issues", "Testing", "medium", 0.1, [4]),
+            ("Launch the site and share it", "Launch", "high", 0.05, [5, 6]),
+        ],
+    },
+    {
+        'domain': 'Running & Endurance',
+        'keywords': 'run running runner marathon half 5k 10k race jog jogging endurance triathlon cycling '
+                    'swim swimming ultra pace',
+        'tasks': [
+            ("Get proper shoes and test your current easy pace", "Preparation", "high", 0.03, []),
+            ("Build an aerobic base with easy runs three to four times a week", "Base Training", "high", 0.3, [1]),
+            ("Add a weekly long run, increasing distance about 10% per week", "Endurance", "high", 0.3, [2]),
+            ("Introduce one tempo or interval session per week", "Speed", "medium", 0.2, [2]),
+            ("Practice race-day nutrition and hydration on long runs", "Nutrition", "medium", 0.1, [3]),
+            ("Taper mileage in the final stretch before the race", "Taper", "high", 0.1, [3, 4]),
+            ("Run the race and record your results", "Race", "high", 0.02, [5, 6]),
+        ],
+    },
+    {
+        'domain': 'Health & Fitness',
+        'keywords': 'fitness fit gym workout exercise strength muscle weight lose loss fat health healthy diet '
+                    'nutrition body tone yoga flexibility',
+        'tasks': [
+            ("Record starting measurements and set a specific target", "Assessment", "high", 0.03, []),
+            ("Plan a weekly workout schedule you can sustain", "Planning", "high", 0.05, [1]),
+            ("Set up a simple meal plan and track what you eat", "Nutrition", "high", 0.1, [1]),
+            ("Follow the workout plan consistently", "Training", "high", 0.45, [2]),
+            ("Progress the load or intensity every two weeks", "Progression", "medium", 0.2, [4]),
+            ("Re-measure, compare with the start and adjust the plan", "Review", "medium", 0.05, [5]),
+        ],
+    },
+    {
+        'domain': 'Business Launch',
+        'keywords': 'business company startup launch store shop online ecommerce sell selling handmade product '
+                    'customers side hustle brand etsy shopify revenue',
+        'tasks': [
+            ("Validate the idea by talking to potential customers", "Research", "high", 0.1, []),
+            ("Research competitors and set your pricing", "Research", "high", 0.08, [1]),
+            ("Register the business and open a business bank account", "Legal", "medium", 0.06, [1]),
+            ("Source or produce the first batch of products", "Operations", "high", 0.25, [2]),
+            ("Set up the storefront, payments and shipping", "Setup", "high", 0.15, [3]),
+            ("Create launch marketing: photos, listings and social posts", "Marketing", "medium", 0.12, [4]),
+            ("Launch and fulfil the first orders", "Launch", "high", 0.1, [5, 6]),
+            ("Review sales and customer feedback", "Review", "medium", 0.08, [7]),
+        ],
+    },
+    {
+        'domain': 'Exam Preparation',
+        'keywords': 'exam test certification certificate certified study pass score sat gre gmat toefl ielts '
+                    'aws azure cloud bar cpa license quiz',
+        'tasks': [
+            ("Get the official syllabus and take a diagnostic practice test", "Assessment", "high", 0.04, []),
+            ("Make a study schedule that covers every syllabus topic", "Planning", "high", 0.03, [1]),
+            ("Study the weakest topics first with notes and flashcards", "Study", "high", 0.35, [2]),
+            ("Cover the remaining topics and do end-of-chapter questions", "Study", "high", 0.25, [3]),
+            ("Take timed full-length practice exams", "Practice", "high", 0.15, [4]),
+            ("Review mistakes and revisit weak areas", "Review", "medium", 0.1, [5]),
+            ("Register for the exam and prepare for exam day", "Logistics", "medium", 0.02, [1]),
+        ],
+    },
+    {
+        'domain': 'Writing',
+        'keywords': 'write writing book novel story author publish publishing manuscript chapter blog essay '
+                    'article memoir screenplay poetry',
+        'tasks': [
+            ("Define the premise, audience and target length", "Planning", "high", 0.05, []),
+            ("Outline the structure chapter by chapter", "Outline", "high", 0.1, [1]),
+            ("Write the first draft on a daily word-count goal", "Drafting", "high", 0.45, [2]),
+            ("Revise the draft for structure and clarity", "Revision", "high", 0.2, [3]),
+            ("Get feedback from beta readers or an editor", "Feedback", "medium", 0.1, [4]),
+            ("Polish the final manuscript and prepare it for publishing", "Publishing", "medium", 0.08, [5]),
+        ],
+    },
+    {
+        'domain': 'Music',
+        'keywords': 'music guitar piano violin drums bass ukulele sing singing song songs instrument play chords '
+                    'band compose record recording',
+        'tasks': [
+            ("Set up your instrument and learn basic technique and posture", "Foundations", "high", 0.08, []),
+            ("Practice fundamentals daily: scales, chords and rhythm", "Practice", "high", 0.3, [1]),
+            ("Learn a first simple song from start to finish", "Repertoire", "high", 0.15, [2]),
+            ("Learn basic music reading or tabs", "Theory", "medium", 0.15, [1]),
+            ("Work up two or three harder songs", "Repertoire", "medium", 0.3, [3, 4]),
+            ("Record yourself or play for someone and note what to improve", "Performance", "medium", 0.05, [5]),
+        ],
+    },
+    {
+        'domain': 'Job Search',
+        'keywords': 'job career hire hired interview interviews resume cv linkedin apply application offer role '
+                    'position switch employer',
+        'tasks': [
+            ("Decide on target roles and companies", "Planning", "high", 0.05, []),
+            ("Update your resume and LinkedIn profile", "Materials", "high", 0.08, [1]),
+            ("Reach out to your network for referrals", "Networking", "high", 0.2, [2]),
+            ("Apply to a steady number of roles each week", "Applications", "high", 0.45, [2]),
+            ("Prepare for interviews with mock sessions", "Interview Prep", "high", 0.2, [2]),
+            ("Evaluate and negotiate offers", "Negotiation", "medium", 0.05, [4, 5]),
+        ],
+    },
+    {
+        'domain': 'Event Planning',
+        'keywords': 'event wedding party conference meetup celebration birthday festival venue guests ceremony '
+                    'reception organize host',
+        'tasks': [
+            ("Set the budget, date and guest count", "Planning", "high", 0.05, []),
+            ("Book the venue", "Venue", "high", 0.1, [1]),
+            ("Book vendors: catering, photography and music", "Vendors", "high", 0.15, [2]),
+            ("Send invitations and track RSVPs", "Guests", "high", 0.3, [2]),
+            ("Plan the schedule, decorations and seating", "Logistics", "medium", 0.2, [3, 4]),
+            ("Confirm every vendor and do a final walkthrough", "Confirmation", "high", 0.05, [5]),
+            ("Run the event and follow up with thank-yous", "Event", "high", 0.05, [6]),
+        ],
+    },
+    {
+        'domain': 'Home Improvement',
+        'keywords': 'home house renovate renovation remodel kitchen bathroom garden yard move moving apartment '
+                    'declutter paint repair diy furniture room',
+        'tasks': [
+            ("Define the scope and measure the spaces", "Planning", "high", 0.05, []),
+            ("Set a budget and get quotes or price out materials", "Budget", "high", 0.08, [1]),
+            ("Order materials and book any contractors", "Procurement", "high", 0.12, [2]),
+            ("Prepare the space: clear, protect and demolish", "Preparation", "medium", 0.1, [3]),
+            ("Carry out the main work", "Execution", "high", 0.45, [4]),
+            ("Finish, clean up and fix the punch list", "Finishing", "medium", 0.12, [5]),
+        ],
+    },
+    {
+        'domain': 'Travel',
+        'keywords': 'travel trip vacation holiday visit journey abroad backpack backpacking itinerary flight '
+                    'flights hotel tour country europe asia',
+        'tasks': [
+            ("Pick destinations and set the trip budget", "Planning", "high", 0.1, []),
+            ("Check passport and visa requirements", "Documents", "high", 0.1, [1]),
+            ("Book flights and accommodation", "Booking", "high", 0.15, [1]),
+            ("Draft a day-by-day itinerary", "Itinerary", "medium", 0.2, [3]),
+            ("Arrange insurance, money and phone plans", "Logistics", "medium", 0.1, [3]),
+            ("Pack and confirm all bookings", "Preparation", "medium", 0.05, [2, 4, 5]),
+        ],
+    },
+    {
+        'domain': 'Research & Academia',
+        'keywords': 'research thesis dissertation paper study literature review experiment analysis phd masters '
+                    'academic journal publication survey data',
+        'tasks': [
+            ("Define the research question and scope", "Planning", "high", 0.06, []),
+            ("Review the existing literature", "Literature", "high", 0.15, [1]),
+            ("Design the methodology", "Methodology", "high", 0.1, [2]),
+            ("Collect data or run experiments", "Data Collection", "high", 0.25, [3]),
+            ("Analyze the results", "Analysis", "high", 0.15, [4]),
+            ("Write up the findings", "Writing", "high", 0.2, [5]),
+            ("Get feedback and revise before submission", "Revision", "medium", 0.07, [6]),
+        ],
+    },
+    {
+        'domain': 'Marketing',
+        'keywords': 'marketing campaign audience followers social media instagram youtube tiktok newsletter '
+                    'seo content growth brand advertising ads promote channel',
+        'tasks': [
+            ("Define the target audience and campaign goals", "Strategy", "high", 0.06, []),
+            ("Audit current channels and competitors", "Research", "medium", 0.08, [1]),
+            ("Plan a content calendar", "Planning", "high", 0.06, [2]),
+            ("Produce the first batch of content", "Content", "high", 0.2, [3]),
+            ("Publish on schedule and engage with the audience", "Execution", "high", 0.4, [4]),
+            ("Review metrics and double down on what works", "Analysis", "medium", 0.1, [5]),
+        ],
+    },
+    {
+        'domain': 'Data & Machine Learning',
+        'keywords': 'data science scientist analytics machine learning ml ai model python sql statistics '
+                    'dashboard kaggle deep neural analyst',
+        'tasks': [
+            ("Review the math and statistics prerequisites", "Foundations", "high", 0.12, []),
+            ("Learn Python data tooling: pandas, NumPy and plotting", "Tooling", "high", 0.18, []),
+            ("Work through a structured course on core models", "Study", "high", 0.25, [1, 2]),
+            ("Complete a guided project on a public dataset", "Practice", "high", 0.15, [3]),
+            ("Build an end-to-end project of your own", "Project", "high", 0.2, [4]),
+            ("Write up the project and publish the code", "Portfolio", "medium", 0.06, [5]),
+        ],
+    },
+    {
+        'domain': 'Personal Finance',
+        'keywords': 'money finance financial save saving savings budget budgeting debt invest investing '
+                    'retirement emergency fund credit expenses',
+        'tasks': [
+            ("Track every expense for a few weeks", "Assessment", "high", 0.15, []),
+            ("List debts, savings and net worth", "Assessment", "high", 0.03, []),
+            ("Build a monthly budget with savings as a fixed line", "Budget", "high", 0.05, [1, 2]),
+            ("Automate transfers to savings and debt payments", "Automation", "high", 0.03, [3]),
+            ("Cut or renegotiate the largest unnecessary expenses", "Optimization", "medium", 0.2, [3]),
+            ("Review progress monthly and adjust the budget", "Review", "medium", 0.5, [4, 5]),
+        ],
+    },
+]
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    'a an and are as at be by for from get i in into is it my of on or our so that the their this to up we '
+    'with within want need how new first more better'.split()
+)
+SUFFIXES = ('ations', 'ation', 'ings', 'ing', 'ers', 'er', 'es', 'ed', 'ly', 's', 'e')
+
+
+def _stem(word):
+    """Crude suffix stripping, applied alike to templates and goals so inflections meet"""
+    for suffix in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            if len(word) > 3 and word[-1] == word[-2] and word[-1] not in 'ls':
+                word = word[:-1]  # running -> run, shopping -> shop
+            break
+    return word
+
+
+def tokenize(text):
+    return [_stem(word) for word in _TOKEN.findall(text.lower()) if word not in STOPWORDS]
+
+
+def _validate(template):
+    for position, task in enumerate(template['tasks'], 1):
+        if any(not 1 <= dep < position for dep in task[4]):
+            raise ValueError(f"Template {template['domain']!r} task {position} depends on a later task")
+
+
+class TemplateIndex:
+    """Inverted index of L2-normalized TF-IDF template vectors; search is a cosine score over postings"""
+
+    def __init__(self, templates):
+        self.templates = list(templates)
+        for template in self.templates:
+            _validate(template)
+
+        documents = [self._document(template) for template in self.templates]
+        document_frequency = Counter(term for terms in documents for term in terms)
+        count = len(self.templates)
+        self.idf = {term: math.log((1 + count) / (1 + frequency)) + 1
+                    for term, frequency in document_frequency.items()}
+
+        self.postings = defaultdict(list)
+        for position, terms in enumerate(documents):
+            weights = {term: (1 + math.log(frequency)) * self.idf[term] for term, frequency in terms.items()}
+            norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+            for term, weight in weights.items():
+                self.postings[term].append((position, weight / norm))
+
+    def _document(self, template):
+        terms = Counter()
+        for term in tokenize(template['keywords']):
+            terms[term] += KEYWORD_WEIGHT
+        for term in tokenize(template['domain']):
+            terms[term] += DOMAIN_WEIGHT
+        for task in template['tasks']:
+            terms.update(tokenize(task[0]))
+        return terms
+
+    def search(self, text, limit=3):
+        """Best (score, template) pairs for a goal, highest cosine similarity first"""
+        query = {term: self.idf[term] for term in set(tokenize(text)) if term in self.idf}
+        if not query:
+            return []
+        norm = math.sqrt(sum(weight * weight for weight in query.values()))
+        scores = defaultdict(float)
+        for term, weight in query.items():
+            for position, document_weight in self.postings[term]:
+                scores[position] += weight * document_weight
+        ranked = sorted(scores.items(), key=lambda item: -item[1])[:limit]
+        return [(score / norm, self.templates[position]) for position, score in ranked]
+
+    def match(self, text):
+        """The best template for a goal and its score, or GENERAL_TEMPLATE when nothing is close"""
+        results = self.search(text, limit=1)
+        if results and results[0][0] >= MIN_SCORE:
+            return results[0][1], results[0][0]
+        return GENERAL_TEMPLATE, 0.0
+
+
+INDEX = TemplateIndex(TEMPLATES)
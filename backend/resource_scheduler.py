@@ -0,0 +1,306 @@
+import heapq
+from bisect import bisect_left
+from datetime import date, datetime
+
+from scheduler import DATE_FORMAT, _resolve_dependencies, topological_order
+
+PRIORITY_RANK = {'high': 0, 'medium': 1, 'low': 2}
+CAPACITY_MODES = ('tasks', 'hours')
+DEFAULT_WEEKENDS = (5, 6)  # Saturday, Sunday
+INITIAL_HORIZON = 64
+
+
+def parse_constraints(data):
+    """Validate a constraints dict from a request; raises ValueError with a user-facing message.
+
+    {
+        "mode": "tasks" | "hours",      # what capacity counts
+        "capacity": 2,                  # concurrent tasks, or work hours, per working day
+        "task_hours": 4,                # hours mode: daily hours a task needs unless it sets hours_per_day
+        "weekends": [5, 6],             # weekdays without work, Monday = 0
+        "holidays": ["2024-12-25"],
+        "capacity_overrides": {"2024-03-01": 1}
+    }
+    """
+    if not isinstance(data, dict):
+        raise ValueError('Schedule constraints must be an object')
+
+    mode = data.get('mode', 'tasks')
+    if mode not in CAPACITY_MODES:
+        raise ValueError(f"Schedule mode must be one of {', '.join(CAPACITY_MODES)}")
+
+    try:
+        capacity = float(data.get('capacity', 1 if mode == 'tasks' else 8))
+        task_hours = float(data.get('task_hours', capacity))
+        weekends = sorted({int(day) for day in data.get('weekends', DEFAULT_WEEKENDS)})
+        holidays = sorted({_parse_day(day) for day in data.get('holidays') or []})
+        overrides = {_parse_day(day): float(value) for day, value in (data.get('capacity_overrides') or {}).items()}
+    except (TypeError, ValueError, AttributeError):
+        raise ValueError('Invalid schedule constraints: check numbers, weekday numbers and YYYY-MM-DD dates')
+
+    if capacity <= 0 or task_hours <= 0:
+        raise ValueError('Capacity and task hours must be positive')
+    if any(day < 0 or day > 6 for day in weekends) or len(weekends) == 7:
+        raise ValueError('Weekends must be weekday numbers 0-6 and leave at least one working day')
+    if any(value < 0 for value in overrides.values()):
+        raise ValueError('Capacity overrides cannot be negative')
+
+    return {
+        'mode': mode,
+        'capacity': capacity,
+        'task_hours': task_hours,
+        'weekends': weekends,
+        'holidays': [date.fromordinal(day).strftime(DATE_FORMAT) for day in holidays],
+        'capacity_overrides': {date.fromordinal(day).strftime(DATE_FORMAT): value for day, value in overrides.items()},
+    }
+
+
+def _parse_day(text):
+    return datetime.strptime(str(text), DATE_FORMAT).toordinal()
+
+
+class WorkCalendar:
+    """Maps calendar days to consecutive working-day indexes and back in O(log holidays).
+
+    Index 0 is the first working day on or after the origin. Weekends are
+    handled arithmetically per week and holidays by bisection, so nothing
+    scans day by day no matter how long the horizon is.
+    """
+
+    def __init__(self, origin, weekends=DEFAULT_WEEKENDS, holidays=()):
+        self.origin = origin
+        self.working_weekdays = [day not in weekends for day in range(7)]
+        self.per_week = sum(self.working_weekdays)
+        # prefix[k] = working days among the first k days of a week starting on the origin's weekday
+        first = date.fromordinal(origin).weekday()
+        self.prefix = [0]
+        for offset in range(7):
+            self.prefix.append(self.prefix[-1] + self.working_weekdays[(first + offset) % 7])
+        self.holidays = sorted(day for day in set(holidays)
+                               if day >= origin and self.working_weekdays[date.fromordinal(day).weekday()])
+
+    def is_working(self, ordinal):
+        if not self.working_weekdays[date.fromordinal(ordinal).weekday()]:
+            return False
+        position = bisect_left(self.holidays, ordinal)
+        return position == len(self.holidays) or self.holidays[position] != ordinal
+
+    def count_before(self, ordinal):
+        """Working days in [origin, ordinal)"""
+        if ordinal <= self.origin:
+            return 0
+        weeks, rest = divmod(ordinal - self.origin, 7)
+        return weeks * self.per_week + self.prefix[rest] - bisect_left(self.holidays, ordinal)
+
+    def index_of(self, ordinal):
+        """Index of the first working day on or after ordinal"""
+        return self.count_before(ordinal)
+
+    def ordinal_of(self, index):
+        """Calendar day of the working day with this index"""
+        # Smallest ordinal with count_before(ordinal + 1) > index
+        low = self.origin + index // self.per_week * 7
+        high = low + 7
+        while self.count_before(high) <= index:
+            high += (high - low) * 2
+        while low < high:
+            middle = (low + high) // 2
+            if self.count_before(middle + 1) > index:
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+
+class CapacityTimeline:
+    """Free capacity per working day in a segment tree with lazy range-add.
+
+    Nodes keep the min and max of their range. "Last day in a range with
+    less than x free" and "first day with at least x free" let a task's
+    earliest feasible window be found by jumping past blocking days and
+    fully booked stretches instead of testing every start day.
+    """
+
+    def __init__(self, capacity_of, size=INITIAL_HORIZON):
+        self.capacity_of = capacity_of
+        self._build([capacity_of(index) for index in range(size)])
+
+    def _build(self, leaves):
+        self.size = len(leaves)
+        self.minimum = [0.0] * (4 * self.size)
+        self.maximum = [0.0] * (4 * self.size)
+        self.pending = [0.0] * (4 * self.size)
+        self._build_node(1, 0, self.size, leaves)
+
+    def _build_node(self, node, low, high, leaves):
+        if high - low == 1:
+            self.minimum[node] = self.maximum[node] = leaves[low]
+            return
+        middle = (low + high) // 2
+        self._build_node(2 * node, low, middle, leaves)
+        self._build_node(2 * node + 1, middle, high, leaves)
+        self.minimum[node] = min(self.minimum[2 * node], self.minimum[2 * node + 1])
+        self.maximum[node] = max(self.maximum[2 * node], self.maximum[2 * node + 1])
+
+    def ensure(self, size):
+        """Grow the horizon (doubling) so indexes below size exist"""
+        if size <= self.size:
+            return
+        leaves = [self._leaf(index) for index in range(self.size)]
+        new_size = self.size
+        while new_size < size:
+            new_size *= 2
+        leaves += [self.capacity_of(index) for index in range(self.size, new_size)]
+        self._build(leaves)
+
+    def _leaf(self, index):
+        node, low, high = 1, 0, self.size
+        offset = 0.0
+        while high - low > 1:
+            offset += self.pending[node]
+            middle = (low + high) // 2
+            if index < middle:
+                node, high = 2 * node, middle
+            else:
+                node, low = 2 * node + 1, middle
+        return self.minimum[node] + offset
+
+    def add(self, start, stop, value, node=1, low=0, high=None):
+        high = self.size if high is None else high
+        if stop <= low or high <= start:
+            return
+        if start <= low and high <= stop:
+            self.minimum[node] += value
+            self.maximum[node] += value
+            self.pending[node] += value
+            return
+        middle = (low + high) // 2
+        self.add(start, stop, value, 2 * node, low, middle)
+        self.add(start, stop, value, 2 * node + 1, middle, high)
+        self.minimum[node] = min(self.minimum[2 * node], self.minimum[2 * node + 1]) + self.pending[node]
+        self.maximum[node] = max(self.maximum[2 * node], self.maximum[2 * node + 1]) + self.pending[node]
+
+    def last_below(self, start, stop, threshold, node=1, low=0, high=None, offset=0.0):
+        """Largest index in [start, stop) with free capacity below threshold, or -1"""
+        high = self.size if high is None else high
+        if stop <= low or high <= start or self.minimum[node] + offset >= threshold:
+            return -1
+        if high - low == 1:
+            return low
+        offset += self.pending[node]
+        middle = (low + high) // 2
+        found = self.last_below(start, stop, threshold, 2 * node + 1, middle, high, offset)
+        if found == -1:
+            found = self.last_below(start, stop, threshold, 2 * node, low, middle, offset)
+        return found
+
+    def first_at_least(self, start, threshold, node=1, low=0, high=None, offset=0.0):
+        """Smallest index >= start with free capacity of at least threshold, or -1"""
+        high = self.size if high is None else high
+        if high <= start or self.maximum[node] + offset < threshold:
+            return -1
+        if high - low == 1:
+            return low
+        offset += self.pending[node]
+        middle = (low + high) // 2
+        found = self.first_at_least(start, threshold, 2 * node, low, middle, offset)
+        if found == -1:
+            found = self.first_at_least(start, threshold, 2 * node + 1, middle, high, offset)
+        return found
+
+    def earliest_window(self, earliest, length, demand):
+        """First start >= earliest where every day of [start, start + length) has demand free"""
+        # The epsilon absorbs float drift from fractional hours
+        threshold = demand - 1e-9
+        start = earliest
+        while True:
+            self.ensure(start + length)
+            start_candidate = self.first_at_least(start, threshold)
+            if start_candidate == -1:
+                # Everything up to the horizon is booked; continue past it
+                start = self.size
+                continue
+            start = start_candidate
+            self.ensure(start + length)
+            blocking = self.last_below(start, start + length, threshold)
+            if blocking == -1:
+                return start
+            start = blocking + 1
+
+
+def schedule_with_constraints(tasks, start_date, end_date, constraints):
+    """Schedule tasks under working calendars and per-day capacity.
+
+    Tasks are placed one at a time (serial list scheduling) in dependency
+    order, higher priority first among ready tasks, each into the earliest
+    run of consecutive working days with enough free capacity. Durations
+    count working days. Nothing is clamped to end_date; tasks that finish
+    after it are reported in late_tasks. Task dicts are updated in place and
+    returned in scheduling order, with the late task ids.
+    """
+    plan_start = _parse_day(start_date)
+    plan_end = _parse_day(end_date)
+    calendar = WorkCalendar(plan_start, constraints['weekends'], map(_parse_day, constraints['holidays']))
+
+    capacity = constraints['capacity']
+    overrides = {calendar.index_of(_parse_day(day)): value
+                 for day, value in constraints['capacity_overrides'].items()
+                 if calendar.is_working(_parse_day(day)) and _parse_day(day) >= plan_start}
+    timeline = CapacityTimeline(lambda index: overrides.get(index, capacity))
+
+    predecessors = _resolve_dependencies(tasks)
+    _, predecessors = topological_order(tasks, predecessors)
+
+    formatted = {}
+
+    def format_day(ordinal):
+        text = formatted.get(ordinal)
+        if text is None:
+            text = formatted[ordinal] = date.fromordinal(ordinal).strftime(DATE_FORMAT)
+        return text
+
+    successors = [[] for _ in tasks]
+    waiting = [len(deps) for deps in predecessors]
+    for position, deps in enumerate(predecessors):
+        for dep_position in deps:
+            successors[dep_position].append(position)
+
+    def rank(position):
+        return PRIORITY_RANK.get(str(tasks[position].get('priority', '')).lower(), 1), position
+
+    ready = [rank(position) for position in range(len(tasks)) if not waiting[position]]
+    heapq.heapify(ready)
+
+    finish = [0] * len(tasks)
+    scheduled_tasks = []
+    late_tasks = []
+    while ready:
+        _, position = heapq.heappop(ready)
+        task = tasks[position]
+        deps = predecessors[position]
+        length = max(1, int(task['duration_days']))
+        demand = 1 if constraints['mode'] == 'tasks' else float(task.get('hours_per_day') or constraints['task_hours'])
+        if demand > capacity:
+            print(f"⚠️ Task {task['id']!r} needs {demand:g} per day but capacity is {capacity:g}; capping it")
+            demand = capacity
+
+        earliest = max((finish[dep] for dep in deps), default=0)
+        start = timeline.earliest_window(earliest, length, demand)
+        timeline.add(start, start + length, -demand)
+        finish[position] = start + length
+
+        end_day = calendar.ordinal_of(start + length - 1) + 1
+        task['duration_days'] = length
+        task['dependencies'] = [tasks[dep_position]['id'] for dep_position in deps]
+        task['start_date'] = format_day(calendar.ordinal_of(start))
+        task['end_date'] = task['deadline'] = format_day(end_day)
+        if end_day > plan_end:
+            late_tasks.append(task['id'])
+        scheduled_tasks.append(task)
+
+        for succ in successors[position]:
+            waiting[succ] -= 1
+            if not waiting[succ]:
+                heapq.heappush(ready, rank(succ))
+
+    return scheduled_tasks, late_tasks
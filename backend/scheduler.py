@@ -0,0 +1,330 @@
+import heapq
+from datetime import date, datetime
+
+DATE_FORMAT = '%Y-%m-%d'
+
+
+def _resolve_dependencies(tasks):
+    """Map task ids to positions and drop dependencies that point nowhere"""
+    index_of = {}
+    for position, task in enumerate(tasks):
+        index_of.setdefault(task['id'], position)
+
+    predecessors = []
+    for position, task in enumerate(tasks):
+        deps = []
+        for dep_id in task.get('dependencies') or []:
+            dep_position = index_of.get(dep_id)
+            if dep_position is None or dep_position == position:
+                print(f"⚠️ Dropping invalid dependency {dep_id!r} from task {task['id']!r}")
+                continue
+            deps.append(dep_position)
+        if len(deps) > 1:
+            # Drop repeats, keeping first-seen order
+            deps = list(dict.fromkeys(deps))
+        predecessors.append(deps)
+    return predecessors
+
+
+def topological_order(tasks, predecessors):
+    """Kahn's algorithm over task positions, breaking cycles as they are found.
+
+    Ready tasks are taken lowest position first, so a list that is already
+    in dependency order keeps its order. Returns the processing order and
+    the predecessor lists with any cycle-closing edges removed.
+    """
+    count = len(tasks)
+    successors = [[] for _ in range(count)]
+    in_degree = [0] * count
+    for position, deps in enumerate(predecessors):
+        in_degree[position] = len(deps)
+        for dep_position in deps:
+            successors[dep_position].append(position)
+
+    # Positions are taken in increasing order, so the initial list is already a valid heap
+    ready = [position for position in range(count) if in_degree[position] == 0]
+    order = []
+    done = [False] * count
+    next_candidate = 0
+
+    while len(order) < count:
+        if not ready:
+            # Every remaining task waits on another remaining task: a cycle.
+            # Break it at the earliest unscheduled task by dropping its
+            # unresolved dependencies.
+            while done[next_candidate]:
+                next_candidate += 1
+            stuck = next_candidate
+            kept = [dep for dep in predecessors[stuck] if done[dep]]
+            print(f"⚠️ Dependency cycle detected at task {tasks[stuck]['id']!r}, dropping "
+                  f"{len(predecessors[stuck]) - len(kept)} dependency link(s)")
+            for dep_position in predecessors[stuck]:
+                if not done[dep_position]:
+                    successors[dep_position].remove(stuck)
+            predecessors[stuck] = kept
+            in_degree[stuck] = 0
+            heapq.heappush(ready, stuck)
+
+        position = heapq.heappop(ready)
+        done[position] = True
+        order.append(position)
+        for succ in successors[position]:
+            in_degree[succ] -= 1
+            if in_degree[succ] == 0:
+                heapq.heappush(ready, succ)
+
+    return order, predecessors
+
+
+def schedule_tasks(tasks, start_date, end_date):
+    """Assign start/end dates to tasks in dependency order.
+
+    Runs in O(V+E). Dangling and self dependencies are dropped and cycles are
+    broken, so the returned list always contains every task. Task dicts are
+    updated in place and returned in scheduling order.
+    """
+    plan_start = datetime.strptime(start_date, DATE_FORMAT).toordinal()
+    plan_end = datetime.strptime(end_date, DATE_FORMAT).toordinal()
+
+    predecessors = _resolve_dependencies(tasks)
+    order, predecessors = topological_order(tasks, predecessors)
+
+    # Dates are kept as day ordinals while scheduling and formatted once per
+    # distinct day, since many tasks share the same boundaries.
+    formatted = {}
+
+    def format_day(ordinal):
+        text = formatted.get(ordinal)
+        if text is None:
+            text = formatted[ordinal] = date.fromordinal(ordinal).strftime(DATE_FORMAT)
+        return text
+
+    end_days = [0] * len(tasks)
+    scheduled_tasks = []
+    for position in order:
+        task = tasks[position]
+        deps = predecessors[position]
+
+        start_day = plan_start
+        for dep_position in deps:
+            if end_days[dep_position] > start_day:
+                start_day = end_days[dep_position]
+
+        end_day = start_day + int(task['duration_days'])
+        if end_day > plan_end:
+            task['duration_days'] = max(1, plan_end - start_day)
+            end_day = start_day + int(task['duration_days'])
+
+        end_days[position] = end_day
+        task['dependencies'] = [tasks[dep_position]['id'] for dep_position in deps]
+        task['start_date'] = format_day(start_day)
+        task['end_date'] = task['deadline'] = format_day(end_day)
+        scheduled_tasks.append(task)
+
+    return scheduled_tasks
+
+
+class IncrementalScheduler:
+    """A scheduled plan's dependency graph and dates, kept for cheap edits.
+
+    Built once per plan in O(V+E). Afterwards a duration or dependency
+    change re-dates only tasks whose predecessors actually moved, visiting
+    them in topological rank order, so an edit costs O(changed) rather
+    than O(plan). Ranks are kept valid under new edges with the
+    Pearce-Kelly dynamic topological ordering, which also detects cycles.
+    Dates follow schedule_tasks exactly, including the clamp to the plan end;
+    requested durations are kept apart from the clamped ones it reports.
+    """
+
+    def __init__(self, tasks, start_date, end_date):
+        self.plan_start = datetime.strptime(start_date, DATE_FORMAT).toordinal()
+        self.plan_end = datetime.strptime(end_date, DATE_FORMAT).toordinal()
+        self._formatted = {}
+
+        predecessors = _resolve_dependencies(tasks)
+        order, predecessors = topological_order(tasks, predecessors)
+
+        self.ids = [task['id'] for task in tasks]
+        self.index_of = {}
+        for position, task_id in enumerate(self.ids):
+            self.index_of.setdefault(task_id, position)
+        self.durations = [int(task['duration_days']) for task in tasks]
+        self.predecessors = predecessors
+        self.successors = [set() for _ in tasks]
+        for position, deps in enumerate(predecessors):
+            for dep_position in deps:
+                self.successors[dep_position].add(position)
+
+        self.rank = [0] * len(tasks)
+        for rank, position in enumerate(order):
+            self.rank[position] = rank
+        self.next_rank = len(order)
+        self.max_int_id = max((task_id for task_id in self.ids if isinstance(task_id, int)), default=0)
+        self.start_days = [0] * len(tasks)
+        self.end_days = [0] * len(tasks)
+        for position in order:
+            self._place(position)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _place(self, position):
+        """Recompute one task's dates from its predecessors; True if they changed"""
+        start_day = self.plan_start
+        for dep_position in self.predecessors[position]:
+            if self.end_days[dep_position] > start_day:
+                start_day = self.end_days[dep_position]
+
+        end_day = start_day + self.durations[position]
+        if end_day > self.plan_end:
+            # Only the dates are clamped: the requested duration is kept for when upstream tasks move earlier
+            end_day = start_day + max(1, self.plan_end - start_day)
+
+        changed = start_day != self.start_days[position] or end_day != self.end_days[position]
+        self.start_days[position] = start_day
+        self.end_days[position] = end_day
+        return changed
+
+    def _format_day(self, ordinal):
+        text = self._formatted.get(ordinal)
+        if text is None:
+            text = self._formatted[ordinal] = date.fromordinal(ordinal).strftime(DATE_FORMAT)
+        return text
+
+    def task_dates(self, position):
+        """Scheduling fields of one task, as stored on the task dict"""
+        end_date = self._format_day(self.end_days[position])
+        return {
+            'id': self.ids[position],
+            'duration_days': self.end_days[position] - self.start_days[position],
+            'dependencies': [self.ids[dep_position] for dep_position in self.predecessors[position]],
+            'start_date': self._format_day(self.start_days[position]),
+            'end_date': end_date,
+            'deadline': end_date,
+        }
+
+    def _position(self, task_id):
+        position = self.index_of.get(task_id)
+        if position is None:
+            raise KeyError(task_id)
+        return position
+
+    def _dependency_positions(self, position, dependencies):
+        positions = []
+        for dep_id in dependencies:
+            dep_position = self.index_of.get(dep_id)
+            if dep_position is None:
+                raise ValueError(f"Unknown dependency {dep_id!r}")
+            if dep_position == position:
+                raise ValueError("A task cannot depend on itself")
+            if dep_position not in positions:
+                positions.append(dep_position)
+        return positions
+
+    def _reorder(self, position, dep_positions):
+        """Pearce-Kelly: restore rank order for new edges dep -> position, or raise on a cycle"""
+        upper = max(self.rank[dep] for dep in dep_positions)
+        lower = self.rank[position]
+        if upper < lower:
+            return
+
+        targets = set(dep_positions)
+        # Tasks reachable from position that currently rank at or below the highest new dependency
+        forward = []
+        seen = {position}
+        stack = [position]
+        while stack:
+            node = stack.pop()
+            if node in targets:
+                raise ValueError("Dependency would create a cycle")
+            forward.append(node)
+            for succ in self.successors[node]:
+                if succ not in seen and self.rank[succ] <= upper:
+                    seen.add(succ)
+                    stack.append(succ)
+
+        # Tasks the new dependencies reach back to that rank at or above position
+        backward = []
+        seen = set(dep_positions)
+        stack = list(dep_positions)
+        while stack:
+            node = stack.pop()
+            backward.append(node)
+            for dep in self.predecessors[node]:
+                if dep not in seen and self.rank[dep] >= lower:
+                    seen.add(dep)
+                    stack.append(dep)
+
+        backward.sort(key=self.rank.__getitem__)
+        forward.sort(key=self.rank.__getitem__)
+        ranks = sorted(self.rank[node] for node in backward + forward)
+        for node, rank in zip(backward + forward, ranks):
+            self.rank[node] = rank
+
+    def _propagate(self, roots):
+        """Re-date roots and whatever their moves push downstream; returns changed positions"""
+        heap = [(self.rank[position], position) for position in roots]
+        heapq.heapify(heap)
+        queued = set(roots)
+        changed = []
+        while heap:
+            _, position = heapq.heappop(heap)
+            if self._place(position) or position in roots:
+                changed.append(position)
+                for succ in self.successors[position]:
+                    if succ not in queued:
+                        queued.add(succ)
+                        heapq.heappush(heap, (self.rank[succ], succ))
+        return changed
+
+    def update_task(self, task_id, duration_days=None, dependencies=None):
+        """Change a task's duration and/or dependencies; returns the re-dated tasks.
+
+        Raises KeyError for an unknown task and ValueError for bad
+        dependencies, leaving the schedule untouched.
+        """
+        position = self._position(task_id)
+        if duration_days is not None:
+            duration_days = max(1, int(duration_days))
+        if dependencies is not None:
+            dep_positions = self._dependency_positions(position, dependencies)
+            added = [dep for dep in dep_positions if dep not in self.predecessors[position]]
+            if added:
+                self._reorder(position, added)
+            for dep in self.predecessors[position]:
+                self.successors[dep].discard(position)
+            for dep in dep_positions:
+                self.successors[dep].add(position)
+            self.predecessors[position] = dep_positions
+        if duration_days is not None:
+            self.durations[position] = duration_days
+
+        return [self.task_dates(changed) for changed in self._propagate({position})]
+
+    def add_task(self, task_id, duration_days, dependencies=()):
+        """Schedule a new task after its dependencies; returns its dates"""
+        if task_id in self.index_of:
+            raise ValueError(f"Task {task_id!r} already exists")
+        position = len(self.ids)
+        dep_positions = self._dependency_positions(position, dependencies)
+
+        self.ids.append(task_id)
+        self.index_of[task_id] = position
+        self.durations.append(max(1, int(duration_days)))
+        self.predecessors.append(dep_positions)
+        self.successors.append(set())
+        for dep in dep_positions:
+            self.successors[dep].add(position)
+        # Nothing depends on a new task yet, so ranking it last keeps the order valid
+        self.rank.append(self.next_rank)
+        self.next_rank += 1
+        if isinstance(task_id, int):
+            self.max_int_id = max(self.max_int_id, task_id)
+        self.start_days.append(0)
+        self.end_days.append(0)
+
+        self._place(position)
+        return self.task_dates(position)
+
+    def next_task_id(self):
+        return self.max_int_id + 1
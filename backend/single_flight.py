@@ -0,0 +1,86 @@
+"""In-process coalescing of identical concurrent calls.
+
+The first caller for a key runs the call. Callers that arrive with the
+same key while it is in flight wait for it and get a deep copy of its
+result (or its exception), so a burst of identical plan generations costs
+one model call. Nothing is kept once the call finishes; repeated calls
+later are the LLM response cache's job.
+"""
+import asyncio
+import copy
+import threading
+
+import metrics
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces calls across threads"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, operation, key, fn, *args, **kwargs):
+        key = (operation, key)
+        with self.lock:
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = self.calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            metrics.COALESCED_CALLS.inc(operation=operation)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # Callers may modify their plan (e.g. scheduling it), so each follower gets its own
+            return copy.deepcopy(call.result)
+
+        result = None
+        try:
+            result = fn(*args, **kwargs)
+            return result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.calls[key]
+            # No one can join once the key is gone; snapshot the result before the leader gets to change it
+            if call.waiters and call.error is None:
+                call.result = copy.deepcopy(result)
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """Coalesces coroutine calls on one event loop.
+
+    The shared call runs as its own task and every caller awaits it through
+    a shield, so a disconnecting client cancels only its own wait. Callers
+    resume in no fixed order, so each gets its own copy of the result.
+    """
+
+    def __init__(self):
+        self.tasks = {}
+
+    async def do(self, operation, key, fn, *args, **kwargs):
+        key = (operation, key)
+        task = self.tasks.get(key)
+        leader = task is None
+        if leader:
+            task = self.tasks[key] = asyncio.ensure_future(fn(*args, **kwargs))
+            task.add_done_callback(lambda _: self.tasks.pop(key, None))
+        else:
+            metrics.COALESCED_CALLS.inc(operation=operation)
+
+        return copy.deepcopy(await asyncio.shield(task))
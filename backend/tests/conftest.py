@@ -0,0 +1,44 @@
+"""Shared setup for the backend tests.
+
+Run from backend/ with:  python -m pytest -q
+
+Importing ai_backend opens its database and builds the planner, so the
+environment is pointed at a throwaway database with no model warm-up and
+no LLM cache before any test module imports it. Nothing here calls OpenAI:
+plans come from the template fallback.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+_DB_DIR = tempfile.TemporaryDirectory(prefix='ai-plans-tests-')
+os.environ['AI_PLANS_DB'] = os.path.join(_DB_DIR.name, 'plans.db')
+os.environ.setdefault('OPENAI_API_KEY', 'sk-test')
+os.environ['OPENAI_WARMUP'] = '0'
+os.environ['LLM_CACHE_MAX_ENTRIES'] = '0'
+
+START_DATE = '2024-01-01'
+END_DATE = '2024-06-01'
+
+
+@pytest.fixture(scope='session')
+def backend():
+    import ai_backend
+    assert ai_backend.db is not None and ai_backend.planner is not None
+    return ai_backend
+
+
+@pytest.fixture
+def client(backend):
+    return backend.app.test_client()
+
+
+@pytest.fixture
+def plan_id(backend):
+    """A freshly saved template plan"""
+    plan = backend.planner._create_fallback_plan('Learn to play the violin', START_DATE, END_DATE, 152)
+    return backend.db.save_plan('Learn to play the violin', plan)
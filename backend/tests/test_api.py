@@ -0,0 +1,127 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+
+def test_unchanged_plan_revalidates_with_304(client, plan_id):
+    response = client.get(f'/api/plan/{plan_id}')
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+
+    response = client.get(f'/api/plan/{plan_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+    assert response.get_data() == b''
+
+
+def test_compressed_representation_tag_also_matches(client, plan_id):
+    response = client.get(f'/api/plan/{plan_id}', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    etag = response.headers['ETag']
+    assert etag.endswith('-gzip"')
+
+    response = client.get(f'/api/plan/{plan_id}', headers={'If-None-Match': etag, 'Accept-Encoding': 'gzip'})
+    assert response.status_code == 304
+
+
+def test_edit_changes_the_etag(client, plan_id):
+    etag = client.get(f'/api/plan/{plan_id}').headers['ETag']
+    assert client.patch(f'/api/plan/{plan_id}/tasks/2', json={'duration_days': 9}).status_code == 200
+
+    response = client.get(f'/api/plan/{plan_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    task = next(task for task in response.get_json()['plan_data']['tasks'] if task['id'] == 2)
+    assert task['duration_days'] == 9
+
+
+def test_missing_plan_is_not_found_even_with_a_tag(client):
+    assert client.get('/api/plan/999999', headers={'If-None-Match': '"999999.1"'}).status_code == 404
+
+
+def test_scheduler_cache_entries_are_tied_to_a_revision(backend):
+    cache = backend.SchedulerCache(max_entries=2)
+    entry = cache.add(1, 'scheduler', revision=3)
+    assert cache.add(1, 'other scheduler', revision=3) is entry
+    assert cache.get(1, 3) is entry
+    # A different revision means someone else wrote the plan: the entry is dropped
+    assert cache.get(1, 4) is None
+    assert cache.get(1, 3) is None
+
+    cache.add(1, 'a', 1)
+    cache.add(2, 'b', 1)
+    cache.get(1, 1)
+    cache.add(3, 'c', 1)
+    assert cache.get(2, 1) is None
+    assert cache.get(1, 1) is not None
+    cache.invalidate(1)
+    assert cache.get(1, 1) is None
+
+
+def test_cached_scheduler_is_rebuilt_after_another_writer(backend, client, plan_id):
+    assert client.patch(f'/api/plan/{plan_id}/tasks/2', json={'duration_days': 5}).status_code == 200
+    entry = backend.scheduler_cache.entries[plan_id]
+    assert entry.revision == backend.db.get_plan_revision(plan_id)
+
+    # Another worker moves task 1 through its own scheduler
+    plan_data = backend.db.get_plan(plan_id)['plan_data']
+    other = backend.IncrementalScheduler(plan_data['tasks'], plan_data['start_date'], plan_data['end_date'])
+    backend.db.update_task_schedules(plan_id, other.update_task(1, 20, None))
+
+    assert client.patch(f'/api/plan/{plan_id}/tasks/3', json={'duration_days': 4}).status_code == 200
+    assert backend.scheduler_cache.entries[plan_id] is not entry
+    tasks = {task['id']: task for task in backend.db.get_plan(plan_id)['plan_data']['tasks']}
+    assert tasks[1]['duration_days'] == 20
+    assert tasks[2]['start_date'] == tasks[1]['end_date']
+
+
+def test_write_from_a_stale_revision_is_rejected(backend, plan_id):
+    entry, _ = backend._plan_scheduler(plan_id)
+    backend.db.update_task_schedules(plan_id, [])
+    with pytest.raises(backend.PlanConflictError):
+        backend.db.update_task_schedules(plan_id, [], expected_revision=entry.revision)
+    assert backend._plan_scheduler(plan_id)[0] is not entry
+
+
+def test_generate_plan_rejects_bad_dates(client):
+    for dates in (('2024-13-01', '2024-03-01'), ('2024-03-01', '2024-01-01')):
+        response = client.post('/api/generate-plan', json={'goal': 'g', 'start_date': dates[0], 'end_date': dates[1]})
+        assert response.status_code == 400
+
+
+def sse_events(response):
+    """(event, data) pairs of a Server-Sent Events body"""
+    events = []
+    for block in response.get_data(as_text=True).strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines())
+        events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+
+def test_stream_validates_the_request_like_generate_plan(client):
+    for body in ({'goal': 'g', 'start_date': '2024-03-01', 'end_date': '2024-01-01'},
+                 {'goal': 'g', 'start_date': '2024-01-01', 'end_date': '2024-03-01', 'schedule': {'mode': 'people'}}):
+        assert client.post('/api/generate-plan/stream', json=body).status_code == 400
+
+
+def test_stream_saves_the_plan_under_the_requested_schedule(backend, client, monkeypatch):
+    def unavailable(**kwargs):
+        raise RuntimeError('model unavailable')
+
+    monkeypatch.setattr(backend.planner, '_client',
+                        SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=unavailable))))
+    body = {'goal': 'Learn Spanish', 'start_date': '2024-01-01', 'end_date': '2024-03-01',
+            'schedule': {'capacity': 1, 'holidays': ['2024-01-02']}}
+    events = sse_events(client.post('/api/generate-plan/stream', json=body))
+    assert events[0][0] == 'meta' and events[-1][0] == 'plan'
+
+    final = events[-1][1]
+    assert final['plan']['schedule_constraints']['holidays'] == ['2024-01-02']
+    saved = backend.db.get_plan(final['plan_id'])['plan_data']
+    assert saved['schedule_constraints'] == final['plan']['schedule_constraints']
+    # Capacity 1: no two tasks overlap, and nothing runs on the holiday or a weekend
+    tasks = sorted(saved['tasks'], key=lambda task: task['start_date'])
+    for before, after in zip(tasks, tasks[1:]):
+        assert before['end_date'] <= after['start_date']
+    assert all(task['start_date'] != '2024-01-06' and task['start_date'] != '2024-01-02' for task in tasks)
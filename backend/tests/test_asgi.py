@@ -0,0 +1,81 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+@pytest.fixture(scope='module')
+def asgi(backend):
+    import ai_backend_async
+    return ai_backend_async
+
+
+def call(app, method, path, body=None):
+    """Drive one HTTP request through the ASGI app and return (status, decoded JSON body)"""
+    messages = [{'type': 'http.request', 'body': json.dumps(body).encode() if body is not None else b''}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {'type': 'http', 'method': method, 'path': path, 'headers': [], 'query_string': b''}
+    asyncio.run(app(scope, receive, send))
+    body = b''.join(message.get('body', b'') for message in sent if message['type'] == 'http.response.body')
+    return sent[0]['status'], json.loads(body)
+
+
+def test_ready_reports_the_async_planner(asgi, monkeypatch):
+    monkeypatch.setattr(asgi.async_planner, 'readiness', {'status': 'ready', 'probe_ms': 12.5})
+    status, payload = call(asgi.app, 'GET', '/api/ready')
+    assert status == 200
+    assert payload == {'ready': True, 'database': 'ok', 'llm': {'status': 'ready', 'probe_ms': 12.5}}
+
+
+def test_regenerated_reply_is_processed_off_the_event_loop(asgi, backend, plan_id, monkeypatch):
+    reply = json.dumps({'tasks': [{'id': 1, 'description': 'Practice scales', 'duration_days': 5,
+                                   'dependencies': []}]})
+
+    async def create(**kwargs):
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=reply))], usage=None)
+
+    monkeypatch.setattr(asgi.async_planner, '_client',
+                        SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))))
+    threads = []
+    process = asgi.async_planner._regenerated_plan_from_response
+
+    def recording(*args):
+        threads.append(threading.current_thread())
+        return process(*args)
+
+    monkeypatch.setattr(asgi.async_planner, '_regenerated_plan_from_response', recording)
+    status, payload = call(asgi.app, 'POST', '/api/regenerate-ai', {'plan_id': plan_id, 'completed_tasks': []})
+    assert status == 200
+    assert payload['plan']['tasks'][0]['description'] == 'Practice scales'
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_asgi_import_skips_the_sync_warmup(tmp_path):
+    # A fresh interpreter: the session has already imported ai_backend
+    script = (
+        'import threading\n'
+        'started = []\n'
+        'def start(self):\n'
+        '    started.append(self.name)\n'
+        'threading.Thread.start = start\n'
+        'import ai_backend_async\n'
+        'print("openai-warmup" in started)\n'
+    )
+    env = dict(os.environ, OPENAI_WARMUP='1', AI_PLANS_DB=str(tmp_path / 'plans.db'))
+    result = subprocess.run([sys.executable, '-c', script], cwd=BACKEND_DIR, env=env,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == 'False'
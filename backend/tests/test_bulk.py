@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+
+def sse_events(response):
+    """(event, data) pairs of a Server-Sent Events body"""
+    events = []
+    for block in response.get_data(as_text=True).strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines())
+        events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+
+@pytest.fixture
+def template_plans(backend, monkeypatch):
+    """Plans come straight from the template fallback; the goal 'boom' fails"""
+    def generate(goal, start_date, end_date):
+        if goal == 'boom':
+            raise RuntimeError('model unavailable')
+        return backend.planner._create_fallback_plan(goal, start_date, end_date, 30)
+
+    monkeypatch.setattr(backend.planner, 'generate_ai_plan', generate)
+
+
+@pytest.mark.parametrize('body, message', [
+    ({}, 'non-empty list'),
+    ({'plans': 'Learn Spanish'}, 'non-empty list'),
+    ({'plans': [{'goal': 'g'}], 'concurrency': 'many'}, 'concurrency'),
+])
+def test_malformed_bulk_requests_are_rejected(client, body, message):
+    response = client.post('/api/generate-plans', json=body)
+    assert response.status_code == 400
+    assert message in response.get_json()['error']
+
+
+def test_too_many_items_are_rejected(backend, client, monkeypatch):
+    monkeypatch.setattr(backend, 'BULK_MAX_ITEMS', 2)
+    response = client.post('/api/generate-plans', json={'plans': [{'goal': 'g'}] * 3})
+    assert response.status_code == 400
+
+
+def test_invalid_items_fail_alone_and_the_rest_are_saved(backend, client, template_plans):
+    items = [
+        {'goal': 'Learn Spanish', 'start_date': '2024-01-01', 'end_date': '2024-01-31'},
+        {'goal': 'No dates'},
+        {'goal': 'Backwards', 'start_date': '2024-03-01', 'end_date': '2024-01-01'},
+        'not an object',
+        {'goal': 'boom', 'start_date': '2024-01-01', 'end_date': '2024-01-31'},
+        {'goal': 'Run a 10k', 'start_date': '2024-02-01', 'end_date': '2024-03-02'},
+    ]
+    events = sse_events(client.post('/api/generate-plans', json={'plans': items, 'concurrency': 2}))
+
+    errors = {data['index']: data['error'] for event, data in events if event == 'error'}
+    assert set(errors) == {1, 2, 3, 4}
+    assert 'required' in errors[1] and 'required' in errors[3]
+    assert 'model unavailable' in errors[4]
+    results = {data['index']: data['plan'] for event, data in events if event == 'result'}
+    assert set(results) == {0, 5}
+
+    assert events[-1][0] == 'saved'
+    plan_ids = events[-1][1]['plan_ids']
+    assert set(plan_ids) == {'0', '5'}
+    for index, plan_id in plan_ids.items():
+        assert backend.db.get_plan(plan_id)['goal'] == items[int(index)]['goal']
@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+import critical_path
+from resource_scheduler import parse_constraints
+
+
+def task(task_id, duration_days, dependencies=()):
+    return {'id': task_id, 'description': f'Task {task_id}', 'duration_days': duration_days,
+            'dependencies': list(dependencies)}
+
+
+def diamond():
+    # 1 -> 2 -> 4 is the long way round; 3 can slip two days
+    return [task(1, 2), task(2, 3, [1]), task(3, 1, [1]), task(4, 2, [2, 3])]
+
+
+def test_slack_and_critical_path_of_a_diamond():
+    analysis = critical_path.analyze(diamond())
+    assert analysis['project_duration'] == 7
+    rows = {row['id']: row for row in analysis['tasks']}
+    assert [(rows[i]['earliest_start'], rows[i]['latest_start']) for i in (1, 2, 3, 4)] == \
+        [(0, 0), (2, 2), (2, 4), (5, 5)]
+    assert rows[3]['slack'] == rows[3]['free_slack'] == 2
+    assert [rows[i]['slack'] for i in (1, 2, 4)] == [0, 0, 0]
+    assert analysis['critical_path'] == [1, 2, 4]
+    assert analysis['critical_tasks'] == [1, 2, 4]
+
+
+def test_free_slack_stops_at_the_next_task():
+    # 2 can slip 3 days overall, but any delay pushes back 3's earliest start
+    tasks = [task(1, 6), task(2, 1), task(3, 2, [2])]
+    rows = {row['id']: row for row in critical_path.analyze(tasks)['tasks']}
+    assert (rows[2]['slack'], rows[2]['free_slack']) == (3, 0)
+    assert (rows[3]['slack'], rows[3]['free_slack']) == (3, 3)
+
+
+def test_empty_plan():
+    assert critical_path.analyze([])['critical_path'] == []
+
+
+def test_vectorized_levels_match_the_plain_python_passes(monkeypatch):
+    rng = random.Random(7)
+    tasks = [task(i, rng.randint(1, 9), rng.sample(range(max(1, i - 40), i), min(i - 1, rng.randint(0, 4))))
+             for i in range(1, 801)]
+    monkeypatch.setattr(critical_path, 'VECTOR_MIN_EDGES', 10 ** 9)
+    plain = critical_path.analyze(tasks)
+    monkeypatch.setattr(critical_path, 'VECTOR_MIN_EDGES', 1)
+    assert critical_path.analyze(tasks) == plain
+
+
+@pytest.mark.parametrize('schedule, start, end', [
+    (None, '2024-01-06', '2024-01-08'),
+    # Weekends skipped: offset 5 is the sixth working day
+    ({}, '2024-01-08', '2024-01-10'),
+    ({'holidays': ['2024-01-02']}, '2024-01-09', '2024-01-11'),
+])
+def test_dates_follow_the_plan_calendar(schedule, start, end):
+    constraints = parse_constraints(schedule) if schedule is not None else None
+    analysis = critical_path.with_dates(critical_path.analyze(diamond()), '2024-01-01', constraints)
+    rows = {row['id']: row for row in analysis['tasks']}
+    assert rows[1]['earliest_start_date'] == '2024-01-01'
+    assert rows[4]['earliest_start_date'] == start
+    assert analysis['project_end_date'] == end
+
+
+def test_critical_path_endpoint(client, plan_id):
+    response = client.get(f'/api/plan/{plan_id}/critical-path')
+    assert response.status_code == 200
+    analysis = response.get_json()
+    assert analysis['plan_id'] == plan_id
+    assert (analysis['calendar'], analysis['capacity_modelled']) == ('calendar_days', False)
+    assert analysis['critical_path'] and set(analysis['critical_path']) <= set(analysis['critical_tasks'])
+    assert client.get('/api/plan/999999/critical-path').status_code == 404
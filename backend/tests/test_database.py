@@ -0,0 +1,124 @@
+import json
+import sqlite3
+
+import pytest
+
+import plan_history
+from db_pool import ConnectionPool
+
+
+def test_v1_database_is_migrated_to_the_current_schema(backend, tmp_path):
+    path = str(tmp_path / 'legacy.db')
+    plan_data = {'goal': 'Run a marathon', 'domain': 'Fitness', 'start_date': '2024-01-01',
+                 'end_date': '2024-04-01', 'total_days': 91, 'ai_generated': True,
+                 'tasks': [{'id': 1, 'description': 'Buy shoes', 'duration_days': 1, 'dependencies': []},
+                           {'id': 2, 'description': 'Long runs', 'duration_days': 30, 'dependencies': [1],
+                            'notes': 'kept as an extra field'}]}
+    conn = sqlite3.connect(path)
+    conn.execute('''
+        CREATE TABLE plans (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            goal TEXT NOT NULL,
+            plan_data TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            completed BOOLEAN DEFAULT FALSE,
+            completed_tasks TEXT DEFAULT '[]'
+        )
+    ''')
+    conn.execute('INSERT INTO plans (id, goal, plan_data, completed_tasks) VALUES (?, ?, ?, ?)',
+                 (7, 'Run a marathon', json.dumps(plan_data), json.dumps([{'id': 1}])))
+    conn.commit()
+    conn.close()
+
+    db = backend.AIDatabase(ConnectionPool(path, size=1))
+    plan = db.get_plan(7)
+    db.pool.close()
+
+    conn = sqlite3.connect(path)
+    assert conn.execute('PRAGMA user_version').fetchone()[0] == backend.AIDatabase.SCHEMA_VERSION
+    assert not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'plans_legacy'").fetchone()
+    assert conn.execute("SELECT rowid FROM plan_search WHERE plan_search MATCH 'shoes'").fetchall() == [(7,)]
+    conn.close()
+
+    assert plan['goal'] == 'Run a marathon'
+    # No history is recorded until the plan is first regenerated
+    assert plan['version'] == 0 and plan['revision'] >= 1
+    assert plan['completed_tasks'] == [{'id': 1}]
+    assert plan['completed'] is False
+    data = plan['plan_data']
+    assert (data['domain'], data['start_date'], data['total_days'], data['ai_generated']) == \
+        ('Fitness', '2024-01-01', 91, True)
+    assert [task['id'] for task in data['tasks']] == [1, 2]
+    assert data['tasks'][1]['dependencies'] == [1]
+    assert data['tasks'][1]['notes'] == 'kept as an extra field'
+    assert [task['completed'] for task in data['tasks']] == [True, False]
+
+
+def test_versions_round_trip_through_snapshots_and_deltas(backend, client, plan_id, monkeypatch):
+    monkeypatch.setattr(backend, 'PLAN_SNAPSHOT_INTERVAL', 3)
+    stored = {}
+    for step in range(7):
+        plan_data = backend.db.get_plan(plan_id)['plan_data']
+        plan_data['tasks'][step % len(plan_data['tasks'])]['description'] = f'Revised in step {step}'
+        if step == 4:
+            plan_data['tasks'].pop()
+        version = backend.db.save_version(plan_id, plan_data)
+        stored[version] = plan_history.content(backend.db.get_plan(plan_id)['plan_data'])
+
+    versions = client.get(f'/api/plan/{plan_id}/versions').get_json()['versions']
+    assert [version['version'] for version in versions] == list(range(1, 9))
+    assert {version['kind'] for version in versions} == {'snapshot', 'delta'}
+    for version, content in stored.items():
+        response = client.get(f'/api/plan/{plan_id}/versions/{version}')
+        assert response.status_code == 200
+        assert response.get_json()['plan'] == json.loads(json.dumps(content))
+
+
+def revised(plan_data):
+    plan_data['tasks'][0]['description'] = 'Revised'
+    return plan_data
+
+
+def test_history_starts_at_version_0(backend, client, plan_id):
+    assert backend.db.get_plan(plan_id)['version'] == 0
+    assert client.get(f'/api/plan/{plan_id}/versions').get_json()['versions'] == []
+    assert backend.db.save_version(plan_id, revised(backend.db.get_plan(plan_id)['plan_data'])) == 2
+    assert backend.db.get_plan(plan_id)['version'] == 2
+    assert client.get(f'/api/plan/{plan_id}/versions/1').status_code == 200
+
+
+def test_unchanged_plan_is_not_recorded_as_a_version(backend, client, plan_id):
+    # A regeneration that fell back to the plan as it was
+    assert backend.db.save_version(plan_id, backend.db.get_plan(plan_id)['plan_data']) == 0
+    assert client.get(f'/api/plan/{plan_id}/versions').get_json()['versions'] == []
+
+    backend.db.save_version(plan_id, revised(backend.db.get_plan(plan_id)['plan_data']))
+    assert backend.db.save_version(plan_id, backend.db.get_plan(plan_id)['plan_data']) == 2
+    assert len(client.get(f'/api/plan/{plan_id}/versions').get_json()['versions']) == 2
+
+
+def test_schema_5_plans_without_history_move_to_version_0(backend, tmp_path):
+    path = str(tmp_path / 'v5.db')
+    db = backend.AIDatabase(ConnectionPool(path, size=1))
+    plan = backend.planner._create_fallback_plan('Learn to play the violin', '2024-01-01', '2024-06-01', 152)
+    fresh, regenerated = db.save_plan('fresh', plan), db.save_plan('regenerated', plan)
+    db.save_version(regenerated, revised(db.get_plan(regenerated)['plan_data']))
+    with db.pool.transaction() as conn:
+        conn.execute('UPDATE plans SET version = 1 WHERE id = ?', (fresh,))
+        conn.execute('PRAGMA user_version = 5')
+    db.pool.close()
+
+    db = backend.AIDatabase(ConnectionPool(path, size=1))
+    assert (db.get_plan(fresh)['version'], db.get_plan(regenerated)['version']) == (0, 2)
+    db.pool.close()
+
+
+@pytest.mark.parametrize('version', [0, 3, 99])
+def test_versions_that_were_never_recorded_are_not_found(backend, client, plan_id, version):
+    backend.db.save_version(plan_id, revised(backend.db.get_plan(plan_id)['plan_data']))
+    assert client.get(f'/api/plan/{plan_id}/versions/{version}').status_code == 404
+
+
+def test_versions_of_a_missing_plan_are_not_found(client):
+    assert client.get('/api/plan/999999/versions').status_code == 404
+    assert client.get('/api/plan/999999/versions/1').status_code == 404
@@ -0,0 +1,29 @@
+import pytest
+
+from db_pool import ConnectionPool, PoolTimeoutError
+
+
+def test_exhausted_pool_times_out_with_a_descriptive_error(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'pool.db'), size=1, busy_timeout_ms=50)
+    with pool.connection():
+        with pytest.raises(PoolTimeoutError, match=r'50 ms \(pool size 1\)'):
+            pool.acquire()
+    # The connection is back in the pool once released
+    with pool.connection() as conn:
+        assert conn.execute('SELECT 1').fetchone() == (1,)
+    pool.close()
+
+
+def test_pool_timeout_is_a_503(backend, client, plan_id, monkeypatch):
+    def exhausted(*args, **kwargs):
+        raise PoolTimeoutError('No database connection became free within 5000 ms (pool size 8)')
+
+    monkeypatch.setattr(backend.db, 'get_plan', exhausted)
+    monkeypatch.setattr(backend.db, 'apply_progress', exhausted)
+    # Routes without their own error handling go through the app's handler
+    response = client.get(f'/api/plan/{plan_id}')
+    assert response.status_code == 503
+    assert 'pool size 8' in response.get_json()['error']
+    # Routes that catch errors themselves map it the same way
+    response = client.post('/api/update-progress', json={'plan_id': plan_id, 'complete': [1]})
+    assert response.status_code == 503
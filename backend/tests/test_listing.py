@@ -0,0 +1,59 @@
+import pytest
+
+from db_pool import ConnectionPool
+
+GOALS = ['Learn Spanish', 'Run a marathon', 'Learn to play the violin', 'Write a novel', 'Learn Python']
+
+
+@pytest.fixture
+def listing(backend, tmp_path, monkeypatch):
+    """The app on a database of its own, holding 25 plans created in the same second"""
+    db = backend.AIDatabase(ConnectionPool(str(tmp_path / 'listing.db'), size=2))
+    plan_ids = []
+    for index in range(25):
+        goal = GOALS[index % len(GOALS)]
+        plan_ids.append(db.save_plan(goal, backend.planner._create_fallback_plan(goal, '2024-01-01', '2024-03-01', 60)))
+    monkeypatch.setattr(backend, 'db', db)
+    yield plan_ids
+    db.pool.close()
+
+
+def pages(client, **params):
+    """Every page of a listing, following next_cursor"""
+    result = []
+    while True:
+        body = client.get('/api/plans', query_string=params).get_json()
+        result.append([plan['id'] for plan in body['plans']])
+        if not body['next_cursor']:
+            return result
+        params['cursor'] = body['next_cursor']
+
+
+def test_cursor_pages_cover_every_plan_once_newest_first(client, listing):
+    result = pages(client, limit=10)
+    assert [len(page) for page in result] == [10, 10, 5]
+    assert sum(result, []) == sorted(listing, reverse=True)
+
+
+def test_plans_created_while_paging_do_not_shift_later_pages(backend, client, listing):
+    first = client.get('/api/plans', query_string={'limit': 10}).get_json()
+    backend.db.save_plan('Brand new', backend.planner._create_fallback_plan('Brand new', '2024-01-01', '2024-03-01', 60))
+    second = client.get('/api/plans', query_string={'limit': 10, 'cursor': first['next_cursor']}).get_json()
+    assert [plan['id'] for plan in second['plans']] == sorted(listing, reverse=True)[10:20]
+
+
+def test_search_matches_goals_and_task_prefixes(client, listing):
+    learn = sum(pages(client, q='learn', limit=4), [])
+    assert learn == [plan_id for index, plan_id in enumerate(listing) if GOALS[index % 5].startswith('Learn')][::-1]
+    # The last word is matched as a prefix
+    assert sum(pages(client, q='mara'), []) == listing[1::5][::-1]
+
+
+def test_search_input_is_not_fts_syntax(client, listing):
+    for query in ('"', 'learn OR run', 'NEAR(', '*'):
+        assert client.get('/api/plans', query_string={'q': query}).status_code == 200
+
+
+@pytest.mark.parametrize('params', [{'cursor': 'not-a-cursor'}, {'limit': 'ten'}])
+def test_bad_listing_parameters_are_rejected(client, listing, params):
+    assert client.get('/api/plans', query_string=params).status_code == 400
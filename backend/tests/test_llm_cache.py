@@ -0,0 +1,84 @@
+import pytest
+
+import llm_cache
+from db_pool import ConnectionPool
+from llm_cache import LLMResponseCache, make_cache_key
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(llm_cache.time, 'time', clock.time)
+    return clock
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'cache.db'), size=2)
+    yield pool
+    pool.close()
+
+
+def test_keys_ignore_goal_case_and_whitespace():
+    assert make_cache_key('Learn  Spanish ', 30, 'm', 1) == make_cache_key('learn spanish', 30, 'm', 1)
+    assert make_cache_key('learn spanish', 30, 'm', 1) != make_cache_key('learn spanish', 31, 'm', 1)
+    assert make_cache_key('learn spanish', 30, 'm', 1) != make_cache_key('learn spanish', 30, 'm', 2)
+
+
+def test_stored_response_is_a_hit(pool, clock):
+    cache = LLMResponseCache(pool)
+    response = {'domain': 'Languages', 'tasks': [{'id': 1, 'description': 'Learn greetings'}]}
+    assert cache.get('key') is None
+    cache.put('key', response)
+    assert cache.get('key') == response
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['stores'], stats['entries']) == (1, 1, 1, 1)
+    assert stats['hit_rate'] == 0.5
+
+
+def test_entries_expire_after_the_ttl(pool, clock):
+    cache = LLMResponseCache(pool, ttl_seconds=60)
+    cache.put('key', {'tasks': []})
+    clock.now += 60
+    assert cache.get('key') == {'tasks': []}
+    clock.now += 1
+    assert cache.get('key') is None
+    stats = cache.stats()
+    assert (stats['expired'], stats['entries']) == (1, 0)
+
+
+def test_least_recently_used_entries_are_evicted(pool, clock):
+    cache = LLMResponseCache(pool, max_entries=2)
+    cache.put('a', {'tasks': ['a']})
+    clock.now += 1
+    cache.put('b', {'tasks': ['b']})
+    clock.now += 1
+    # Reading 'a' makes 'b' the least recently used entry
+    cache.get('a')
+    clock.now += 1
+    cache.put('c', {'tasks': ['c']})
+
+    assert cache.get('b') is None
+    assert cache.get('a') == {'tasks': ['a']}
+    assert cache.get('c') == {'tasks': ['c']}
+    assert cache.stats()['evictions'] == 1
+
+
+def test_byte_budget_evicts_the_oldest_entries(pool, clock):
+    cache = LLMResponseCache(pool, max_bytes=100)
+    for key in 'abc':
+        cache.put(key, {'tasks': [key * 30]})
+        clock.now += 1
+    stats = cache.stats()
+    assert stats['bytes'] <= 100
+    assert cache.get('a') is None
+    assert cache.get('c') == {'tasks': ['c' * 30]}
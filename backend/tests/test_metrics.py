@@ -0,0 +1,75 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import metrics
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = metrics.Histogram('test_seconds', 'Test latency.', ('route',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, route='/a "b"')
+    assert histogram.render() == [
+        '# HELP test_seconds Test latency.',
+        '# TYPE test_seconds histogram',
+        'test_seconds_bucket{route="/a \\"b\\"",le="0.1"} 1',
+        'test_seconds_bucket{route="/a \\"b\\"",le="1.0"} 3',
+        'test_seconds_bucket{route="/a \\"b\\"",le="+Inf"} 4',
+        'test_seconds_sum{route="/a \\"b\\""} 4.25',
+        'test_seconds_count{route="/a \\"b\\""} 4',
+    ]
+
+
+def test_labels_must_match_the_declared_names():
+    counter = metrics.Counter('test_total', 'Test counter.', ('operation',))
+    with pytest.raises(ValueError):
+        counter.inc(operation='a', source='b')
+
+
+def test_timer_observes_each_decorated_call():
+    histogram = metrics.Histogram('test_timer_seconds', 'Timer.', ('operation',))
+
+    @histogram.time(operation='work')
+    def work():
+        return 42
+
+    assert work() == 42 and work() == 42
+    assert histogram.values[('work',)][-1] == 2
+
+
+def test_routes_are_labelled_by_url_rule(client, plan_id):
+    client.get(f'/api/plan/{plan_id}')
+    client.get('/api/plan/999999')
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'route="/api/plan/<int:plan_id>",status="200"' in body
+    assert 'route="/api/plan/<int:plan_id>",status="404"' in body
+    assert f'/api/plan/{plan_id}"' not in body
+
+
+def fake_client(reply, usage=None):
+    def create(**kwargs):
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=reply))], usage=usage)
+    return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+
+def regenerated_count(source):
+    return metrics.PLANS_GENERATED.values.get(('regenerate', source), 0)
+
+
+def test_regeneration_is_counted_once_by_its_real_source(backend, plan_id, monkeypatch):
+    plan = backend.db.get_plan(plan_id)['plan_data']
+    reply = json.dumps({'tasks': [{'id': 1, 'description': 'Practice scales', 'duration_days': 5}]})
+    usage = SimpleNamespace(prompt_tokens=300, completion_tokens=120)
+    ai, fallback = regenerated_count('ai'), regenerated_count('fallback')
+    tokens = metrics.OPENAI_TOKENS.values.get(('regenerate', 'completion'), 0)
+
+    monkeypatch.setattr(backend.planner, '_client', fake_client(reply, usage))
+    backend.planner.regenerate_with_ai(plan, [], 'first')
+    assert (regenerated_count('ai'), regenerated_count('fallback')) == (ai + 1, fallback)
+    assert metrics.OPENAI_TOKENS.values[('regenerate', 'completion')] == tokens + 120
+
+    # A reply that parses but fails validation falls back, and counts only as a fallback
+    monkeypatch.setattr(backend.planner, '_client', fake_client('{"tasks": [{"id": 1}]}'))
+    assert backend.planner.regenerate_with_ai(plan, [], 'second') is plan
+    assert (regenerated_count('ai'), regenerated_count('fallback')) == (ai + 1, fallback + 1)
@@ -0,0 +1,36 @@
+import pytest
+
+from plan_model import PlanValidationError, parse_date_range, validate_tasks
+
+
+def test_tasks_are_normalized_in_place():
+    tasks = [{'id': '1', 'description': ' Buy a violin ', 'priority': 'HIGH', 'duration_days': 2.5,
+              'dependencies': None, 'notes': 'kept'},
+             {'id': 2, 'description': 'Practice', 'dependencies': ['1'], 'start_date': '2024-01-03'}]
+    assert validate_tasks(tasks) is tasks
+    assert tasks[0] == {'id': 1, 'description': 'Buy a violin', 'priority': 'high', 'duration_days': 3,
+                        'dependencies': [], 'notes': 'kept', 'category': None, 'completed': False}
+    assert (tasks[1]['priority'], tasks[1]['duration_days'], tasks[1]['dependencies']) == ('medium', 1, [1])
+
+
+@pytest.mark.parametrize('tasks', [
+    [{'id': 1}],
+    [{'id': 'one', 'description': 'a'}],
+    [{'id': 1, 'description': 'a'}, {'id': 1, 'description': 'b'}],
+    [{'id': 1, 'description': 'a', 'duration_days': 0}],
+    [{'id': 1, 'description': 'a', 'dependencies': 'all'}],
+    [{'id': 1, 'description': 'a', 'deadline': 'soon'}],
+    ['not a task'],
+])
+def test_malformed_tasks_are_rejected(tasks):
+    with pytest.raises(PlanValidationError):
+        validate_tasks(tasks)
+
+
+@pytest.mark.parametrize('start, end', [
+    ('2024-03-01', '2024-01-01'), ('2024-13-01', '2024-03-01'), ('', '2024-03-01'), (None, '2024-03-01'),
+])
+def test_bad_date_ranges_are_rejected(start, end):
+    with pytest.raises(PlanValidationError):
+        parse_date_range(start, end)
+    assert parse_date_range('2024-01-01', '2024-01-01')[0].isoformat() == '2024-01-01'
@@ -0,0 +1,42 @@
+import pytest
+
+from plan_parser import PlanParseError, PlanStreamParser, parse_plan
+
+
+def test_plan_is_found_inside_prose_and_code_fences():
+    reply = ('Sure! Here is your plan:\n```json\n'
+             '{"domain": "Music", "tasks": [{"id": 1, "description": "Buy a violin"},]}\n'
+             '```\nGood luck {')
+    assert parse_plan(reply) == {'domain': 'Music', 'tasks': [{'id': 1, 'description': 'Buy a violin'}]}
+
+
+def test_bare_task_array_is_accepted():
+    plan = parse_plan('[{"id": 1, "description": "a"}, {"id": 2, "description": "b"}]')
+    assert [task['id'] for task in plan['tasks']] == [1, 2]
+
+
+def test_braces_and_quotes_inside_strings_are_not_structure():
+    plan = parse_plan('prefix {"a": 1} {"tasks": [{"id": 1, "description": "a {b} \\"c\\""}]}')
+    assert plan['tasks'] == [{'id': 1, 'description': 'a {b} "c"'}]
+
+
+def test_truncated_reply_keeps_the_completed_tasks():
+    plan = parse_plan('{"domain": "X", "tasks": [{"id": 1, "description": "a"}, {"id": 2, "descr')
+    assert plan == {'domain': 'X', 'tasks': [{'id': 1, 'description': 'a'}]}
+
+
+@pytest.mark.parametrize('reply', ['', 'no json here', '{"tasks": [', '```json\n```'])
+def test_reply_without_a_plan_raises(reply):
+    with pytest.raises(PlanParseError):
+        parse_plan(reply)
+
+
+def test_stream_parser_yields_each_task_when_it_closes():
+    text = '{"tasks": [{"id": 1, "description": "a"}, {"id": 2, "description": "b"}]}'
+    parser = PlanStreamParser()
+    yielded_at = {}
+    for index, char in enumerate(text):
+        for task in parser.feed(char):
+            yielded_at[task['id']] = index
+    assert yielded_at == {1: text.index('}'), 2: text.index('}', text.index('}') + 1)}
+    assert parser.close() == {'tasks': [{'id': 1, 'description': 'a'}, {'id': 2, 'description': 'b'}]}
@@ -0,0 +1,52 @@
+import pytest
+
+import plan_templates
+from plan_templates import GENERAL_TEMPLATE, INDEX, TEMPLATES, TemplateIndex, tokenize
+
+
+@pytest.mark.parametrize('goal, domain', [
+    ('Learn conversational Spanish', 'Language Learning'),
+    ('Run my first half marathon', 'Running & Endurance'),
+    ('Launch an online store selling handmade candles', 'Business Launch'),
+    ('Pass the AWS certification exam', 'Exam Preparation'),
+    ('Learn to play the violin', 'Music'),
+])
+def test_goals_match_their_domain(goal, domain):
+    template, score = INDEX.match(goal)
+    assert template['domain'] == domain
+    assert score >= plan_templates.MIN_SCORE
+
+
+def test_unrelated_goal_gets_the_general_template():
+    assert INDEX.match('Zzyzx qwerty') == (GENERAL_TEMPLATE, 0.0)
+    assert INDEX.match('') == (GENERAL_TEMPLATE, 0.0)
+
+
+def test_inflections_share_a_stem():
+    assert tokenize('Running runs') == tokenize('run run')
+    assert tokenize('Shopping for the shop') == ['shop', 'shop']
+
+
+def test_search_ranks_by_score():
+    results = INDEX.search('build a mobile app and a website', limit=3)
+    assert len(results) == 3
+    assert [score for score, _ in results] == sorted((score for score, _ in results), reverse=True)
+    assert {results[0][1]['domain'], results[1][1]['domain']} == {'Software Development', 'Web Development'}
+
+
+def test_templates_are_well_formed():
+    for template in TEMPLATES + [GENERAL_TEMPLATE]:
+        for description, category, priority, share, dependencies in template['tasks']:
+            assert priority in ('high', 'medium', 'low') and 0 < share <= 1, template['domain']
+    # Dependencies must point at earlier tasks
+    bad = {'domain': 'Bad', 'keywords': 'bad', 'tasks': [('a', 'c', 'high', 1.0, [1])]}
+    with pytest.raises(ValueError):
+        TemplateIndex([bad])
+
+
+def test_fallback_plan_is_built_from_the_matched_template(backend):
+    plan = backend.planner._create_fallback_plan('Run a 10k race', '2024-01-01', '2024-03-01', 60)
+    assert plan['domain'] == 'Running & Endurance'
+    assert plan['template']['domain'] == 'Running & Endurance'
+    assert len(plan['tasks']) == len(INDEX.match('Run a 10k race')[0]['tasks'])
+    assert all(task['end_date'] <= '2024-03-01' for task in plan['tasks'])
@@ -0,0 +1,58 @@
+import json
+from types import SimpleNamespace
+
+
+def progress(client, plan_id, **body):
+    return client.post('/api/update-progress', json=dict(body, plan_id=plan_id))
+
+
+def completed_ids(backend, plan_id):
+    plan = backend.db.get_plan(plan_id)
+    return [task['id'] for task in plan['plan_data']['tasks'] if task['completed']], plan['completed']
+
+
+def test_deltas_change_only_the_named_tasks(backend, client, plan_id):
+    response = progress(client, plan_id, complete=[1, 2, 3])
+    assert response.status_code == 200 and response.get_json()['changed'] == 3
+    assert progress(client, plan_id, complete=[4], uncomplete=[2]).get_json()['changed'] == 2
+    assert completed_ids(backend, plan_id) == ([1, 3, 4], False)
+
+    # Resending a delta the server already has is harmless
+    assert progress(client, plan_id, complete=[4]).get_json()['changed'] == 0
+
+
+def test_completing_every_task_completes_the_plan(backend, client, plan_id):
+    task_ids = [task['id'] for task in backend.db.get_plan(plan_id)['plan_data']['tasks']]
+    progress(client, plan_id, complete=task_ids)
+    assert completed_ids(backend, plan_id) == (task_ids, True)
+    progress(client, plan_id, uncomplete=task_ids[:1])
+    assert completed_ids(backend, plan_id)[1] is False
+
+
+def test_contradictory_and_malformed_deltas_are_rejected(client, plan_id):
+    assert progress(client, plan_id, complete=[1], uncomplete=['1']).status_code == 400
+    assert progress(client, plan_id, complete=1).status_code == 400
+    assert progress(client, 999999, complete=[1]).status_code == 404
+
+
+def test_full_completed_list_is_still_accepted(backend, client, plan_id):
+    progress(client, plan_id, complete=[1])
+    response = progress(client, plan_id, completed_tasks=[{'id': 2}, {'id': 3}])
+    assert response.status_code == 200
+    assert completed_ids(backend, plan_id) == ([2, 3], False)
+
+
+def test_regenerated_plan_reports_which_renumbered_tasks_are_complete(backend, client, plan_id, monkeypatch):
+    # The frontend rebuilds its completed set from these flags after regenerating
+    reply = json.dumps({'tasks': [{'id': 1, 'description': 'Practice scales', 'duration_days': 5}]})
+
+    def create(**kwargs):
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=reply))], usage=None)
+
+    monkeypatch.setattr(backend.planner, '_client',
+                        SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create))))
+    progress(client, plan_id, complete=[2, 3])
+    response = client.post('/api/regenerate-ai', json={'plan_id': plan_id, 'completed_tasks': [{'id': 2}, {'id': 3}]})
+    tasks = response.get_json()['plan']['tasks']
+    assert [(task['id'], bool(task.get('completed'))) for task in tasks] == [(1, True), (2, True), (3, False)]
+    assert completed_ids(backend, plan_id) == ([1, 2], False)
@@ -0,0 +1,82 @@
+import pytest
+
+from resource_scheduler import WorkCalendar, _parse_day, parse_constraints, schedule_with_constraints
+
+
+def task(task_id, duration_days=1, dependencies=(), **fields):
+    return dict({'id': task_id, 'description': f'Task {task_id}', 'duration_days': duration_days,
+                 'dependencies': list(dependencies)}, **fields)
+
+
+def schedule(tasks, constraints, start='2024-01-01', end='2024-03-01'):
+    scheduled, late = schedule_with_constraints(tasks, start, end, parse_constraints(constraints))
+    return {task['id']: (task['start_date'], task['end_date']) for task in scheduled}, late
+
+
+def test_durations_count_working_days_around_weekends_and_holidays():
+    # Friday start; Monday 8 January is a holiday
+    dates, _ = schedule([task(1, 2), task(2, 1, [1])], {'holidays': ['2024-01-08']}, start='2024-01-05')
+    assert dates == {1: ('2024-01-05', '2024-01-10'), 2: ('2024-01-10', '2024-01-11')}
+
+
+def test_capacity_limits_concurrent_tasks():
+    tasks = [task(1, 2), task(2, 2), task(3, 2)]
+    dates, _ = schedule(tasks, {'capacity': 2})
+    assert [dates[i][0] for i in (1, 2, 3)] == ['2024-01-01', '2024-01-01', '2024-01-03']
+
+
+@pytest.mark.parametrize('overrides, starts', [
+    ({'2024-01-01': 1}, ['2024-01-01', '2024-01-02']),
+    ({'2024-01-01': 0}, ['2024-01-02', '2024-01-02']),
+    # Overrides on non-working days change nothing
+    ({'2024-01-06': 0}, ['2024-01-01', '2024-01-01']),
+])
+def test_capacity_overrides_apply_to_their_day(overrides, starts):
+    dates, _ = schedule([task(1), task(2)], {'capacity': 2, 'capacity_overrides': overrides})
+    assert [dates[1][0], dates[2][0]] == starts
+
+
+def test_hours_mode_packs_tasks_by_daily_hours():
+    constraints = {'mode': 'hours', 'capacity': 8, 'task_hours': 4}
+    dates, _ = schedule([task(1), task(2), task(3)], constraints)
+    assert [dates[i][0] for i in (1, 2, 3)] == ['2024-01-01', '2024-01-01', '2024-01-02']
+    dates, _ = schedule([task(1, hours_per_day=6), task(2)], constraints)
+    assert [dates[1][0], dates[2][0]] == ['2024-01-01', '2024-01-02']
+
+
+def test_high_priority_tasks_go_first_among_ready_tasks():
+    dates, _ = schedule([task(1, priority='low'), task(2, priority='high'), task(3)], {})
+    assert [dates[i][0] for i in (2, 3, 1)] == ['2024-01-01', '2024-01-02', '2024-01-03']
+
+
+def test_tasks_past_the_plan_end_are_reported_not_clamped():
+    dates, late = schedule([task(1, 3), task(2, 3, [1])], {}, end='2024-01-05')
+    assert dates[2] == ('2024-01-04', '2024-01-09')
+    assert late == [2]
+
+
+def test_calendar_maps_indexes_and_days_both_ways():
+    origin = _parse_day('2024-01-01')
+    holidays = [_parse_day('2024-01-03'), _parse_day('2024-12-25')]
+    calendar = WorkCalendar(origin, (5, 6), holidays)
+    working = [day for day in range(origin, origin + 400) if calendar.is_working(day)]
+    assert [calendar.ordinal_of(index) for index in range(len(working))] == working
+    assert [calendar.index_of(day) for day in working] == list(range(len(working)))
+
+
+@pytest.mark.parametrize('constraints', [
+    [], {'mode': 'people'}, {'capacity': 0}, {'capacity': 'two'}, {'weekends': list(range(7))},
+    {'holidays': ['25/12/2024']}, {'capacity_overrides': {'2024-01-01': -1}},
+])
+def test_invalid_constraints_are_rejected(constraints):
+    with pytest.raises(ValueError):
+        parse_constraints(constraints)
+
+
+def test_reschedule_endpoint_keeps_the_constraints_with_the_plan(backend, client, plan_id):
+    response = client.post(f'/api/plan/{plan_id}/schedule', json={'capacity': 1, 'holidays': ['2024-01-02']})
+    assert response.status_code == 200
+    plan_data = backend.db.get_plan(plan_id)['plan_data']
+    assert plan_data['schedule_constraints']['holidays'] == ['2024-01-02']
+    assert all(task['start_date'] != '2024-01-02' for task in plan_data['tasks'])
+    assert client.post(f'/api/plan/{plan_id}/schedule', json={'mode': 'people'}).status_code == 400
@@ -0,0 +1,87 @@
+import random
+
+from scheduler import IncrementalScheduler, schedule_tasks
+
+
+def task(task_id, dependencies=(), duration_days=2):
+    return {'id': task_id, 'description': f'Task {task_id}', 'duration_days': duration_days,
+            'dependencies': list(dependencies)}
+
+
+def by_id(tasks):
+    return {task['id']: task for task in tasks}
+
+
+def test_tasks_already_in_dependency_order_keep_their_order():
+    tasks = [task(1), task(2, [1]), task(3), task(4, [2, 3])]
+    scheduled = schedule_tasks(tasks, '2024-01-01', '2024-03-01')
+    assert [task['id'] for task in scheduled] == [1, 2, 3, 4]
+
+
+def test_tasks_start_after_their_dependencies_finish():
+    tasks = [task(4, [2, 3]), task(3, [1], 3), task(2, [1]), task(1)]
+    scheduled = by_id(schedule_tasks(tasks, '2024-01-01', '2024-03-01'))
+    assert scheduled[1]['start_date'] == '2024-01-01'
+    assert scheduled[2]['start_date'] == scheduled[3]['start_date'] == '2024-01-03'
+    # Task 4 waits for the later of its two predecessors
+    assert scheduled[4]['start_date'] == scheduled[3]['end_date'] == '2024-01-06'
+    for scheduled_task in scheduled.values():
+        for dep_id in scheduled_task['dependencies']:
+            assert scheduled[dep_id]['end_date'] <= scheduled_task['start_date']
+
+
+def test_cycles_are_broken_and_every_task_is_scheduled():
+    tasks = [task(1, [3]), task(2, [1]), task(3, [2]), task(4, [3])]
+    scheduled = by_id(schedule_tasks(tasks, '2024-01-01', '2024-03-01'))
+    assert sorted(scheduled) == [1, 2, 3, 4]
+    # The cycle is cut at its earliest task, the rest of the chain is kept
+    assert scheduled[1]['dependencies'] == []
+    assert scheduled[2]['dependencies'] == [1]
+    assert scheduled[3]['dependencies'] == [2]
+    assert scheduled[4]['start_date'] == scheduled[3]['end_date']
+
+
+def test_dangling_self_and_repeated_dependencies_are_dropped():
+    tasks = [task(1, [99]), task(2, [2, 1, 1])]
+    scheduled = by_id(schedule_tasks(tasks, '2024-01-01', '2024-03-01'))
+    assert scheduled[1]['dependencies'] == []
+    assert scheduled[1]['start_date'] == '2024-01-01'
+    assert scheduled[2]['dependencies'] == [1]
+
+
+def test_durations_are_clamped_to_the_plan_end():
+    tasks = [task(1, duration_days=10), task(2, [1], 10)]
+    scheduled = by_id(schedule_tasks(tasks, '2024-01-01', '2024-01-15'))
+    assert scheduled[2]['end_date'] == '2024-01-15'
+    assert scheduled[2]['duration_days'] == 4
+
+
+def schedule_fields(tasks):
+    return {task['id']: (task['duration_days'], task['start_date'], task['end_date']) for task in tasks}
+
+
+def test_incremental_edits_match_a_fresh_schedule_after_a_clamp():
+    requested = [task(1, duration_days=10), task(2, [1], 10), task(3, [2], 3)]
+    scheduler = IncrementalScheduler([dict(t) for t in requested], '2024-01-01', '2024-01-15')
+    # Task 2 is clamped to the plan end, and task 3 pushed past it
+    assert scheduler.task_dates(1)['duration_days'] == 4
+
+    changed = schedule_fields(scheduler.update_task(1, 2))
+    requested[0]['duration_days'] = 2
+    fresh = schedule_fields(schedule_tasks([dict(t) for t in requested], '2024-01-01', '2024-01-15'))
+    # Task 2 gets its requested ten days back once task 1 shrinks
+    assert changed[2] == fresh[2] == (10, '2024-01-03', '2024-01-13')
+    assert schedule_fields(scheduler.task_dates(position) for position in range(3)) == fresh
+
+
+def test_random_edits_match_a_fresh_schedule():
+    rng = random.Random(3)
+    requested = [task(i, rng.sample(range(1, i), min(i - 1, rng.randint(0, 2))), rng.randint(1, 8))
+                 for i in range(1, 41)]
+    scheduler = IncrementalScheduler([dict(t) for t in requested], '2024-01-01', '2024-03-01')
+    for _ in range(60):
+        target = rng.choice(requested)
+        target['duration_days'] = rng.randint(1, 30)
+        scheduler.update_task(target['id'], target['duration_days'])
+        fresh = schedule_fields(schedule_tasks([dict(t) for t in requested], '2024-01-01', '2024-03-01'))
+        assert schedule_fields(scheduler.task_dates(position) for position in range(len(requested))) == fresh
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+
+import pytest
+
+from single_flight import AsyncSingleFlight, SingleFlight
+
+
+def wait_for_followers(flight, followers, key='goal'):
+    """Block the leader until every other caller has joined its call"""
+    call = flight.calls[('generate', key)]
+    for _ in range(500):
+        if call.waiters == followers:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError('followers never joined')
+
+
+def run_concurrently(flight, callers, fn, key='goal'):
+    results = [None] * callers
+    errors = [None] * callers
+
+    def caller(index):
+        try:
+            results[index] = flight.do('generate', key, fn)
+        except Exception as e:
+            errors[index] = e
+
+    threads = [threading.Thread(target=caller, args=(index,)) for index in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, errors
+
+
+def test_identical_concurrent_calls_run_once():
+    flight = SingleFlight()
+    calls = []
+
+    def generate():
+        calls.append(1)
+        wait_for_followers(flight, 7)
+        return {'tasks': [{'id': 1}]}
+
+    results, errors = run_concurrently(flight, 8, generate)
+    assert len(calls) == 1
+    assert errors == [None] * 8
+    assert all(result == {'tasks': [{'id': 1}]} for result in results)
+    # Every caller gets its own copy to modify
+    assert len({id(result) for result in results}) == 8
+    assert flight.calls == {}
+
+
+def test_followers_get_the_leaders_exception():
+    flight = SingleFlight()
+    def fail():
+        wait_for_followers(flight, 3)
+        raise RuntimeError('model unavailable')
+
+    results, errors = run_concurrently(flight, 4, fail)
+    assert all(isinstance(error, RuntimeError) for error in errors)
+
+
+def test_different_keys_and_later_calls_are_not_coalesced():
+    flight = SingleFlight()
+    calls = []
+    assert flight.do('generate', 'a', lambda: calls.append('a') or 1) == 1
+    assert flight.do('generate', 'a', lambda: calls.append('a') or 2) == 2
+    assert flight.do('regenerate', 'a', lambda: calls.append('r') or 3) == 3
+    assert calls == ['a', 'a', 'r']
+
+
+def test_async_calls_are_coalesced_and_survive_a_cancelled_waiter():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def generate():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {'tasks': []}
+
+    async def main():
+        first = asyncio.ensure_future(flight.do('generate', 'goal', generate))
+        await asyncio.sleep(0)
+        others = [asyncio.ensure_future(flight.do('generate', 'goal', generate)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        # A client disconnecting cancels only its own wait
+        first.cancel()
+        results = await asyncio.gather(*others)
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return results
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert results == [{'tasks': []}] * 3
+    assert results[0] is not results[1]
+    assert flight.tasks == {}
@@ -0,0 +1,57 @@
+import pytest
+
+import token_budget
+
+MODEL = 'gpt-3.5-turbo'
+
+
+def test_truncate_cuts_at_a_word_boundary_within_budget():
+    text = ' '.join(f'word{i}' for i in range(500))
+    cut = token_budget.truncate(text, 50, MODEL)
+    assert cut.endswith(' …')
+    assert token_budget.count_tokens(cut, MODEL) <= 51
+    assert text.startswith(cut[:-2])
+    assert token_budget.truncate('short feedback', 50, MODEL) == 'short feedback'
+
+
+def test_long_history_keeps_recent_tasks_and_summarizes_the_rest():
+    tasks = [{'id': i, 'description': f'Finished practice session number {i} on scales and bowing',
+              'category': 'Practice' if i % 2 else 'Theory'} for i in range(1, 201)]
+    lines = token_budget.compact_history(tasks, 400, MODEL)
+    assert token_budget.count_tokens('\n'.join(lines), MODEL) <= 400
+    assert lines[0].startswith('Also completed ')
+    assert 'Practice' in lines[0] and 'Theory' in lines[0]
+    assert lines[-1] == f"Completed: {tasks[-1]['description']}"
+    # Every task is either listed or counted in the summary
+    assert int(lines[0].split()[2]) + len(lines) - 1 == len(tasks)
+
+
+def test_short_history_is_listed_verbatim():
+    tasks = [{'id': 1, 'description': 'Buy a violin'}, {'id': 2}]
+    assert token_budget.compact_history(tasks, 400, MODEL) == ['Completed: Buy a violin', 'Completed: 2']
+
+
+@pytest.mark.parametrize('model, window', [
+    ('gpt-4o-2024-08-06', 128000), ('gpt-4-0613', 8192), ('gpt-4-turbo-preview', 128000), ('unknown', 4096),
+])
+def test_context_window_matches_dated_snapshots(model, window):
+    assert token_budget.context_window(model) == window
+
+
+def test_completion_budget_scales_with_tasks_and_fits_the_window():
+    assert token_budget.completion_budget(8, 500, MODEL) == \
+        round((token_budget.REPLY_OVERHEAD_TOKENS + 8 * token_budget.TOKENS_PER_TASK) * token_budget.REPLY_HEADROOM)
+    assert token_budget.completion_budget(8, 500, MODEL) < token_budget.completion_budget(20, 500, MODEL)
+    assert token_budget.completion_budget(100, 3000, 'unknown') == 1096
+    assert token_budget.completion_budget(8, 4090, 'unknown') == token_budget.MIN_COMPLETION_TOKENS
+
+
+def test_regenerate_prompt_stays_within_budget_for_any_history(backend):
+    plan = backend.planner._create_fallback_plan('Learn to play the violin', '2024-01-01', '2024-06-01', 152)
+    completed = [{'id': i, 'description': 'Practiced the same long passage again ' * 5, 'category': 'Practice'}
+                 for i in range(1000)]
+    messages = backend.planner._regenerate_messages(plan, completed, 'Please slow down. ' * 500)
+    short = backend.planner._regenerate_messages(plan, completed[:1], 'Please slow down.')
+    overhead = token_budget.count_message_tokens(short, MODEL)
+    assert token_budget.count_message_tokens(messages, MODEL) <= \
+        overhead + token_budget.COMPLETED_HISTORY_TOKENS + token_budget.FEEDBACK_TOKENS
@@ -0,0 +1,138 @@
+"""Local token accounting for model calls.
+
+Prompts are measured before they are sent, so completed-task history and
+user feedback can be compacted to fixed budgets, and max_tokens is sized
+from the number of tasks requested instead of a flat ceiling. Counting
+uses tiktoken when it is installed and a close word-piece estimate
+otherwise. After each call the estimate and budgets are compared with the
+usage the API reports.
+"""
+import math
+import re
+from collections import Counter
+
+import metrics
+
+# Context windows of the models we use; unknown models get the smallest
+CONTEXT_WINDOWS = {
+    'gpt-3.5-turbo': 16385,
+    'gpt-4': 8192,
+    'gpt-4-turbo': 128000,
+    'gpt-4o': 128000,
+    'gpt-4o-mini': 128000,
+}
+DEFAULT_CONTEXT_WINDOW = 4096
+
+# A task object in the JSON reply is ~55 tokens; leave room for longer descriptions
+TOKENS_PER_TASK = 80
+REPLY_OVERHEAD_TOKENS = 60
+REPLY_HEADROOM = 1.3
+MIN_COMPLETION_TOKENS = 256
+
+COMPLETED_HISTORY_TOKENS = 400
+FEEDBACK_TOKENS = 200
+# Chat format framing per message and for the reply, as in OpenAI's counting guide
+TOKENS_PER_MESSAGE = 4
+REPLY_PRIMING_TOKENS = 3
+
+_PIECES = re.compile(r"\w+|[^\w\s]")
+_encodings = {}
+
+
+def _encoding(model):
+    if model not in _encodings:
+        try:
+            import tiktoken
+        except ImportError:
+            _encodings[model] = None
+        else:
+            try:
+                _encodings[model] = tiktoken.encoding_for_model(model)
+            except KeyError:
+                _encodings[model] = tiktoken.get_encoding('cl100k_base')
+    return _encodings[model]
+
+
+def count_tokens(text, model):
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text))
+    # BPE vocabularies cover common words whole and split long ones into ~4-character pieces
+    return sum(1 + (len(piece) - 1) // 4 for piece in _PIECES.findall(text))
+
+
+def count_message_tokens(messages, model):
+    return sum(TOKENS_PER_MESSAGE + count_tokens(message['content'], model) for message in messages) \
+        + REPLY_PRIMING_TOKENS
+
+
+def truncate(text, max_tokens, model):
+    """Cut text to about max_tokens, at a word boundary"""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    words = text.split()
+    low, high = 0, len(words)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(' '.join(words[:middle]), model) + 1 <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return ' '.join(words[:low]) + ' …'
+
+
+def compact_history(tasks, max_tokens, model):
+    """Completed-task lines for a prompt, within max_tokens.
+
+    The most recent tasks are listed verbatim; older ones collapse into a
+    per-category count line once the full list would not fit.
+    """
+    lines = [f"Completed: {task.get('description', task['id'])}" for task in tasks]
+    if count_tokens('\n'.join(lines), model) <= max_tokens:
+        return lines
+
+    summary_budget = max_tokens // 4
+    kept = []
+    used = 0
+    for line in reversed(lines):
+        cost = count_tokens(line, model) + 1
+        if used + cost > max_tokens - summary_budget:
+            break
+        kept.append(line)
+        used += cost
+    kept.reverse()
+
+    older = tasks[:len(tasks) - len(kept)]
+    categories = Counter(task.get('category') or 'Other' for task in older)
+    summary = f"Also completed {len(older)} earlier tasks: " + ', '.join(
+        f"{category} ({count})" for category, count in categories.most_common())
+    return [truncate(summary, summary_budget, model)] + kept
+
+
+def context_window(model):
+    """Context size for a model name, matching dated snapshots (gpt-4o-2024-08-06) by prefix"""
+    matches = [name for name in CONTEXT_WINDOWS if model.startswith(name)]
+    return CONTEXT_WINDOWS[max(matches, key=len)] if matches else DEFAULT_CONTEXT_WINDOW
+
+
+def completion_budget(max_tasks, prompt_tokens, model):
+    """max_tokens for a reply of up to max_tasks tasks, kept inside the context window"""
+    wanted = math.ceil((REPLY_OVERHEAD_TOKENS + max_tasks * TOKENS_PER_TASK) * REPLY_HEADROOM)
+    available = context_window(model) - prompt_tokens
+    return max(MIN_COMPLETION_TOKENS, min(wanted, available))
+
+
+def report(operation, prompt_estimate, max_tokens, usage=None, completion_tokens=None):
+    """Record and log a call's token use against its budgets.
+
+    completion_tokens is a local count for streamed replies, which carry no usage.
+    """
+    prompt_tokens = getattr(usage, 'prompt_tokens', None)
+    if usage is not None:
+        completion_tokens = getattr(usage, 'completion_tokens', None)
+    metrics.PROMPT_TOKENS_ESTIMATED.observe(prompt_estimate, operation=operation)
+    if completion_tokens is not None:
+        metrics.COMPLETION_BUDGET_USED.observe(completion_tokens / max_tokens, operation=operation)
+    print(f"🧮 {operation}: prompt ~{prompt_estimate} tokens"
+          f"{f' (API: {prompt_tokens})' if prompt_tokens is not None else ''}, "
+          f"completion {completion_tokens if completion_tokens is not None else '?'}/{max_tokens}")
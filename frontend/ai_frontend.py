@@ -1,7 +1,20 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 import requests
+from requests.adapters import HTTPAdapter
+from collections import deque
 from datetime import datetime, timedelta
+from werkzeug.http import parse_accept_header, quote_etag, unquote_etag
+import hashlib
 import json
+import os
+import re
+import sys
+import threading
+import time
+
+# Content-Encoding negotiation and ETag tagging are shared with the backend
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+import compression
 
 app = Flask(__name__)
 BACKEND_URL = "http://localhost:5000"
@@ -15,876 +28,8 @@ HTML_CONTENT = """
     <title>PlanIt AI - Intelligent Task Planner</title>
     <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&family=Plus+Jakarta+Sans:wght@400;500;600;700;800&display=swap" rel="stylesheet">
     <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css">
-    <style>
-        :root {
-            --primary: #7C3AED;
-            --primary-light: #8B5CF6;
-            --primary-dark: #6D28D9;
-            --secondary: #06D6A0;
-            --accent: #FF6B6B;
-            --warning: #FFD166;
-            --ai-color: #10B981;
-            --dark: #1E1B4B;
-            --light: #F8FAFC;
-            --gray: #64748B;
-            --gray-light: #E2E8F0;
-            --card-bg: #FFFFFF;
-            --sidebar-bg: #F1F5F9;
-            --gradient-primary: linear-gradient(135deg, #7C3AED 0%, #6366F1 100%);
-            --gradient-success: linear-gradient(135deg, #06D6A0 0%, #10B981 100%);
-            --gradient-warning: linear-gradient(135deg, #FFD166 0%, #F59E0B 100%);
-            --gradient-accent: linear-gradient(135deg, #FF6B6B 0%, #EF4444 100%);
-            --gradient-ai: linear-gradient(135deg, #10B981 0%, #059669 100%);
-            --shadow-sm: 0 1px 3px rgba(0, 0, 0, 0.1);
-            --shadow-md: 0 4px 6px rgba(0, 0, 0, 0.1);
-            --shadow-lg: 0 10px 25px rgba(0, 0, 0, 0.15);
-            --shadow-xl: 0 20px 40px rgba(0, 0, 0, 0.1);
-        }
-
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-
-        body {
-            font-family: 'Inter', sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            color: var(--dark);
-            line-height: 1.6;
-        }
-
-        .app-container {
-            max-width: 1400px;
-            margin: 0 auto;
-            padding: 20px;
-        }
-
-        /* Header */
-        .header {
-            text-align: center;
-            padding: 50px 40px;
-            background: var(--gradient-primary);
-            border-radius: 24px;
-            margin-bottom: 40px;
-            color: white;
-            box-shadow: var(--shadow-xl);
-            position: relative;
-            overflow: hidden;
-        }
-
-        .header::before {
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            bottom: 0;
-            background: url('data:image/svg+xml,<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 1000 100" fill="rgba(255,255,255,0.1)"><path d="M0,70 Q250,20 500,70 T1000,70 L1000,100 L0,100 Z"/></svg>');
-            background-size: cover;
-        }
-
-        .header-content {
-            position: relative;
-            z-index: 2;
-        }
-
-        .logo {
-            font-size: 3.5em;
-            font-weight: 800;
-            margin-bottom: 16px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            gap: 16px;
-            font-family: 'Plus Jakarta Sans', sans-serif;
-        }
-
-        .ai-badge {
-            background: var(--gradient-ai);
-            padding: 4px 12px;
-            border-radius: 20px;
-            font-size: 0.4em;
-            font-weight: 600;
-            vertical-align: super;
-        }
-
-        .tagline {
-            font-size: 1.4em;
-            opacity: 0.95;
-            margin-bottom: 8px;
-            font-weight: 500;
-        }
-
-        .subtagline {
-            opacity: 0.8;
-            font-size: 1.1em;
-            max-width: 600px;
-            margin: 0 auto;
-        }
-
-        /* Main Grid */
-        .main-grid {
-            display: grid;
-            grid-template-columns: 1fr 380px;
-            gap: 30px;
-            align-items: start;
-        }
-
-        /* Input Section */
-        .input-section {
-            background: var(--card-bg);
-            padding: 40px;
-            border-radius: 20px;
-            box-shadow: var(--shadow-xl);
-            margin-bottom: 30px;
-            border: 1px solid rgba(255, 255, 255, 0.2);
-            backdrop-filter: blur(10px);
-        }
-
-        .input-group {
-            margin-bottom: 30px;
-        }
-
-        .input-label {
-            display: block;
-            margin-bottom: 12px;
-            font-weight: 600;
-            color: var(--dark);
-            font-size: 1.1em;
-            display: flex;
-            align-items: center;
-            gap: 10px;
-        }
-
-        .input-label i {
-            color: var(--primary);
-        }
-
-        .goal-input {
-            width: 100%;
-            padding: 20px;
-            border: 2px solid var(--gray-light);
-            border-radius: 16px;
-            font-size: 16px;
-            font-family: inherit;
-            resize: vertical;
-            min-height: 140px;
-            background: var(--light);
-            transition: all 0.3s ease;
-            line-height: 1.5;
-        }
-
-        .goal-input:focus {
-            outline: none;
-            border-color: var(--primary);
-            box-shadow: 0 0 0 3px rgba(124, 58, 237, 0.1);
-            background: white;
-            transform: translateY(-2px);
-        }
-
-        .timeline-inputs {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 20px;
-        }
-
-        .text-input {
-            width: 100%;
-            padding: 16px 20px;
-            border: 2px solid var(--gray-light);
-            border-radius: 12px;
-            font-size: 16px;
-            background: var(--light);
-            transition: all 0.3s ease;
-            font-family: inherit;
-        }
-
-        .text-input:focus {
-            outline: none;
-            border-color: var(--primary);
-            box-shadow: 0 0 0 3px rgba(124, 58, 237, 0.1);
-            background: white;
-            transform: translateY(-2px);
-        }
-
-        .action-buttons {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 15px;
-            margin-top: 25px;
-        }
-
-        .btn {
-            padding: 18px 24px;
-            border: none;
-            border-radius: 14px;
-            font-size: 1em;
-            font-weight: 600;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            gap: 12px;
-            font-family: inherit;
-            position: relative;
-            overflow: hidden;
-        }
-
-        .btn::before {
-            content: '';
-            position: absolute;
-            top: 0;
-            left: -100%;
-            width: 100%;
-            height: 100%;
-            background: linear-gradient(90deg, transparent, rgba(255,255,255,0.2), transparent);
-            transition: left 0.5s;
-        }
-
-        .btn:hover::before {
-            left: 100%;
-        }
-
-        .btn-primary {
-            background: var(--gradient-primary);
-            color: white;
-            box-shadow: var(--shadow-md);
-        }
-
-        .btn-ai {
-            background: var(--gradient-ai);
-            color: white;
-            box-shadow: var(--shadow-md);
-        }
-
-        .btn-secondary {
-            background: var(--light);
-            color: var(--dark);
-            border: 2px solid var(--gray-light);
-            box-shadow: var(--shadow-sm);
-        }
-
-        .btn-warning {
-            background: var(--gradient-warning);
-            color: var(--dark);
-            box-shadow: var(--shadow-md);
-        }
-
-        .btn-success {
-            background: var(--gradient-success);
-            color: white;
-            box-shadow: var(--shadow-md);
-        }
-
-        .btn:hover {
-            transform: translateY(-3px);
-            box-shadow: var(--shadow-lg);
-        }
-
-        .btn:active {
-            transform: translateY(-1px);
-        }
-
-        .btn:disabled {
-            opacity: 0.6;
-            cursor: not-allowed;
-            transform: none;
-        }
-
-        /* AI Features */
-        .ai-features {
-            background: rgba(16, 185, 129, 0.1);
-            border: 1px solid rgba(16, 185, 129, 0.2);
-            border-radius: 12px;
-            padding: 20px;
-            margin-top: 20px;
-        }
-
-        .ai-features h4 {
-            color: var(--ai-color);
-            margin-bottom: 10px;
-            display: flex;
-            align-items: center;
-            gap: 8px;
-        }
-
-        .ai-features ul {
-            list-style: none;
-            color: var(--gray);
-        }
-
-        .ai-features li {
-            margin-bottom: 8px;
-            display: flex;
-            align-items: center;
-            gap: 8px;
-        }
-
-        .ai-features li:before {
-            content: '🤖';
-            font-size: 0.9em;
-        }
-
-        /* Domain Examples */
-        .domain-examples {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
-            gap: 15px;
-            margin-top: 30px;
-        }
-
-        .domain-btn {
-            background: white;
-            border: 2px solid var(--gray-light);
-            padding: 18px 15px;
-            border-radius: 14px;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            text-align: center;
-            font-size: 0.9em;
-            font-weight: 500;
-            color: var(--dark);
-            box-shadow: var(--shadow-sm);
-        }
-
-        .domain-btn:hover {
-            border-color: var(--primary);
-            transform: translateY(-3px);
-            box-shadow: var(--shadow-md);
-            color: var(--primary);
-        }
-
-        .domain-btn i {
-            font-size: 1.4em;
-            margin-bottom: 8px;
-            display: block;
-            color: var(--primary);
-        }
-
-        /* AI Regeneration Modal */
-        .modal {
-            display: none;
-            position: fixed;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            background: rgba(0, 0, 0, 0.5);
-            backdrop-filter: blur(5px);
-            z-index: 1000;
-            align-items: center;
-            justify-content: center;
-            animation: fadeIn 0.3s ease;
-        }
-
-        @keyframes fadeIn {
-            from { opacity: 0; }
-            to { opacity: 1; }
-        }
-
-        .modal-content {
-            background: white;
-            padding: 40px;
-            border-radius: 20px;
-            box-shadow: var(--shadow-xl);
-            max-width: 500px;
-            width: 90%;
-            max-height: 90vh;
-            overflow-y: auto;
-            animation: slideUp 0.3s ease;
-        }
-
-        @keyframes slideUp {
-            from { 
-                opacity: 0;
-                transform: translateY(30px);
-            }
-            to { 
-                opacity: 1;
-                transform: translateY(0);
-            }
-        }
-
-        .modal-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 25px;
-        }
-
-        .modal-title {
-            font-size: 1.5em;
-            font-weight: 700;
-            color: var(--dark);
-        }
-
-        .close-btn {
-            background: none;
-            border: none;
-            font-size: 1.5em;
-            cursor: pointer;
-            color: var(--gray);
-            transition: color 0.3s ease;
-        }
-
-        .close-btn:hover {
-            color: var(--dark);
-        }
-
-        /* Results Section */
-        .results-section {
-            display: none;
-            animation: fadeInUp 0.6s ease;
-        }
-
-        @keyframes fadeInUp {
-            from {
-                opacity: 0;
-                transform: translateY(30px);
-            }
-            to {
-                opacity: 1;
-                transform: translateY(0);
-            }
-        }
-
-        .plan-header {
-            background: white;
-            padding: 35px;
-            border-radius: 20px;
-            box-shadow: var(--shadow-xl);
-            margin-bottom: 30px;
-            border-left: 5px solid var(--primary);
-            position: relative;
-            overflow: hidden;
-        }
-
-        .plan-header::before {
-            content: '';
-            position: absolute;
-            top: 0;
-            right: 0;
-            width: 200px;
-            height: 200px;
-            background: var(--gradient-primary);
-            opacity: 0.05;
-            border-radius: 50%;
-            transform: translate(100px, -100px);
-        }
-
-        .ai-indicator {
-            background: var(--gradient-ai);
-            color: white;
-            padding: 8px 16px;
-            border-radius: 20px;
-            font-size: 0.8em;
-            font-weight: 600;
-            display: inline-flex;
-            align-items: center;
-            gap: 6px;
-            margin-bottom: 15px;
-        }
-
-        .plan-title {
-            font-size: 2em;
-            font-weight: 700;
-            margin-bottom: 20px;
-            color: var(--dark);
-            line-height: 1.3;
-        }
-
-        .plan-meta {
-            display: flex;
-            gap: 20px;
-            flex-wrap: wrap;
-        }
-
-        .meta-item {
-            display: flex;
-            align-items: center;
-            gap: 10px;
-            padding: 10px 18px;
-            background: var(--light);
-            border-radius: 20px;
-            font-size: 0.9em;
-            font-weight: 500;
-            color: var(--dark);
-            border: 1px solid var(--gray-light);
-        }
-
-        .meta-item i {
-            color: var(--primary);
-        }
-
-        /* Tasks Grid */
-        .tasks-grid {
-            display: grid;
-            gap: 20px;
-        }
-
-        .task-card {
-            background: white;
-            padding: 30px;
-            border-radius: 18px;
-            box-shadow: var(--shadow-lg);
-            border-left: 5px solid var(--primary);
-            transition: all 0.3s ease;
-            position: relative;
-            overflow: hidden;
-        }
-
-        .task-card::before {
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            height: 4px;
-            background: var(--gradient-primary);
-            transform: scaleX(0);
-            transition: transform 0.3s ease;
-        }
-
-        .task-card:hover::before {
-            transform: scaleX(1);
-        }
-
-        .task-card:hover {
-            transform: translateY(-5px);
-            box-shadow: var(--shadow-xl);
-        }
-
-        .task-card.completed {
-            opacity: 0.9;
-            border-left-color: var(--secondary);
-            background: linear-gradient(135deg, #FFFFFF 0%, #F0FDF4 100%);
-        }
-
-        .task-card.overdue {
-            border-left-color: var(--accent);
-            background: linear-gradient(135deg, #FFFFFF 0%, #FEF2F2 100%);
-        }
-
-        .task-card.regenerated {
-            border-left-color: var(--ai-color);
-            background: linear-gradient(135deg, #FFFFFF 0%, #F0FDF9 100%);
-        }
-
-        .task-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: flex-start;
-            margin-bottom: 20px;
-            gap: 20px;
-        }
-
-        .task-content {
-            flex: 1;
-        }
-
-        .task-description {
-            font-size: 1.2em;
-            font-weight: 600;
-            margin-bottom: 15px;
-            line-height: 1.4;
-            color: var(--dark);
-        }
-
-        .task-meta {
-            display: flex;
-            gap: 12px;
-            flex-wrap: wrap;
-            margin-bottom: 15px;
-        }
-
-        .task-tag {
-            padding: 8px 16px;
-            border-radius: 20px;
-            font-size: 0.85em;
-            font-weight: 600;
-            display: flex;
-            align-items: center;
-            gap: 6px;
-        }
-
-        .tag-priority {
-            background: rgba(124, 58, 237, 0.1);
-            color: var(--primary-dark);
-            border: 1px solid rgba(124, 58, 237, 0.2);
-        }
-
-        .tag-category {
-            background: rgba(6, 214, 160, 0.1);
-            color: #059669;
-            border: 1px solid rgba(6, 214, 160, 0.2);
-        }
-
-        .tag-duration {
-            background: rgba(255, 107, 107, 0.1);
-            color: #DC2626;
-            border: 1px solid rgba(255, 107, 107, 0.2);
-        }
-
-        .tag-ai {
-            background: rgba(16, 185, 129, 0.1);
-            color: var(--ai-color);
-            border: 1px solid rgba(16, 185, 129, 0.2);
-        }
-
-        .task-dates {
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 15px;
-            margin-top: 20px;
-            padding-top: 20px;
-            border-top: 1px solid var(--gray-light);
-        }
-
-        .date-item {
-            display: flex;
-            align-items: center;
-            gap: 10px;
-            font-size: 0.9em;
-            color: var(--gray);
-            font-weight: 500;
-        }
-
-        .date-item i {
-            color: var(--primary);
-        }
-
-        .task-actions {
-            display: flex;
-            gap: 10px;
-            flex-shrink: 0;
-        }
-
-        .action-btn {
-            padding: 10px 18px;
-            border: none;
-            border-radius: 10px;
-            cursor: pointer;
-            font-size: 0.85em;
-            font-weight: 600;
-            transition: all 0.3s ease;
-            display: flex;
-            align-items: center;
-            gap: 6px;
-        }
-
-        .btn-complete {
-            background: var(--gradient-success);
-            color: white;
-            box-shadow: var(--shadow-sm);
-        }
-
-        .btn-edit {
-            background: var(--light);
-            color: var(--gray);
-            border: 1px solid var(--gray-light);
-            box-shadow: var(--shadow-sm);
-        }
-
-        .btn-delete {
-            background: var(--gradient-accent);
-            color: white;
-            box-shadow: var(--shadow-sm);
-        }
-
-        .action-btn:hover {
-            transform: translateY(-2px);
-            box-shadow: var(--shadow-md);
-        }
-
-        /* Sidebar */
-        .sidebar {
-            background: white;
-            padding: 30px;
-            border-radius: 20px;
-            box-shadow: var(--shadow-xl);
-            position: sticky;
-            top: 20px;
-            border: 1px solid rgba(255, 255, 255, 0.2);
-        }
-
-        .sidebar-section {
-            margin-bottom: 35px;
-        }
-
-        .sidebar-title {
-            font-size: 1.3em;
-            font-weight: 700;
-            margin-bottom: 20px;
-            color: var(--dark);
-            display: flex;
-            align-items: center;
-            gap: 12px;
-            padding-bottom: 15px;
-            border-bottom: 2px solid var(--gray-light);
-        }
-
-        .sidebar-title i {
-            color: var(--primary);
-        }
-
-        .stats-grid {
-            display: grid;
-            gap: 15px;
-        }
-
-        .stat-item {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 18px;
-            background: var(--light);
-            border-radius: 14px;
-            border: 1px solid var(--gray-light);
-            transition: all 0.3s ease;
-        }
-
-        .stat-item:hover {
-            transform: translateY(-2px);
-            box-shadow: var(--shadow-md);
-        }
-
-        .stat-value {
-            font-weight: 700;
-            font-size: 1.4em;
-            color: var(--primary);
-        }
-
-        .progress-ring {
-            width: 70px;
-            height: 70px;
-        }
-
-        .progress-bg {
-            fill: none;
-            stroke: var(--gray-light);
-            stroke-width: 3;
-        }
-
-        .progress-fill {
-            fill: none;
-            stroke: var(--secondary);
-            stroke-width: 3;
-            stroke-linecap: round;
-            transform: rotate(-90deg);
-            transform-origin: 50% 50%;
-            transition: stroke-dashoffset 0.5s ease;
-        }
-
-        /* Loading State */
-        .loading {
-            display: none;
-            text-align: center;
-            padding: 80px 20px;
-            background: white;
-            border-radius: 20px;
-            box-shadow: var(--shadow-xl);
-        }
-
-        .spinner {
-            width: 60px;
-            height: 60px;
-            border: 4px solid var(--gray-light);
-            border-left: 4px solid var(--primary);
-            border-radius: 50%;
-            animation: spin 1s linear infinite;
-            margin: 0 auto 25px;
-        }
-
-        .ai-spinner {
-            border-left: 4px solid var(--ai-color);
-        }
-
-        @keyframes spin {
-            0% { transform: rotate(0deg); }
-            100% { transform: rotate(360deg); }
-        }
-
-        .loading h3 {
-            font-size: 1.4em;
-            margin-bottom: 10px;
-            color: var(--dark);
-        }
-
-        .loading p {
-            color: var(--gray);
-            font-size: 1.1em;
-        }
-
-        /* Responsive */
-        @media (max-width: 1024px) {
-            .main-grid {
-                grid-template-columns: 1fr;
-            }
-            
-            .sidebar {
-                position: static;
-            }
-        }
-
-        @media (max-width: 768px) {
-            .app-container {
-                padding: 15px;
-            }
-            
-            .header {
-                padding: 40px 25px;
-            }
-            
-            .logo {
-                font-size: 2.8em;
-            }
-            
-            .input-section {
-                padding: 30px;
-            }
-            
-            .timeline-inputs {
-                grid-template-columns: 1fr;
-            }
-            
-            .action-buttons {
-                grid-template-columns: 1fr;
-            }
-            
-            .domain-examples {
-                grid-template-columns: repeat(2, 1fr);
-            }
-            
-            .task-header {
-                flex-direction: column;
-                align-items: flex-start;
-            }
-            
-            .task-actions {
-                align-self: flex-end;
-                width: 100%;
-                justify-content: flex-end;
-            }
-            
-            .plan-meta {
-                flex-direction: column;
-                gap: 10px;
-            }
-        }
-
-        @media (max-width: 480px) {
-            .domain-examples {
-                grid-template-columns: 1fr;
-            }
-            
-            .task-dates {
-                grid-template-columns: 1fr;
-            }
-        }
-    </style>
+    <link rel="stylesheet" href="/assets/app.css">
+    <script src="/assets/app.js" defer></script>
 </head>
 <body>
     <div class="app-container">
@@ -1118,442 +263,205 @@ HTML_CONTENT = """
             </button>
         </div>
     </div>
+</body>
+</html>
+"""
 
-    <script>
-        let currentPlanId = null;
-        let completedTasks = new Set();
-
-        // Set default dates
-        document.getElementById('startDate').valueAsDate = new Date();
-        let endDate = new Date();
-        endDate.setDate(endDate.getDate() + 30); // Default 1 month
-        document.getElementById('endDate').valueAsDate = endDate;
-
-        // Example templates
-        const examples = {
-            learning: "Learn Spanish for my trip to Spain in 3 months. I want to be able to have basic conversations, order food, and ask for directions. I have no prior experience with Spanish.",
-            project: "Build a mobile app for task management using React Native. The app should include task creation, categories, due dates, notifications, and data synchronization across devices.",
-            fitness: "Get fit and lose 10kg in 3 months. I want to build a sustainable workout routine and healthy eating habits. I currently exercise occasionally but want to be more consistent.",
-            business: "Start an online business selling handmade leather goods. I need to create products, build an e-commerce website, develop marketing strategy, and handle shipping logistics."
-        };
-
-        function loadExample(type) {
-            document.getElementById('goalInput').value = examples[type];
-        }
-
-        async function generateAIPlan() {
-            const goal = document.getElementById('goalInput').value.trim();
-            const startDate = document.getElementById('startDate').value;
-            const endDate = document.getElementById('endDate').value;
-
-            if (!goal) {
-                alert('Please describe your goal for AI to generate a plan.');
-                return;
-            }
-
-            if (!startDate || !endDate) {
-                alert('Please set both start and end dates.');
-                return;
-            }
-
-            // Validate dates
-            const start = new Date(startDate);
-            const end = new Date(endDate);
-            if (end <= start) {
-                alert('End date must be after start date.');
-                return;
-            }
-
-            // Show AI loading state
-            document.getElementById('loadingState').style.display = 'block';
-            document.getElementById('resultsSection').style.display = 'none';
-            document.getElementById('generateBtn').disabled = true;
-
-            try {
-                const response = await fetch('/api/generate-plan', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify({
-                        goal: goal,
-                        start_date: startDate,
-                        end_date: endDate
-                    })
-                });
-
-                const data = await response.json();
-
-                if (response.ok) {
-                    currentPlanId = data.plan_id;
-                    completedTasks.clear();
-                    displayPlan(data.plan);
-                    showAIToast('AI plan generated successfully!');
-                } else {
-                    throw new Error(data.error || 'AI failed to generate plan');
-                }
-            } catch (error) {
-                alert('Error generating AI plan: ' + error.message);
-                console.error('Error:', error);
-            } finally {
-                document.getElementById('loadingState').style.display = 'none';
-                document.getElementById('generateBtn').disabled = false;
-            }
-        }
-
-        function displayPlan(plan) {
-            const resultsSection = document.getElementById('resultsSection');
-            
-            // Clear previous content
-            resultsSection.innerHTML = '';
-            
-            // Create plan header
-            const planHeader = document.createElement('div');
-            planHeader.className = 'plan-header';
-            
-            let aiIndicator = '';
-            if (plan.ai_generated) {
-                aiIndicator = `<div class="ai-indicator">
-                    <i class="fas fa-robot"></i>
-                    AI-Generated Plan • ${plan.domain}
-                </div>`;
-            }
-            
-            planHeader.innerHTML = `
-                ${aiIndicator}
-                <h2 class="plan-title">${plan.goal}</h2>
-                <div class="plan-meta">
-                    <div class="meta-item">
-                        <i class="fas fa-play-circle"></i>
-                        Start: ${formatDate(plan.start_date)}
-                    </div>
-                    <div class="meta-item">
-                        <i class="fas fa-flag-checkered"></i>
-                        End: ${formatDate(plan.end_date)}
-                    </div>
-                    <div class="meta-item">
-                        <i class="fas fa-tasks"></i>
-                        ${plan.total_tasks} tasks
-                    </div>
-                    <div class="meta-item">
-                        <i class="fas fa-calendar"></i>
-                        ${plan.total_days} days total
-                    </div>
-                </div>
-            `;
-            
-            // Create tasks container
-            const tasksContainer = document.createElement('div');
-            tasksContainer.className = 'tasks-grid';
-            tasksContainer.id = 'tasksContainer';
-            
-            // Add tasks
-            plan.tasks.forEach((task) => {
-                const taskCard = document.createElement('div');
-                taskCard.className = `task-card ${task.regenerated ? 'regenerated' : ''}`;
-                taskCard.id = `task-${task.id}`;
-                
-                let aiTag = '';
-                if (plan.ai_generated) {
-                    aiTag = `<span class="task-tag tag-ai">
-                        <i class="fas fa-brain"></i>
-                        AI Suggested
-                    </span>`;
-                }
-                
-                taskCard.innerHTML = `
-                    <div class="task-header">
-                        <div class="task-content">
-                            <div class="task-description">${task.description}</div>
-                            <div class="task-meta">
-                                <span class="task-tag tag-priority">
-                                    <i class="fas fa-flag"></i>
-                                    ${task.priority}
-                                </span>
-                                <span class="task-tag tag-category">
-                                    <i class="fas fa-tag"></i>
-                                    ${task.category}
-                                </span>
-                                <span class="task-tag tag-duration">
-                                    <i class="fas fa-clock"></i>
-                                    ${task.duration_days} day${task.duration_days > 1 ? 's' : ''}
-                                </span>
-                                ${aiTag}
-                            </div>
-                            <div class="task-dates">
-                                <div class="date-item">
-                                    <i class="fas fa-play-circle"></i>
-                                    Start: ${formatDate(task.start_date)}
-                                </div>
-                                <div class="date-item">
-                                    <i class="fas fa-stop-circle"></i>
-                                    Due: ${formatDate(task.end_date)}
-                                </div>
-                            </div>
-                            ${task.dependencies && task.dependencies.length > 0 ? `
-                            <div style="margin-top: 15px; font-size: 0.85em; color: var(--gray); background: var(--light); padding: 10px 15px; border-radius: 10px; border-left: 3px solid var(--primary);">
-                                <i class="fas fa-link"></i>
-                                <strong>Prerequisites:</strong> Complete ${task.dependencies.map(dep => `Task ${dep}`).join(', ')} first
-                            </div>
-                            ` : ''}
-                        </div>
-                        <div class="task-actions">
-                            <button class="action-btn btn-complete" onclick="toggleTaskComplete(${task.id})">
-                                <i class="fas fa-check"></i>
-                                Complete
-                            </button>
-                        </div>
-                    </div>
-                `;
-                tasksContainer.appendChild(taskCard);
-            });
-            
-            // Assemble results section
-            resultsSection.appendChild(planHeader);
-            resultsSection.appendChild(tasksContainer);
-            
-            // Show results
-            resultsSection.style.display = 'block';
-            updateProgress();
-        }
-
-        function formatDate(dateString) {
-            const date = new Date(dateString);
-            return date.toLocaleDateString('en-US', { 
-                year: 'numeric', 
-                month: 'short', 
-                day: 'numeric' 
-            });
-        }
-
-        async function toggleTaskComplete(taskId) {
-            const taskCard = document.getElementById(`task-${taskId}`);
-            
-            if (completedTasks.has(taskId)) {
-                completedTasks.delete(taskId);
-                taskCard.classList.remove('completed');
-            } else {
-                completedTasks.add(taskId);
-                taskCard.classList.add('completed');
-            }
-            
-            // Update progress in backend
-            if (currentPlanId) {
-                try {
-                    await fetch('/api/update-progress', {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json',
-                        },
-                        body: JSON.stringify({
-                            plan_id: currentPlanId,
-                            completed_tasks: Array.from(completedTasks).map(id => ({ id }))
-                        })
-                    });
-                } catch (error) {
-                    console.error('Error updating progress:', error);
-                }
-            }
-            
-            updateProgress();
-        }
-
-        function updateProgress() {
-            const totalTasks = document.querySelectorAll('.task-card').length;
-            const completedCount = completedTasks.size;
-            const progress = totalTasks > 0 ? Math.round((completedCount / totalTasks) * 100) : 0;
-            
-            document.getElementById('totalTasks').textContent = totalTasks;
-            document.getElementById('completedTasks').textContent = completedCount;
-            document.getElementById('remainingTasks').textContent = totalTasks - completedCount;
+# Per-route (connect, read) timeouts for calls to the AI backend
+BACKEND_TIMEOUTS = {
+    'generate-plan': (3.05, 60),  # Longer timeout for AI processing
+    'generate-plan/stream': (3.05, 60),  # Applies between streamed events
+    'regenerate-ai': (3.05, 60),
+    'add-custom-task': (3.05, 30),
+    'update-progress': (3.05, 10),
+    'plan': (3.05, 10),
+}
+BACKEND_POOL_SIZE = 32
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+BUNDLES = {'app.css': 'text/css; charset=utf-8', 'app.js': 'text/javascript; charset=utf-8'}
+# A hashed bundle name always means the same bytes, so it may be cached for good
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+class RetryBudget:
+    """Allows retries only up to a fraction of recent traffic, so retries can't pile onto an outage"""
+
+    def __init__(self, ratio=0.2, initial=3, cap=10):
+        self.ratio = ratio
+        self.tokens = initial
+        self.cap = cap
+        self.lock = threading.Lock()
+
+    def deposit(self):
+        with self.lock:
+            self.tokens = min(self.cap, self.tokens + self.ratio)
+
+    def withdraw(self):
+        with self.lock:
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class ProxyMetrics:
+    """Latency of the proxy hop to the backend, per route, over a sliding window"""
+
+    def __init__(self, window=1000):
+        self.window = window
+        self.lock = threading.Lock()
+        self.routes = {}
+
+    def observe(self, route, seconds, ok=True, retried=False):
+        with self.lock:
+            stats = self.routes.get(route)
+            if stats is None:
+                stats = self.routes[route] = {'samples': deque(maxlen=self.window), 'requests': 0, 'errors': 0, 'retries': 0}
+            stats['samples'].append(seconds)
+            stats['requests'] += 1
+            stats['errors'] += 0 if ok else 1
+            stats['retries'] += 1 if retried else 0
+
+    def snapshot(self):
+        with self.lock:
+            routes = {route: dict(stats, samples=sorted(stats['samples'])) for route, stats in self.routes.items()}
+        
+        report = {}
+        for route, stats in routes.items():
+            samples = stats.pop('samples')
+            def percentile(p):
+                return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 2) if samples else None
+            report[route] = dict(stats, p50_ms=percentile(0.50), p95_ms=percentile(0.95), p99_ms=percentile(0.99))
+        return report
+
+
+class BackendClient:
+    """Keep-alive connection pool to the AI backend with a retry budget for idempotent calls"""
+
+    RETRY_STATUSES = (502, 503, 504)
+
+    def __init__(self, base_url, pool_size=BACKEND_POOL_SIZE, max_retries=2, backoff=0.1):
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.budget = RetryBudget()
+        self.metrics = ProxyMetrics()
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def post(self, route, idempotent=False, **kwargs):
+        """POST to /api/<route> on the backend; only idempotent calls are ever retried"""
+        return self.request('post', route, route, idempotent, **kwargs)
+
+    def get(self, route, timeout_key, **kwargs):
+        """GET /api/<route>, always retryable; timeout_key names the route for timeouts and metrics"""
+        return self.request('get', route, timeout_key, True, **kwargs)
+
+    def request(self, method, route, timeout_key, idempotent, **kwargs):
+        self.budget.deposit()
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            error = None
+            response = None
+            try:
+                response = self.session.request(method, f"{self.base_url}/api/{route}",
+                                                timeout=BACKEND_TIMEOUTS[timeout_key], **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+            elapsed = time.perf_counter() - started
             
-            // Update progress ring
-            const circumference = 2 * Math.PI * 15.9155;
-            const offset = circumference - (progress / 100) * circumference;
-            document.getElementById('progressFill').style.strokeDasharray = `${circumference} ${circumference}`;
-            document.getElementById('progressFill').style.strokeDashoffset = offset;
-        }
-
-        function openAIRegenerationModal() {
-            if (!currentPlanId) {
-                alert('Please generate a plan first.');
-                return;
-            }
-
-            document.getElementById('aiRegenerationModal').style.display = 'flex';
-        }
-
-        function closeAIRegenerationModal() {
-            document.getElementById('aiRegenerationModal').style.display = 'none';
-            document.getElementById('aiFeedback').value = '';
-        }
-
-        async function regenerateWithAI() {
-            const feedback = document.getElementById('aiFeedback').value.trim();
-
-            // Show AI loading
-            document.getElementById('loadingState').style.display = 'block';
-            closeAIRegenerationModal();
-
-            try {
-                const response = await fetch('/api/regenerate-ai', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify({
-                        plan_id: currentPlanId,
-                        completed_tasks: Array.from(completedTasks).map(id => ({ id })),
-                        feedback: feedback
-                    })
-                });
-
-                const data = await response.json();
-
-                if (response.ok) {
-                    currentPlanId = data.new_plan_id;
-                    displayPlan(data.plan);
-                    showAIToast('Plan regenerated with AI intelligence!');
-                } else {
-                    throw new Error(data.error || 'AI regeneration failed');
-                }
-            } catch (error) {
-                alert('Error regenerating with AI: ' + error.message);
-                console.error('Error:', error);
-            } finally {
-                document.getElementById('loadingState').style.display = 'none';
-            }
-        }
-
-        function showAIToast(message) {
-            // Create toast notification
-            const toast = document.createElement('div');
-            toast.style.cssText = `
-                position: fixed;
-                top: 20px;
-                right: 20px;
-                background: var(--gradient-ai);
-                color: white;
-                padding: 15px 20px;
-                border-radius: 10px;
-                box-shadow: var(--shadow-lg);
-                z-index: 1001;
-                display: flex;
-                align-items: center;
-                gap: 10px;
-                font-weight: 600;
-            `;
-            toast.innerHTML = `<i class="fas fa-robot"></i> ${message}`;
-            document.body.appendChild(toast);
-
-            setTimeout(() => {
-                toast.remove();
-            }, 3000);
-        }
-
-        function openCustomTaskModal() {
-            if (!currentPlanId) {
-                alert('Please generate a plan first.');
-                return;
-            }
-
-            const dependenciesSelect = document.getElementById('customTaskDependencies');
-            dependenciesSelect.innerHTML = '';
+            failed = error is not None or response.status_code in self.RETRY_STATUSES
+            if failed and idempotent and attempt < self.max_retries and self.budget.withdraw():
+                self.metrics.observe(timeout_key, elapsed, ok=False, retried=True)
+                if response is not None:
+                    response.close()
+                attempt += 1
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+                continue
             
-            // Populate with existing tasks
-            document.querySelectorAll('.task-card').forEach(taskCard => {
-                const taskId = taskCard.id.replace('task-', '');
-                const taskDescription = taskCard.querySelector('.task-description').textContent;
-                const option = document.createElement('option');
-                option.value = taskId;
-                option.textContent = `Task ${taskId}: ${taskDescription.substring(0, 40)}${taskDescription.length > 40 ? '...' : ''}`;
-                dependenciesSelect.appendChild(option);
-            });
-
-            document.getElementById('customTaskModal').style.display = 'flex';
-        }
-
-        function closeCustomTaskModal() {
-            document.getElementById('customTaskModal').style.display = 'none';
-            document.getElementById('customTaskDescription').value = '';
-            document.getElementById('customTaskDuration').value = '2';
-        }
-
-        async function addCustomTask() {
-            const description = document.getElementById('customTaskDescription').value.trim();
-            const duration = parseInt(document.getElementById('customTaskDuration').value);
-            const dependencies = Array.from(document.getElementById('customTaskDependencies').selectedOptions)
-                .map(option => parseInt(option.value));
-
-            if (!description) {
-                alert('Please enter a task description.');
-                return;
-            }
-
-            if (duration < 1 || duration > 14) {
-                alert('Duration should be between 1 and 14 days.');
-                return;
-            }
-
-            try {
-                const response = await fetch('/api/add-custom-task', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                    },
-                    body: JSON.stringify({
-                        plan_id: currentPlanId,
-                        task_description: description,
-                        duration_days: duration,
-                        dependencies: dependencies
-                    })
-                });
+            self.metrics.observe(timeout_key, elapsed, ok=not failed)
+            if error is not None:
+                raise error
+            return response
+
+
+class StaticAssets:
+    """In-memory static files with a content-hash ETag and precompressed variants.
+
+    Everything is compressed once, at startup, at the highest levels, since
+    each result is reused for every request. A 304 carries the tag that
+    matched, as the backend's plan responses do. Bundles are served under
+    content-hashed names (app.css -> app.<hash>.css).
+    """
+
+    def __init__(self):
+        self.bundles = {}
+
+    def build(self, body, content_type):
+        variants = {encoding: compression.compress(body, encoding, best=True) for encoding in compression.ENCODINGS}
+        return {
+            'body': body,
+            'content_type': content_type,
+            'etag': hashlib.sha256(body).hexdigest()[:16],
+            'variants': {encoding: data for encoding, data in variants.items() if len(data) < len(body)},
+        }
+
+    def add_bundle(self, name, content_type):
+        """Load static/<name> and return the hashed URL it is served under"""
+        with open(os.path.join(STATIC_DIR, name), 'rb') as f:
+            asset = self.build(f.read(), content_type)
+        stem, extension = os.path.splitext(name)
+        hashed_name = f"{stem}.{asset['etag'][:10]}{extension}"
+        self.bundles[hashed_name] = asset
+        return f'/assets/{hashed_name}'
+
+    def serve(self, asset, cache_control):
+        encoding = parse_accept_header(request.headers.get('Accept-Encoding', '')).best_match(tuple(asset['variants']))
+        etag = f"{asset['etag']}-{encoding}" if encoding else asset['etag']
+        headers = {'Cache-Control': cache_control, 'Vary': 'Accept-Encoding', 'ETag': quote_etag(etag)}
+        matched = compression.matching_etag(request.if_none_match, asset['etag'])
+        if matched:
+            return Response(status=304, headers=dict(headers, ETag=quote_etag(matched)))
+        
+        response = Response(asset['variants'][encoding] if encoding else asset['body'],
+                            content_type=asset['content_type'], headers=headers)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        return response
 
-                const data = await response.json();
 
-                if (response.ok) {
-                    displayPlan(data.plan);
-                    closeCustomTaskModal();
-                    alert('Task added successfully!');
-                } else {
-                    throw new Error(data.error || 'Failed to add task');
-                }
-            } catch (error) {
-                alert('Error adding task: ' + error.message);
-                console.error('Error:', error);
-            }
-        }
+backend = BackendClient(BACKEND_URL)
 
-        function markAllComplete() {
-            document.querySelectorAll('.task-card').forEach(taskCard => {
-                const taskId = parseInt(taskCard.id.replace('task-', ''));
-                completedTasks.add(taskId);
-                taskCard.classList.add('completed');
-            });
-            updateProgress();
-        }
+# The page is a small shell; its /assets/<name> references are rewritten to the hashed bundle URLs
+assets = StaticAssets()
+BUNDLE_URLS = {name: assets.add_bundle(name, content_type) for name, content_type in BUNDLES.items()}
+INDEX_PAGE = assets.build(
+    re.sub(r'"/assets/([\w.-]+)"', lambda match: f'"{BUNDLE_URLS[match.group(1)]}"', HTML_CONTENT).encode('utf-8'),
+    'text/html; charset=utf-8'
+)
 
-        function exportPlan() {
-            alert('Export feature coming soon! Your AI-generated plan is automatically saved.');
-        }
 
-        function clearPlan() {
-            if (confirm('Are you sure you want to clear your current plan?')) {
-                document.getElementById('resultsSection').style.display = 'none';
-                document.getElementById('goalInput').value = '';
-                currentPlanId = null;
-                completedTasks.clear();
-                updateProgress();
-            }
-        }
-    </script>
-</body>
-</html>
-"""
+@app.after_request
+def compress_response(response):
+    """gzip/brotli-encode complete text and JSON bodies for clients that accept it"""
+    return compression.compress_response(response, request.headers.get('Accept-Encoding', ''))
 
 @app.route('/')
 def index():
-    return HTML_CONTENT
+    # Revalidated on every visit, so a deploy's new bundle names are picked up at once
+    return assets.serve(INDEX_PAGE, 'no-cache')
+
+@app.route('/assets/<name>')
+def static_asset(name):
+    asset = assets.bundles.get(name)
+    if asset is None:
+        return jsonify({'error': 'Not found'}), 404
+    return assets.serve(asset, IMMUTABLE)
 
 @app.route('/generate-plan', methods=['POST'])
 def generate_plan():
@@ -1567,14 +475,13 @@ def generate_plan():
             return jsonify({'error': 'Missing required fields'}), 400
         
         # Send request to AI backend
-        backend_response = requests.post(
-            f"{BACKEND_URL}/api/generate-plan",
+        backend_response = backend.post(
+            'generate-plan',
             json={
                 'goal': goal,
                 'start_date': start_date,
                 'end_date': end_date
-            },
-            timeout=60  # Longer timeout for AI processing
+            }
         )
         
         if backend_response.status_code == 200:
@@ -1589,6 +496,49 @@ def generate_plan():
     except Exception as e:
         return jsonify({'error': f'Internal server error: {str(e)}'}), 500
 
+@app.route('/generate-plan/stream', methods=['POST'])
+def generate_plan_stream():
+    try:
+        data = request.get_json()
+        goal = data.get('goal')
+        start_date = data.get('start_date')
+        end_date = data.get('end_date')
+        
+        if not all([goal, start_date, end_date]):
+            return jsonify({'error': 'Missing required fields'}), 400
+        
+        # Relay the backend's Server-Sent Events as they arrive; the timeout
+        # applies between events rather than to the whole generation
+        backend_response = backend.post(
+            'generate-plan/stream',
+            json={
+                'goal': goal,
+                'start_date': start_date,
+                'end_date': end_date
+            },
+            stream=True
+        )
+        
+        if backend_response.status_code != 200:
+            error_msg = backend_response.json().get('error', 'AI backend service unavailable')
+            backend_response.close()
+            return jsonify({'error': error_msg}), 503
+        
+        def relay():
+            try:
+                for chunk in backend_response.iter_content(chunk_size=None):
+                    yield chunk
+            finally:
+                backend_response.close()
+        
+        return Response(stream_with_context(relay()), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+            
+    except requests.exceptions.RequestException as e:
+        return jsonify({'error': f'AI backend connection failed: {str(e)}'}), 503
+    except Exception as e:
+        return jsonify({'error': f'Internal server error: {str(e)}'}), 500
+
 @app.route('/regenerate-ai', methods=['POST'])
 def regenerate_ai():
     try:
@@ -1600,14 +550,13 @@ def regenerate_ai():
         if not plan_id:
             return jsonify({'error': 'Plan ID is required'}), 400
         
-        backend_response = requests.post(
-            f"{BACKEND_URL}/api/regenerate-ai",
+        backend_response = backend.post(
+            'regenerate-ai',
             json={
                 'plan_id': plan_id,
                 'completed_tasks': completed_tasks,
                 'feedback': feedback
-            },
-            timeout=60
+            }
         )
         
         if backend_response.status_code == 200:
@@ -1634,15 +583,14 @@ def add_custom_task():
         if not all([plan_id, task_description]):
             return jsonify({'error': 'Plan ID and task description are required'}), 400
         
-        backend_response = requests.post(
-            f"{BACKEND_URL}/api/add-custom-task",
+        backend_response = backend.post(
+            'add-custom-task',
             json={
                 'plan_id': plan_id,
                 'task_description': task_description,
                 'duration_days': duration_days,
                 'dependencies': dependencies
-            },
-            timeout=30
+            }
         )
         
         if backend_response.status_code == 200:
@@ -1662,18 +610,28 @@ def update_progress():
     try:
         data = request.get_json()
         plan_id = data.get('plan_id')
-        completed_tasks = data.get('completed_tasks', [])
         
         if not plan_id:
             return jsonify({'error': 'Plan ID is required'}), 400
         
-        backend_response = requests.post(
-            f"{BACKEND_URL}/api/update-progress",
-            json={
+        # Either a complete/uncomplete delta or the full completed list
+        if 'complete' in data or 'uncomplete' in data:
+            payload = {
                 'plan_id': plan_id,
-                'completed_tasks': completed_tasks
-            },
-            timeout=30
+                'complete': data.get('complete', []),
+                'uncomplete': data.get('uncomplete', [])
+            }
+        else:
+            payload = {
+                'plan_id': plan_id,
+                'completed_tasks': data.get('completed_tasks', [])
+            }
+        
+        # Both forms set task states rather than toggling them, so they are safe to retry
+        backend_response = backend.post(
+            'update-progress',
+            idempotent=True,
+            json=payload
         )
         
         if backend_response.status_code == 200:
@@ -1687,6 +645,49 @@ def update_progress():
     except Exception as e:
         return jsonify({'error': f'Internal server error: {str(e)}'}), 500
 
+@app.route('/plan/<int:plan_id>', methods=['GET'])
+def get_plan(plan_id):
+    """Relay a saved plan, passing If-None-Match through so unchanged plans cost a 304 on both hops"""
+    try:
+        headers = {}
+        if request.headers.get('If-None-Match'):
+            headers['If-None-Match'] = request.headers['If-None-Match']
+        
+        backend_response = backend.get(f'plan/{plan_id}', 'plan', headers=headers)
+        
+        if backend_response.status_code == 304:
+            response = Response(status=304)
+            response.vary.add('Accept-Encoding')
+        elif backend_response.status_code == 200:
+            # Relay the JSON as is; it was already decompressed from the hop
+            response = Response(backend_response.content, mimetype='application/json')
+        elif backend_response.status_code == 404:
+            return jsonify({'error': 'Plan not found'}), 404
+        else:
+            error_msg = backend_response.json().get('error', 'Backend service unavailable')
+            return jsonify({'error': error_msg}), 503
+        
+        # The backend's tag names the encoding it used on the hop; this response is tagged for its own
+        etag, weak = unquote_etag(backend_response.headers.get('ETag'))
+        if etag:
+            etag = compression.strip_etag_encoding(etag)
+            if backend_response.status_code == 304:
+                # Confirm the exact tag the client holds, encoding suffix included
+                etag = compression.matching_etag(request.if_none_match, etag) or etag
+            response.set_etag(etag, weak)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+        
+    except requests.exceptions.RequestException as e:
+        return jsonify({'error': f'Backend connection failed: {str(e)}'}), 503
+    except Exception as e:
+        return jsonify({'error': f'Internal server error: {str(e)}'}), 500
+
+@app.route('/proxy-metrics', methods=['GET'])
+def proxy_metrics():
+    """Latency and retry stats for the hop to the AI backend"""
+    return jsonify({'routes': backend.metrics.snapshot(), 'retry_budget': round(backend.budget.tokens, 2)})
+
 if __name__ == '__main__':
     print("🚀 PlanIt AI Frontend Starting...")
     print("📍 Running on: http://localhost:8000")
@@ -1699,4 +700,5 @@ if __name__ == '__main__':
     print("   • Context-aware task generation")
     print("   • Progress-based AI adjustments")
     print("=" * 50)
-    app.run(host='0.0.0.0', port=8000, debug=True)
\ No newline at end of file
+    # The reloader only watches Python files by default; bundles are read once at startup
+    app.run(host='0.0.0.0', port=8000, debug=True, extra_files=[os.path.join(STATIC_DIR, name) for name in BUNDLES])
\ No newline at end of file
@@ -0,0 +1,567 @@
+let currentPlanId = null;
+let completedTasks = new Set();
+// Progress changes not yet sent: task id -> completed, for one plan
+let pendingProgress = { planId: null, changes: new Map() };
+let progressTimer = null;
+const PROGRESS_DEBOUNCE_MS = 400;
+
+// Set default dates
+document.getElementById('startDate').valueAsDate = new Date();
+let endDate = new Date();
+endDate.setDate(endDate.getDate() + 30); // Default 1 month
+document.getElementById('endDate').valueAsDate = endDate;
+
+// Example templates
+const examples = {
+    learning: "Learn Spanish for my trip to Spain in 3 months. I want to be able to have basic conversations, order food, and ask for directions. I have no prior experience with Spanish.",
+    project: "Build a mobile app for task management using React Native. The app should include task creation, categories, due dates, notifications, and data synchronization across devices.",
+    fitness: "Get fit and lose 10kg in 3 months. I want to build a sustainable workout routine and healthy eating habits. I currently exercise occasionally but want to be more consistent.",
+    business: "Start an online business selling handmade leather goods. I need to create products, build an e-commerce website, develop marketing strategy, and handle shipping logistics."
+};
+
+function loadExample(type) {
+    document.getElementById('goalInput').value = examples[type];
+}
+
+async function generateAIPlan() {
+    const goal = document.getElementById('goalInput').value.trim();
+    const startDate = document.getElementById('startDate').value;
+    const endDate = document.getElementById('endDate').value;
+
+    if (!goal) {
+        alert('Please describe your goal for AI to generate a plan.');
+        return;
+    }
+
+    if (!startDate || !endDate) {
+        alert('Please set both start and end dates.');
+        return;
+    }
+
+    // Validate dates
+    const start = new Date(startDate);
+    const end = new Date(endDate);
+    if (end <= start) {
+        alert('End date must be after start date.');
+        return;
+    }
+
+    // Show AI loading state
+    document.getElementById('loadingState').style.display = 'block';
+    document.getElementById('resultsSection').style.display = 'none';
+    document.getElementById('generateBtn').disabled = true;
+
+    try {
+        const response = await fetch('/api/generate-plan/stream', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                goal: goal,
+                start_date: startDate,
+                end_date: endDate
+            })
+        });
+
+        if (!response.ok) {
+            const data = await response.json();
+            throw new Error(data.error || 'AI failed to generate plan');
+        }
+
+        // Render tasks as the AI streams them in, then swap in the final schedule
+        currentPlanId = null;
+        completedTasks.clear();
+        let streamedPlan = null;
+        let showingPreview = false;
+        await readEventStream(response, (event, data) => {
+            if (event === 'meta') {
+                streamedPlan = { ...data, domain: 'Generating...', ai_generated: true, tasks: [], total_tasks: 0 };
+                displayPlan(streamedPlan);
+            } else if (event === 'preview') {
+                // Template plan to look at until the AI's own tasks start arriving
+                displayPlan({ ...data, goal: `${data.goal} (preview: ${data.domain})` });
+                showingPreview = true;
+            } else if (event === 'task') {
+                if (showingPreview) {
+                    displayPlan(streamedPlan);
+                    showingPreview = false;
+                }
+                document.getElementById('loadingState').style.display = 'none';
+                streamedPlan.tasks.push(data);
+                streamedPlan.total_tasks = streamedPlan.tasks.length;
+                document.getElementById('tasksContainer').appendChild(createTaskCard(data, streamedPlan));
+                document.getElementById('planTaskCount').textContent = streamedPlan.total_tasks;
+                updateProgress();
+            } else if (event === 'plan') {
+                currentPlanId = data.plan_id;
+                displayPlan(data.plan);
+            } else if (event === 'error') {
+                throw new Error(data.error);
+            }
+        });
+
+        if (!currentPlanId) {
+            throw new Error('AI plan stream ended unexpectedly');
+        }
+        showAIToast('AI plan generated successfully!');
+    } catch (error) {
+        alert('Error generating AI plan: ' + error.message);
+        console.error('Error:', error);
+    } finally {
+        document.getElementById('loadingState').style.display = 'none';
+        document.getElementById('generateBtn').disabled = false;
+    }
+}
+
+async function readEventStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = 'message';
+            const dataLines = [];
+            rawEvent.split('\n').forEach(line => {
+                if (line.startsWith('event:')) {
+                    event = line.slice(6).trim();
+                } else if (line.startsWith('data:')) {
+                    dataLines.push(line.slice(5).trim());
+                }
+            });
+            if (dataLines.length) {
+                onEvent(event, JSON.parse(dataLines.join('\n')));
+            }
+        }
+    }
+}
+
+function displayPlan(plan) {
+    const resultsSection = document.getElementById('resultsSection');
+
+    // Clear previous content
+    resultsSection.innerHTML = '';
+
+    // Create plan header
+    const planHeader = document.createElement('div');
+    planHeader.className = 'plan-header';
+
+    let aiIndicator = '';
+    if (plan.ai_generated) {
+        aiIndicator = `<div class="ai-indicator">
+            <i class="fas fa-robot"></i>
+            AI-Generated Plan • ${plan.domain}
+        </div>`;
+    }
+
+    planHeader.innerHTML = `
+        ${aiIndicator}
+        <h2 class="plan-title">${plan.goal}</h2>
+        <div class="plan-meta">
+            <div class="meta-item">
+                <i class="fas fa-play-circle"></i>
+                Start: ${formatDate(plan.start_date)}
+            </div>
+            <div class="meta-item">
+                <i class="fas fa-flag-checkered"></i>
+                End: ${formatDate(plan.end_date)}
+            </div>
+            <div class="meta-item">
+                <i class="fas fa-tasks"></i>
+                <span id="planTaskCount">${plan.total_tasks}</span> tasks
+            </div>
+            <div class="meta-item">
+                <i class="fas fa-calendar"></i>
+                ${plan.total_days} days total
+            </div>
+        </div>
+    `;
+
+    // Create tasks container
+    const tasksContainer = document.createElement('div');
+    tasksContainer.className = 'tasks-grid';
+    tasksContainer.id = 'tasksContainer';
+
+    // Add tasks
+    plan.tasks.forEach((task) => {
+        tasksContainer.appendChild(createTaskCard(task, plan));
+    });
+
+    // Assemble results section
+    resultsSection.appendChild(planHeader);
+    resultsSection.appendChild(tasksContainer);
+
+    // Show results
+    resultsSection.style.display = 'block';
+    updateProgress();
+}
+
+function createTaskCard(task, plan) {
+    const taskCard = document.createElement('div');
+    taskCard.className = `task-card ${task.regenerated ? 'regenerated' : ''} ${completedTasks.has(task.id) ? 'completed' : ''}`;
+    taskCard.id = `task-${task.id}`;
+
+    let aiTag = '';
+    if (plan.ai_generated) {
+        aiTag = `<span class="task-tag tag-ai">
+            <i class="fas fa-brain"></i>
+            AI Suggested
+        </span>`;
+    }
+
+    taskCard.innerHTML = `
+        <div class="task-header">
+            <div class="task-content">
+                <div class="task-description">${task.description}</div>
+                <div class="task-meta">
+                    <span class="task-tag tag-priority">
+                        <i class="fas fa-flag"></i>
+                        ${task.priority}
+                    </span>
+                    <span class="task-tag tag-category">
+                        <i class="fas fa-tag"></i>
+                        ${task.category}
+                    </span>
+                    <span class="task-tag tag-duration">
+                        <i class="fas fa-clock"></i>
+                        ${task.duration_days} day${task.duration_days > 1 ? 's' : ''}
+                    </span>
+                    ${aiTag}
+                </div>
+                <div class="task-dates">
+                    <div class="date-item">
+                        <i class="fas fa-play-circle"></i>
+                        Start: ${formatDate(task.start_date)}
+                    </div>
+                    <div class="date-item">
+                        <i class="fas fa-stop-circle"></i>
+                        Due: ${formatDate(task.end_date)}
+                    </div>
+                </div>
+                ${task.dependencies && task.dependencies.length > 0 ? `
+                <div style="margin-top: 15px; font-size: 0.85em; color: var(--gray); background: var(--light); padding: 10px 15px; border-radius: 10px; border-left: 3px solid var(--primary);">
+                    <i class="fas fa-link"></i>
+                    <strong>Prerequisites:</strong> Complete ${task.dependencies.map(dep => `Task ${dep}`).join(', ')} first
+                </div>
+                ` : ''}
+            </div>
+            <div class="task-actions">
+                <button class="action-btn btn-complete" onclick="toggleTaskComplete(${task.id})">
+                    <i class="fas fa-check"></i>
+                    Complete
+                </button>
+            </div>
+        </div>
+    `;
+    return taskCard;
+}
+
+function applyScheduleChanges(changes) {
+    (changes || []).forEach(change => {
+        const taskCard = document.getElementById(`task-${change.id}`);
+        if (!taskCard) {
+            return;
+        }
+        taskCard.querySelector('.tag-duration').innerHTML = `
+            <i class="fas fa-clock"></i>
+            ${change.duration_days} day${change.duration_days > 1 ? 's' : ''}
+        `;
+        taskCard.querySelector('.task-dates').innerHTML = `
+            <div class="date-item">
+                <i class="fas fa-play-circle"></i>
+                Start: ${formatDate(change.start_date)}
+            </div>
+            <div class="date-item">
+                <i class="fas fa-stop-circle"></i>
+                Due: ${formatDate(change.end_date)}
+            </div>
+        `;
+    });
+}
+
+function formatDate(dateString) {
+    const date = new Date(dateString);
+    return date.toLocaleDateString('en-US', { 
+        year: 'numeric', 
+        month: 'short', 
+        day: 'numeric' 
+    });
+}
+
+async function toggleTaskComplete(taskId) {
+    const taskCard = document.getElementById(`task-${taskId}`);
+
+    if (completedTasks.has(taskId)) {
+        completedTasks.delete(taskId);
+        taskCard.classList.remove('completed');
+    } else {
+        completedTasks.add(taskId);
+        taskCard.classList.add('completed');
+    }
+
+    queueProgress(taskId, completedTasks.has(taskId));
+    updateProgress();
+}
+
+function queueProgress(taskId, completed) {
+    if (!currentPlanId) return;
+    if (pendingProgress.planId !== currentPlanId) {
+        flushProgress();
+        pendingProgress.planId = currentPlanId;
+    }
+    // Rapid clicks on the same task collapse into its latest state
+    pendingProgress.changes.set(taskId, completed);
+    clearTimeout(progressTimer);
+    progressTimer = setTimeout(flushProgress, PROGRESS_DEBOUNCE_MS);
+}
+
+async function flushProgress(keepalive = false) {
+    clearTimeout(progressTimer);
+    const { planId, changes } = pendingProgress;
+    if (!planId || changes.size === 0) return;
+    pendingProgress = { planId, changes: new Map() };
+
+    const complete = [];
+    const uncomplete = [];
+    changes.forEach((completed, taskId) => (completed ? complete : uncomplete).push(taskId));
+
+    // Update progress in backend, sending only what changed
+    try {
+        const response = await fetch('/api/update-progress', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ plan_id: planId, complete, uncomplete }),
+            keepalive
+        });
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}`);
+        }
+    } catch (error) {
+        console.error('Error updating progress:', error);
+        // Requeue the batch unless newer clicks superseded it, and retry it after the debounce
+        if (pendingProgress.planId === planId) {
+            changes.forEach((completed, taskId) => {
+                if (!pendingProgress.changes.has(taskId)) pendingProgress.changes.set(taskId, completed);
+            });
+            clearTimeout(progressTimer);
+            progressTimer = setTimeout(flushProgress, PROGRESS_DEBOUNCE_MS);
+        }
+    }
+}
+
+window.addEventListener('pagehide', () => flushProgress(true));
+
+function updateProgress() {
+    const totalTasks = document.querySelectorAll('.task-card').length;
+    const completedCount = completedTasks.size;
+    const progress = totalTasks > 0 ? Math.round((completedCount / totalTasks) * 100) : 0;
+
+    document.getElementById('totalTasks').textContent = totalTasks;
+    document.getElementById('completedTasks').textContent = completedCount;
+    document.getElementById('remainingTasks').textContent = totalTasks - completedCount;
+
+    // Update progress ring
+    const circumference = 2 * Math.PI * 15.9155;
+    const offset = circumference - (progress / 100) * circumference;
+    document.getElementById('progressFill').style.strokeDasharray = `${circumference} ${circumference}`;
+    document.getElementById('progressFill').style.strokeDashoffset = offset;
+}
+
+function openAIRegenerationModal() {
+    if (!currentPlanId) {
+        alert('Please generate a plan first.');
+        return;
+    }
+
+    document.getElementById('aiRegenerationModal').style.display = 'flex';
+}
+
+function closeAIRegenerationModal() {
+    document.getElementById('aiRegenerationModal').style.display = 'none';
+    document.getElementById('aiFeedback').value = '';
+}
+
+async function regenerateWithAI() {
+    const feedback = document.getElementById('aiFeedback').value.trim();
+
+    // Show AI loading
+    document.getElementById('loadingState').style.display = 'block';
+    closeAIRegenerationModal();
+
+    try {
+        // Save debounced clicks first so the server regenerates from the progress on screen
+        await flushProgress();
+
+        const response = await fetch('/api/regenerate-ai', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                plan_id: currentPlanId,
+                completed_tasks: Array.from(completedTasks).map(id => ({ id })),
+                feedback: feedback
+            })
+        });
+
+        const data = await response.json();
+
+        if (response.ok) {
+            currentPlanId = data.new_plan_id;
+            // Regeneration renumbers the tasks: progress queued against the old ids no longer applies
+            clearTimeout(progressTimer);
+            pendingProgress = { planId: currentPlanId, changes: new Map() };
+            completedTasks = new Set(data.plan.tasks.filter(task => task.completed).map(task => task.id));
+            displayPlan(data.plan);
+            showAIToast('Plan regenerated with AI intelligence!');
+        } else {
+            throw new Error(data.error || 'AI regeneration failed');
+        }
+    } catch (error) {
+        alert('Error regenerating with AI: ' + error.message);
+        console.error('Error:', error);
+    } finally {
+        document.getElementById('loadingState').style.display = 'none';
+    }
+}
+
+function showAIToast(message) {
+    // Create toast notification
+    const toast = document.createElement('div');
+    toast.style.cssText = `
+        position: fixed;
+        top: 20px;
+        right: 20px;
+        background: var(--gradient-ai);
+        color: white;
+        padding: 15px 20px;
+        border-radius: 10px;
+        box-shadow: var(--shadow-lg);
+        z-index: 1001;
+        display: flex;
+        align-items: center;
+        gap: 10px;
+        font-weight: 600;
+    `;
+    toast.innerHTML = `<i class="fas fa-robot"></i> ${message}`;
+    document.body.appendChild(toast);
+
+    setTimeout(() => {
+        toast.remove();
+    }, 3000);
+}
+
+function openCustomTaskModal() {
+    if (!currentPlanId) {
+        alert('Please generate a plan first.');
+        return;
+    }
+
+    const dependenciesSelect = document.getElementById('customTaskDependencies');
+    dependenciesSelect.innerHTML = '';
+
+    // Populate with existing tasks
+    document.querySelectorAll('.task-card').forEach(taskCard => {
+        const taskId = taskCard.id.replace('task-', '');
+        const taskDescription = taskCard.querySelector('.task-description').textContent;
+        const option = document.createElement('option');
+        option.value = taskId;
+        option.textContent = `Task ${taskId}: ${taskDescription.substring(0, 40)}${taskDescription.length > 40 ? '...' : ''}`;
+        dependenciesSelect.appendChild(option);
+    });
+
+    document.getElementById('customTaskModal').style.display = 'flex';
+}
+
+function closeCustomTaskModal() {
+    document.getElementById('customTaskModal').style.display = 'none';
+    document.getElementById('customTaskDescription').value = '';
+    document.getElementById('customTaskDuration').value = '2';
+}
+
+async function addCustomTask() {
+    const description = document.getElementById('customTaskDescription').value.trim();
+    const duration = parseInt(document.getElementById('customTaskDuration').value);
+    const dependencies = Array.from(document.getElementById('customTaskDependencies').selectedOptions)
+        .map(option => parseInt(option.value));
+
+    if (!description) {
+        alert('Please enter a task description.');
+        return;
+    }
+
+    if (duration < 1 || duration > 14) {
+        alert('Duration should be between 1 and 14 days.');
+        return;
+    }
+
+    try {
+        const response = await fetch('/api/add-custom-task', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                plan_id: currentPlanId,
+                task_description: description,
+                duration_days: duration,
+                dependencies: dependencies
+            })
+        });
+
+        const data = await response.json();
+
+        if (response.ok) {
+            // Only the new task and any tasks it pushed back changed; patch those cards in place
+            applyScheduleChanges(data.changed);
+            document.getElementById('tasksContainer').appendChild(createTaskCard(data.task, { ai_generated: false }));
+            document.getElementById('planTaskCount').textContent = document.querySelectorAll('.task-card').length;
+            updateProgress();
+            closeCustomTaskModal();
+            alert('Task added successfully!');
+        } else {
+            throw new Error(data.error || 'Failed to add task');
+        }
+    } catch (error) {
+        alert('Error adding task: ' + error.message);
+        console.error('Error:', error);
+    }
+}
+
+function markAllComplete() {
+    document.querySelectorAll('.task-card').forEach(taskCard => {
+        const taskId = parseInt(taskCard.id.replace('task-', ''));
+        if (!completedTasks.has(taskId)) {
+            completedTasks.add(taskId);
+            queueProgress(taskId, true);
+        }
+        taskCard.classList.add('completed');
+    });
+    updateProgress();
+}
+
+function exportPlan() {
+    alert('Export feature coming soon! Your AI-generated plan is automatically saved.');
+}
+
+function clearPlan() {
+    if (confirm('Are you sure you want to clear your current plan?')) {
+        document.getElementById('resultsSection').style.display = 'none';
+        document.getElementById('goalInput').value = '';
+        flushProgress();
+        currentPlanId = null;
+        completedTasks.clear();
+        updateProgress();
+    }
+}
@@ -0,0 +1,24 @@
+"""Shared setup for the frontend tests.
+
+Run from frontend/ with:  python -m pytest -q
+
+Nothing here reaches the AI backend: tests that relay to it replace the
+BackendClient's get/post with canned responses.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+@pytest.fixture(scope='session')
+def frontend():
+    import ai_frontend
+    return ai_frontend
+
+
+@pytest.fixture
+def client(frontend):
+    return frontend.app.test_client()
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+import requests
+
+
+def backend_reply(status, etag, body=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers['ETag'] = etag
+    response._content = json.dumps(body).encode() if body is not None else b''
+    return response
+
+
+@pytest.fixture
+def backend_get(frontend, monkeypatch):
+    """Replace the hop to the backend; returns the list of headers each call sent"""
+    sent = []
+
+    def install(reply):
+        def get(route, timeout_key, headers=None, **kwargs):
+            sent.append(headers or {})
+            return reply
+        monkeypatch.setattr(frontend.backend, 'get', get)
+        return sent
+    return install
+
+
+@pytest.mark.parametrize('client_tag, backend_tag', [
+    ('"7.3-gzip"', '"7.3-gzip"'),
+    # The hop to the backend may have used another encoding than the client's copy
+    ('"7.3-gzip"', '"7.3"'),
+    ('"7.3"', '"7.3"'),
+])
+def test_not_modified_confirms_the_tag_the_client_sent(client, backend_get, client_tag, backend_tag):
+    sent = backend_get(backend_reply(304, backend_tag))
+    response = client.get('/plan/7', headers={'If-None-Match': client_tag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == client_tag
+    assert sent[0]['If-None-Match'] == client_tag
+
+
+def test_plan_is_tagged_for_the_encoding_of_this_hop(client, backend_get):
+    plan = {'id': 7, 'plan_data': {'tasks': [{'id': i, 'description': 'Practice ' * 20} for i in range(20)]}}
+    backend_get(backend_reply(200, '"7.3-br"', plan))
+    response = client.get('/plan/7', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['ETag'] == '"7.3-gzip"'
+
+    identity = client.get('/plan/7')
+    assert identity.headers['ETag'] == '"7.3"'
+    assert identity.get_json() == plan
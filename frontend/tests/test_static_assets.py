@@ -0,0 +1,47 @@
+import gzip
+import os
+
+import pytest
+
+
+def test_index_references_content_hashed_bundles(frontend, client):
+    page = client.get('/').get_data(as_text=True)
+    assert '"/assets/app.js"' not in page and '"/assets/app.css"' not in page
+    for name, url in frontend.BUNDLE_URLS.items():
+        stem, extension = os.path.splitext(name)
+        assert url.startswith(f'/assets/{stem}.') and url.endswith(extension)
+        assert f'"{url}"' in page
+
+
+def test_bundles_are_immutable_and_served_as_built(frontend, client):
+    for name, url in frontend.BUNDLE_URLS.items():
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.headers['Cache-Control'] == frontend.IMMUTABLE
+        with open(os.path.join(frontend.STATIC_DIR, name), 'rb') as f:
+            assert response.get_data() == f.read()
+
+
+def test_precompressed_variant_is_sent_with_its_own_tag(frontend, client):
+    url = frontend.BUNDLE_URLS['app.js']
+    plain = client.get(url)
+    response = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert gzip.decompress(response.get_data()) == plain.get_data()
+    assert response.headers['ETag'] == plain.headers['ETag'][:-1] + '-gzip"'
+
+
+@pytest.mark.parametrize('encoding', ['', 'gzip'])
+def test_index_revalidates_to_a_304_with_the_held_tag(client, encoding):
+    first = client.get('/', headers={'Accept-Encoding': encoding})
+    assert first.headers['Cache-Control'] == 'no-cache'
+    # A client switching encodings still holds a valid copy
+    response = client.get('/', headers={'If-None-Match': first.headers['ETag'], 'Accept-Encoding': 'gzip'})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == first.headers['ETag']
+    assert response.get_data() == b''
+
+
+def test_unknown_bundle_is_not_found(client):
+    assert client.get('/assets/app.0000000000.js').status_code == 404